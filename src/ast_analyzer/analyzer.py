@@ -5,8 +5,43 @@ Responsible for going through the parsed files and determining what updates shou
 criteria of suggestions
 """
 
+import hashlib
+import json
+
 from ast_analyzer.classes import AnalysisResult
+from ast_analyzer.classes import NamingConventions
 from ast_analyzer.classes import NodeVisitors
+from ast_analyzer.classes.AnalysisResult import FindingCode, Severity
+
+
+# (warning, error) thresholds of the checks that compare one metric per file
+# or per function. BatchEvaluator applies the same table to a whole corpus.
+THRESHOLDS = {
+    FindingCode.COMPLEXITY: (10, 15),
+    FindingCode.FUNCTION_COUNT: (5, 8),
+    FindingCode.CLASS_COUNT: (5, 8),
+    FindingCode.MISSING_DOCSTRINGS: (1, 5),
+    FindingCode.FUNCTION_LENGTH: (50, 100),
+    FindingCode.NESTING_DEPTH: (5, 7),
+}
+
+# Bump when a check changes what it reports for the same code, so findings
+# stored by earlier versions are not reused for unchanged files
+ANALYZER_VERSION = 1
+
+
+def config_fingerprint(naming=None):
+    """
+    A short hash of everything besides a file's content that its findings
+    depend on: the analyzer version, THRESHOLDS and the naming rules.
+    """
+    naming = naming if naming is not None else NamingConventions.default_conventions
+    config = {
+        "version": ANALYZER_VERSION,
+        "thresholds": {code.name: limits for code, limits in THRESHOLDS.items()},
+        "naming": naming.patterns,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
 
 
 def analyzer():
@@ -21,6 +56,21 @@ class CodeAnalyzer:
     Parameters:
     -----------
       tree: The parsed AST Tree that the analyzer will be navagating through
+      filename: Path of the file the tree was parsed from
+      results: Shared AnalysisResult to append findings to
+      import_graph: Shared project ImportGraph that this file's imports are
+        recorded in, for circular import detection
+      naming: NamingConventions to validate identifiers against. Defaults to a
+        shared instance so verdicts are memoized across files
+      duplicate_index: Shared project DuplicateIndex that this file's function
+        and class hashes are added to, for duplicate code detection
+      batch: Shared BatchEvaluator. When given, the threshold checks on
+        per-function metrics and per-file counts are not run here; the
+        metrics are added to the batch and evaluated for the whole corpus
+      profiler: Profiler that the traversal and each check are timed with
+      name: Name findings are attributed to. Defaults to the file's basename;
+        main passes the path relative to the analyzed directory, so files
+        with the same name in different directories stay apart
     """
 
     def __init__(
@@ -28,30 +78,126 @@ class CodeAnalyzer:
         tree,
         filename,
         results=None,
+        import_graph=None,
+        naming=None,
+        duplicate_index=None,
+        batch=None,
+        profiler=None,
+        name=None,
     ):
         self.tree = tree
         self.results = results if results is not None else AnalysisResult.AnalysisResult()
-        self.filename = filename.name
+        self.path = filename
+        self.filename = name if name is not None else filename.name
+        self.import_graph = import_graph
+        self.naming = naming if naming is not None else NamingConventions.default_conventions
+        self.duplicate_index = duplicate_index
+        self.batch = batch
+        self.batch_row = None
+        self.profiler = profiler
+        self._needs_import_edges = import_graph is not None and not import_graph.is_fresh(filename)
+        self._passes = None
+        self._node_count = 0
+
+    def _traverse(self):
+        """
+        Run the fused traversal over the tree once and cache its passes. Every
+        check reads from these passes instead of walking the tree again.
+        """
+        if self._passes is None:
+            self._passes = {
+                "functions": NodeVisitors.FunctionMetricsPass(),
+                "classes": NodeVisitors.ClassCountsPass(),
+                "imports": NodeVisitors.ImportUsagePass(),
+                "naming": NodeVisitors.NamingPass(),
+            }
+            if self._needs_import_edges:
+                self._passes["import_edges"] = NodeVisitors.ImportEdgesPass()
+            if self.duplicate_index is not None:
+                self._passes["structure"] = NodeVisitors.StructuralHashPass(
+                    min_nodes=self.duplicate_index.min_nodes
+                )
+            traversal = NodeVisitors.FusedTraversal(self._passes.values())
+            traversal.visit(self.tree)
+            self._node_count = traversal.nodes
+        return self._passes
+
+    @property
+    def node_count(self):
+        """Number of AST nodes in this file's tree."""
+        self._traverse()
+        return self._node_count
+
+    @property
+    def function_metrics(self):
+        """Per-function FunctionMetrics rows for this file, in source order."""
+        return self._traverse()["functions"].records
+
+    @property
+    def missing_docstrings(self):
+        """Number of functions, classes and modules in this file without a docstring."""
+        missing = self._traverse()["classes"].missing_docstrings
+        return missing + sum(not record.has_docstring for record in self.function_metrics)
+
+    @property
+    def structural_blocks(self):
+        """StructuralBlocks for this file, or an empty list without a duplicate_index."""
+        if self.duplicate_index is None:
+            return []
+        return self._traverse()["structure"].blocks
 
     def analyze(self):
         """
         Runs all helper methods to populate our results. Once populated, it will
         return the findings populated in the self.results variable
         """
-        self._check_function_complexity()
-        self._check_function_count()
-        self._check_class_count()
-        self._check_docstring_coverage()
-        # self._check_unused_imports()
-        # self._check_circular_imports()
-        self._check_function_line_count()
-        # self._check_nesting_depth()
-        # self._check_naming_conventions()
+        if self.batch is not None:
+            checks = [
+                self._add_to_batch,
+                self._check_unused_imports,
+                self._check_circular_imports,
+                self._check_naming_conventions,
+                self._check_duplicate_code,
+            ]
+        else:
+            checks = [
+                self._check_function_complexity,
+                self._check_function_count,
+                self._check_class_count,
+                self._check_docstring_coverage,
+                self._check_unused_imports,
+                self._check_circular_imports,
+                self._check_function_line_count,
+                self._check_nesting_depth,
+                self._check_naming_conventions,
+                self._check_duplicate_code,
+            ]
+
+        if self.profiler is None:
+            for check in checks:
+                check()
+        else:
+            # Time the shared traversal apart from the check that triggers it.
+            # Only the traversal visits nodes; the checks read its passes
+            self.profiler.lap("traverse", self.node_count)
+            for check in checks:
+                check()
+                self.profiler.lap(check.__name__)
         return self.results
 
+    def _add_to_batch(self):
+        """Hand this file's metrics and counts to the BatchEvaluator."""
+        self.batch_row = self.batch.add_file(
+            self.filename,
+            self.function_metrics,
+            len(self.function_metrics),
+            self._traverse()["classes"].classes,
+            self.missing_docstrings,
+        )
+
     def _check_function_complexity(self):
         """
-        Calculate complexity score based on:
+        Calculate complexity score of each function based on:
         - Branches: if, elif, ternary expressions (+1 each)
         - Loops: for, while, comprehensions (+1 each)
         - Exception handlers: except blocks (+1 each)
@@ -59,31 +205,51 @@ class CodeAnalyzer:
         If >= 10, add to warnings list.
         If >= 15, add to errors list.
         """
-        counter = NodeVisitors.ComplexityCounter()
-        counter.visit(self.tree)
-        score = counter.score
+        warning, error = THRESHOLDS[FindingCode.COMPLEXITY]
+        for record in self.function_metrics:
+            start, end = record.lineno, record.lineno + record.num_lines - 1
+            score = record.complexity
 
-        if score >= 15:
-            self.results.append_error(f"High complexity score ({score})", self.filename)
-        elif score >= 10:
-            self.results.append_warning(f"Moderate complexity score ({score})", self.filename)
+            if score >= error:
+                self.results.append_finding(
+                    FindingCode.COMPLEXITY,
+                    Severity.ERROR,
+                    self.filename,
+                    score,
+                    record.qualname,
+                    start,
+                    end,
+                )
+            elif score >= warning:
+                self.results.append_finding(
+                    FindingCode.COMPLEXITY,
+                    Severity.WARNING,
+                    self.filename,
+                    score,
+                    record.qualname,
+                    start,
+                    end,
+                )
 
     def _check_function_count(self):
         """
-        Uses a visitor to traverse the FunctionDef to see how many times the
-        function is called.
+        Counts the functions in the file, nested ones included, from the
+        per-function metrics rows.
 
         If count >= 5, add a warning
         If count >= 8, add an error
         """
-        counter = NodeVisitors.FunctionCounter()
-        counter.visit(self.tree)
-        num_funcs = counter.count
+        warning, error = THRESHOLDS[FindingCode.FUNCTION_COUNT]
+        num_funcs = len(self.function_metrics)
 
-        if num_funcs >= 8:
-            self.results.append_error(f"Too many functions ({num_funcs}).", self.filename)
-        elif num_funcs >= 5:
-            self.results.append_warning(f"This file has ({num_funcs}) functions.", self.filename)
+        if num_funcs >= error:
+            self.results.append_finding(
+                FindingCode.FUNCTION_COUNT, Severity.ERROR, self.filename, num_funcs
+            )
+        elif num_funcs >= warning:
+            self.results.append_finding(
+                FindingCode.FUNCTION_COUNT, Severity.WARNING, self.filename, num_funcs
+            )
 
     def _check_class_count(self):
         """
@@ -92,93 +258,190 @@ class CodeAnalyzer:
         If >= 5, add to warnings list.
         If >= 8, add to errors list.
         """
-        counter = NodeVisitors.ClassCounter()
-        counter.visit(self.tree)
-        num_classes = counter.count
+        warning, error = THRESHOLDS[FindingCode.CLASS_COUNT]
+        num_classes = self._traverse()["classes"].classes
 
-        if num_classes >= 8:
-            self.results.append_error(f"Too many classes ({num_classes}).", self.filename)
-        elif num_classes >= 5:
-            self.results.append_warning(f"This file has ({num_classes}) classes.", self.filename)
+        if num_classes >= error:
+            self.results.append_finding(
+                FindingCode.CLASS_COUNT, Severity.ERROR, self.filename, num_classes
+            )
+        elif num_classes >= warning:
+            self.results.append_finding(
+                FindingCode.CLASS_COUNT, Severity.WARNING, self.filename, num_classes
+            )
 
     def _check_docstring_coverage(self):
         """
-        Use ast's built in get_docstring to see how many FunctionDef and
-        ClassDef nodes contain a docstring
+        Use ast's built in get_docstring to see how many FunctionDef,
+        ClassDef and Module nodes are missing a docstring
 
         If >= 1, add to warnings list.
         If >= 5, add to errors list.
         """
-        counter = NodeVisitors.MissingDocstringCounter()
-        counter.visit(self.tree)
-        num_missing_docstrings = counter.count
+        warning, error = THRESHOLDS[FindingCode.MISSING_DOCSTRINGS]
+        num_missing_docstrings = self.missing_docstrings
 
-        if num_missing_docstrings >= 5:
-            self.results.append_error(
-                f"Too many items without docstring ({num_missing_docstrings})",
+        if num_missing_docstrings >= error:
+            self.results.append_finding(
+                FindingCode.MISSING_DOCSTRINGS,
+                Severity.ERROR,
                 self.filename,
+                num_missing_docstrings,
             )
-        elif num_missing_docstrings >= 1:
-            self.results.append_warning(
-                f"Missing {num_missing_docstrings} docstrings", self.filename
+        elif num_missing_docstrings >= warning:
+            self.results.append_finding(
+                FindingCode.MISSING_DOCSTRINGS,
+                Severity.WARNING,
+                self.filename,
+                num_missing_docstrings,
             )
 
     def _check_unused_imports(self):
         """
-        Check list of imports and see if they are called in any FunctionDef
-        nodes
+        Check the names bound by each import against the names loaded in its
+        scope and any nested scopes, including ``__all__`` and string
+        annotations
 
         If >= 1, add to warnings list.
         If >= 3, add to errors list.
         """
-        print("TODO: ASTANA-24")
-        pass
+        unused = self._traverse()["imports"].unused
+        num_unused = len(unused)
+        names = ", ".join(name for name, _ in unused)
+        lines = [lineno for _, lineno in unused]
+
+        if num_unused >= 3:
+            self.results.append_finding(
+                FindingCode.UNUSED_IMPORTS,
+                Severity.ERROR,
+                self.filename,
+                num_unused,
+                names,
+                min(lines),
+                max(lines),
+            )
+        elif num_unused >= 1:
+            self.results.append_finding(
+                FindingCode.UNUSED_IMPORTS,
+                Severity.WARNING,
+                self.filename,
+                num_unused,
+                names,
+                min(lines),
+                max(lines),
+            )
 
     def _check_circular_imports(self):
         """
-        TODO: Research how to check for circular imports
+        Record this file's module-level imports in the shared project
+        ImportGraph. Cycles can only be found once every file has been seen,
+        so they are reported by ImportGraph.check_cycles at the end of a run.
+
+        Files whose edges are still current in the graph are not recomputed.
         """
-        print("TODO: ASTANA-24")
-        pass
+        if self._needs_import_edges:
+            edges = self._traverse()["import_edges"]
+            self.import_graph.update(self.path, edges.imports)
+            self._needs_import_edges = False
 
     def _check_function_line_count(self):
         """
-        Takes a FunctionDef node and checks the lineno property to see how many
-        lines the function has.
+        Checks the line span of each function to see how many lines the
+        function has.
 
         If >= 50, add to warnings list.
         If >= 100, add to errors list.
         """
-        line_counter = NodeVisitors.FunctionLineCounter()
-        line_counter.visit(self.tree)
-        num_lines = line_counter.num_lines
+        warning, error = THRESHOLDS[FindingCode.FUNCTION_LENGTH]
+        for record in self.function_metrics:
+            start, end = record.lineno, record.lineno + record.num_lines - 1
+            num_lines = record.num_lines
 
-        if num_lines >= 100:
-            self.results.append_error(f"Function too large ({num_lines} lines)", self.filename)
-        elif num_lines >= 50:
-            self.results.append_warning(
-                f"Function starting to grow unweildy ({num_lines})",
-                self.filename,
-            )
+            if num_lines >= error:
+                self.results.append_finding(
+                    FindingCode.FUNCTION_LENGTH,
+                    Severity.ERROR,
+                    self.filename,
+                    num_lines,
+                    record.qualname,
+                    start,
+                    end,
+                )
+            elif num_lines >= warning:
+                self.results.append_finding(
+                    FindingCode.FUNCTION_LENGTH,
+                    Severity.WARNING,
+                    self.filename,
+                    num_lines,
+                    record.qualname,
+                    start,
+                    end,
+                )
 
     def _check_nesting_depth(self):
         """
-        Checks for depth of FunctionDef and ClassDef to see how many
-        loops/conditionals are included in the function.
+        Checks the deepest control-flow nesting (if, for, while, with, try,
+        match) inside each FunctionDef. An elif stays at the depth of its if,
+        and nested functions are measured on their own.
 
-        If >= 10, add to warnings list.
-        If >= 15, add to errors list.
+        If >= 5, add to warnings list.
+        If >= 7, add to errors list.
         """
-        print("TODO: ASTANA-24")
-        pass
+        warning, error = THRESHOLDS[FindingCode.NESTING_DEPTH]
+        for record in self.function_metrics:
+            start, end = record.lineno, record.lineno + record.num_lines - 1
+            depth = record.max_depth
+
+            if depth >= error:
+                self.results.append_finding(
+                    FindingCode.NESTING_DEPTH,
+                    Severity.ERROR,
+                    self.filename,
+                    depth,
+                    record.qualname,
+                    start,
+                    end,
+                )
+            elif depth >= warning:
+                self.results.append_finding(
+                    FindingCode.NESTING_DEPTH,
+                    Severity.WARNING,
+                    self.filename,
+                    depth,
+                    record.qualname,
+                    start,
+                    end,
+                )
 
     def _check_naming_conventions(self):
         """
-        Checks the name of each ClassDef, FunctionDef, and Assign targets to
-        make sure that they are following proper conventions
+        Checks the name of each ClassDef, FunctionDef, argument, and Assign
+        target to make sure that they are following proper conventions
 
         If >= 10, add to warnings list.
         If >= 15, add to errors list.
         """
-        print("TODO: ASTANA-24")
-        pass
+        names = self._traverse()["naming"].names
+        invalid = []
+        for kind, kind_names in names.items():
+            invalid.extend(self.naming.invalid(kind, kind_names))
+        num_invalid = len(invalid)
+        examples = ", ".join(invalid[:5]) + (", ..." if num_invalid > 5 else "")
+
+        if num_invalid >= 15:
+            self.results.append_finding(
+                FindingCode.NAMING, Severity.ERROR, self.filename, num_invalid, examples
+            )
+        elif num_invalid >= 10:
+            self.results.append_finding(
+                FindingCode.NAMING, Severity.WARNING, self.filename, num_invalid, examples
+            )
+
+    def _check_duplicate_code(self):
+        """
+        Add the structural hash of each FunctionDef and ClassDef to the shared
+        project DuplicateIndex. Copies can be anywhere in the project, so they
+        are reported by DuplicateIndex.check_duplicates at the end of a run.
+        """
+        if self.duplicate_index is not None:
+            self.duplicate_index.add(self.filename, self._traverse()["structure"].blocks)
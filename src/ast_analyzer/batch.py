@@ -0,0 +1,234 @@
+"""
+ast_analyzer.batch
+
+Evaluate the per-file and per-function thresholds of every file at once with
+NumPy, instead of one if-chain per file. Needs the optional "batch" extra:
+
+    pip install "AST-Analyzer[batch]"
+"""
+
+from __future__ import annotations
+
+from array import array
+
+from ast_analyzer.analyzer import THRESHOLDS
+from ast_analyzer.classes.AnalysisResult import AnalysisResult, FindingCode, Severity
+from ast_analyzer.classes.ResultStore import format_rows
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Metrics collected per function and per file, with the finding code their
+# thresholds belong to
+FUNCTION_METRICS = {
+    "complexity": FindingCode.COMPLEXITY,
+    "num_lines": FindingCode.FUNCTION_LENGTH,
+    "max_depth": FindingCode.NESTING_DEPTH,
+}
+FILE_METRICS = {
+    "functions": FindingCode.FUNCTION_COUNT,
+    "classes": FindingCode.CLASS_COUNT,
+    "missing_docstrings": FindingCode.MISSING_DOCSTRINGS,
+}
+
+# Files collected before main evaluates them, so findings keep streaming
+# during a run while each evaluation stays large enough to vectorize well
+EVALUATE_EVERY = 1000
+
+
+class BatchEvaluator:
+    """
+    Collects the metrics of files and functions during a run and applies
+    THRESHOLDS to them in vectorized passes.
+
+    CodeAnalyzer(batch=evaluator) adds its file here instead of running the
+    complexity, length, nesting, function count, class count and docstring
+    checks itself. evaluate() then assigns severities to the files added
+    since the last evaluation with array comparisons, orders their findings
+    (errors first, worst value first) with one sort, and only then builds
+    the findings. Calling it every EVALUATE_EVERY files keeps findings
+    streaming to a sink; the metrics themselves are kept so repeat_file()
+    works for any earlier file.
+
+    Printing the evaluator shows, per metric, the percentile rank of the
+    corpus that each threshold sits at.
+
+    Example:
+        >>> evaluator = BatchEvaluator()
+        >>> # CodeAnalyzer(tree, path, batch=evaluator).analyze() for every file
+        >>> results = evaluator.evaluate()
+        >>> print(evaluator)
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+
+    def __init__(self) -> None:
+        if np is None:
+            raise ImportError('Batch evaluation needs NumPy: pip install "AST-Analyzer[batch]"')
+        # Per-file columns
+        self.filenames: list[str] = []
+        self._file_columns = {metric: array("q") for metric in FILE_METRICS}
+        self._first_function = array("q")
+        self._num_functions = array("q")
+        # Per-function columns
+        self.qualnames: list[str] = []
+        self._function_file = array("q")
+        self._lineno = array("q")
+        self._function_columns = {metric: array("q") for metric in FUNCTION_METRICS}
+        # Files and functions that evaluate() has already gone through
+        self._evaluated_files = 0
+        self._evaluated_functions = 0
+
+    def __len__(self) -> int:
+        """Return the number of files collected."""
+        return len(self.filenames)
+
+    def __str__(self) -> str:
+        rows = []
+        for metrics in (FUNCTION_METRICS, FILE_METRICS):
+            for metric, code in metrics.items():
+                warning, error = THRESHOLDS[code]
+                # Values are integers, so the share at or below threshold - 1
+                # is the share of the corpus under the threshold
+                count = len(self._column(metric))
+                ranks = self.percentile_ranks(metric, [warning - 1, error - 1])
+                rows.append((metric, count, *(f"p{rank:.1f}" if count else "-" for rank in ranks)))
+        headers = ("metric", "values", "warning at", "error at")
+        return "Thresholds as percentiles of the corpus:\n" + format_rows(rows, headers)
+
+    @property
+    def pending(self) -> int:
+        """Number of files added since the last evaluate()."""
+        return len(self.filenames) - self._evaluated_files
+
+    def add_file(
+        self, filename: str, functions, num_functions: int, num_classes: int, missing: int
+    ) -> int:
+        """
+        Add a file's FunctionMetrics rows and counts. Returns the file's row,
+        which repeat_file() accepts.
+        """
+        row = len(self.filenames)
+        self.filenames.append(filename)
+        self._file_columns["functions"].append(num_functions)
+        self._file_columns["classes"].append(num_classes)
+        self._file_columns["missing_docstrings"].append(missing)
+        self._first_function.append(len(self.qualnames))
+        self._num_functions.append(len(functions))
+        for record in functions:
+            self.qualnames.append(record.qualname)
+            self._function_file.append(row)
+            self._lineno.append(record.lineno)
+            for metric, column in self._function_columns.items():
+                column.append(getattr(record, metric))
+        return row
+
+    def repeat_file(self, row: int, filename: str) -> int:
+        """Add a byte-identical copy of the file at row under another name."""
+        start = self._first_function[row]
+        end = start + self._num_functions[row]
+        new_row = len(self.filenames)
+        self.filenames.append(filename)
+        for column in self._file_columns.values():
+            column.append(column[row])
+        self._first_function.append(len(self.qualnames))
+        self._num_functions.append(end - start)
+        self.qualnames.extend(self.qualnames[start:end])
+        self._function_file.extend(array("q", [new_row]) * (end - start))
+        self._lineno.extend(self._lineno[start:end])
+        for column in self._function_columns.values():
+            column.extend(column[start:end])
+        return new_row
+
+    def _column(self, metric: str):
+        """Every collected value of metric."""
+        columns = self._function_columns if metric in self._function_columns else self._file_columns
+        return np.frombuffer(columns[metric], dtype=np.int64)
+
+    def _as_array(self, metric: str):
+        """The values of metric not evaluated yet."""
+        if metric in self._function_columns:
+            return self._column(metric)[self._evaluated_functions :]
+        return self._column(metric)[self._evaluated_files :]
+
+    def percentile_ranks(self, metric: str, values=None):
+        """
+        Percentile rank (0-100] of each of values among every collected value
+        of metric: the share of collected values less than or equal to it.
+        Defaults to the collected values themselves. One sort, then a binary
+        search per value.
+        """
+        column = self._column(metric)
+        values = column if values is None else np.asarray(values, dtype=np.int64)
+        if not len(column):
+            return np.zeros(len(values))
+        ordered = np.sort(column)
+        return np.searchsorted(ordered, values, side="right") * (100 / len(column))
+
+    @staticmethod
+    def _severities(values, code):
+        """Severity of every value under the thresholds of code, 0 for none."""
+        warning, error = THRESHOLDS[code]
+        return np.select(
+            [values >= error, values >= warning], [Severity.ERROR, Severity.WARNING], 0
+        )
+
+    def evaluate(self, results: AnalysisResult | None = None) -> AnalysisResult:
+        """
+        Apply THRESHOLDS to the metrics of the files added since the last
+        call and add the findings to results (a new AnalysisResult by
+        default), errors first and the worst values first within each
+        severity.
+        """
+        results = results if results is not None else AnalysisResult()
+        codes, severities, values, rows, per_function = [], [], [], [], []
+        for metrics, is_function, offset in (
+            (FUNCTION_METRICS, True, self._evaluated_functions),
+            (FILE_METRICS, False, self._evaluated_files),
+        ):
+            for metric, code in metrics.items():
+                column = self._as_array(metric)
+                metric_severities = self._severities(column, code)
+                hits = np.flatnonzero(metric_severities)
+                codes.append(np.full(len(hits), code, dtype=np.int64))
+                severities.append(metric_severities[hits])
+                values.append(column[hits])
+                rows.append(hits + offset)
+                per_function.append(np.full(len(hits), is_function))
+        self._evaluated_files = len(self.filenames)
+        self._evaluated_functions = len(self.qualnames)
+
+        codes = np.concatenate(codes)
+        severities = np.concatenate(severities)
+        values = np.concatenate(values)
+        rows = np.concatenate(rows)
+        per_function = np.concatenate(per_function)
+        # lexsort sorts by its last key first
+        order = np.lexsort((rows, codes, -values, -severities))
+
+        lineno = np.frombuffer(self._lineno, dtype=np.int64)
+        num_lines = np.frombuffer(self._function_columns["num_lines"], dtype=np.int64)
+        function_file = np.frombuffer(self._function_file, dtype=np.int64)
+        for i in order.tolist():
+            row = int(rows[i])
+            if per_function[i]:
+                results.append_finding(
+                    FindingCode(int(codes[i])),
+                    Severity(int(severities[i])),
+                    self.filenames[function_file[row]],
+                    int(values[i]),
+                    self.qualnames[row],
+                    int(lineno[row]),
+                    int(lineno[row] + num_lines[row] - 1),
+                )
+            else:
+                results.append_finding(
+                    FindingCode(int(codes[i])),
+                    Severity(int(severities[i])),
+                    self.filenames[row],
+                    int(values[i]),
+                )
+        return results
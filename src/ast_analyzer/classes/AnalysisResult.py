@@ -1,5 +1,136 @@
 from __future__ import annotations
-from typing import Any, Iterator
+
+import hashlib
+from array import array
+from collections.abc import Container, Iterable, Iterator, Sequence
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ast_analyzer.classes.FindingSink import FindingSink
+
+
+class Severity(IntEnum):
+    """How serious a finding is. Stored as one byte per finding."""
+
+    WARNING = 1
+    ERROR = 2
+
+
+class FindingCode(IntEnum):
+    """The rule that produced a finding. Stored as one byte per finding."""
+
+    CUSTOM = 0
+    COMPLEXITY = 1
+    FUNCTION_COUNT = 2
+    CLASS_COUNT = 3
+    MISSING_DOCSTRINGS = 4
+    UNUSED_IMPORTS = 5
+    CIRCULAR_IMPORT = 6
+    FUNCTION_LENGTH = 7
+    NESTING_DEPTH = 8
+    NAMING = 9
+    DUPLICATE_CODE = 10
+    LINTER = 11
+
+    @property
+    def rule(self) -> str:
+        """Stable rule id, e.g. "unused-imports"."""
+        return self.name.lower().replace("_", "-")
+
+
+# Message templates, filled in with a finding's value and detail only when
+# the message is actually displayed or exported
+MESSAGES: dict[tuple[FindingCode, Severity], str] = {
+    (FindingCode.COMPLEXITY, Severity.ERROR): "High complexity score ({value}) in {detail}",
+    (FindingCode.COMPLEXITY, Severity.WARNING): "Moderate complexity score ({value}) in {detail}",
+    (FindingCode.FUNCTION_COUNT, Severity.ERROR): "Too many functions ({value}).",
+    (FindingCode.FUNCTION_COUNT, Severity.WARNING): "This file has ({value}) functions.",
+    (FindingCode.CLASS_COUNT, Severity.ERROR): "Too many classes ({value}).",
+    (FindingCode.CLASS_COUNT, Severity.WARNING): "This file has ({value}) classes.",
+    (FindingCode.MISSING_DOCSTRINGS, Severity.ERROR): "Too many items without docstring ({value})",
+    (FindingCode.MISSING_DOCSTRINGS, Severity.WARNING): "Missing {value} docstrings",
+    (FindingCode.UNUSED_IMPORTS, Severity.ERROR): "Too many unused imports ({value}): {detail}",
+    (FindingCode.UNUSED_IMPORTS, Severity.WARNING): "Unused imports ({value}): {detail}",
+    (FindingCode.CIRCULAR_IMPORT, Severity.ERROR): "Circular import between {detail}",
+    (FindingCode.CIRCULAR_IMPORT, Severity.WARNING): "Circular import between {detail}",
+    (FindingCode.FUNCTION_LENGTH, Severity.ERROR): "Function {detail} too large ({value} lines)",
+    (FindingCode.FUNCTION_LENGTH, Severity.WARNING): (
+        "Function {detail} starting to grow unweildy ({value})"
+    ),
+    (FindingCode.NESTING_DEPTH, Severity.ERROR): "Deeply nested function {detail} (depth {value})",
+    (FindingCode.NESTING_DEPTH, Severity.WARNING): "Function {detail} nested {value} levels deep",
+    (FindingCode.NAMING, Severity.ERROR): (
+        "Too many naming convention violations ({value}): {detail}"
+    ),
+    (FindingCode.NAMING, Severity.WARNING): "Naming convention violations ({value}): {detail}",
+    (FindingCode.DUPLICATE_CODE, Severity.ERROR): "Duplicate {detail}",
+    (FindingCode.DUPLICATE_CODE, Severity.WARNING): "Duplicate {detail}",
+    (FindingCode.LINTER, Severity.ERROR): "{detail}",
+    (FindingCode.LINTER, Severity.WARNING): "{detail}",
+}
+
+# Lookups by the raw integers stored in the columns, which avoids building
+# enum members for every finding that is read
+RULES: dict[int, str] = {code: code.rule for code in FindingCode}
+SEVERITY_NAMES: dict[int, str] = {severity: severity.name.lower() for severity in Severity}
+
+# Codes whose detail names what the finding is about (the enclosing function,
+# or the message itself for custom and linter findings). It is part of the
+# fingerprint; other details can mention line numbers and are left out.
+SUBJECT_CODES = frozenset(
+    {
+        FindingCode.CUSTOM,
+        FindingCode.COMPLEXITY,
+        FindingCode.FUNCTION_LENGTH,
+        FindingCode.NESTING_DEPTH,
+        FindingCode.LINTER,
+    }
+)
+
+
+def format_message(code: int, severity: int, value: int, detail: str) -> str:
+    """Fill in the message template of a finding. Custom findings carry their message as detail."""
+    if code == FindingCode.CUSTOM:
+        return detail
+    return MESSAGES[(code, severity)].format(value=value, detail=detail)
+
+
+class FindingsView(Sequence):
+    """
+    Read-only, list-like view over the warnings or errors of an AnalysisResult.
+
+    Nothing is copied when the view is created. Each finding is built as a
+    small dict with "file", "message", "rule", "severity", "value",
+    "start_line" and "end_line" keys when it is accessed.
+    """
+
+    __slots__ = ("_result", "_rows")
+
+    def __init__(self, result: AnalysisResult, rows: array) -> None:
+        self._result = result
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._result._finding(row) for row in self._rows[index]]
+        return self._result._finding(self._rows[index])
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        finding = self._result._finding
+        for row in self._rows:
+            yield finding(row)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (FindingsView, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 class AnalysisResult:
@@ -9,27 +140,60 @@ class AnalysisResult:
     Takes all of the findings from the CodeAnalyzer class and provides
     an intuitive interface for working with analysis data.
 
+    Findings are stored column by column in compact ``array`` buffers: a
+    finding code byte, a severity byte, an index into an interned file table,
+    the first and last line it covers (0 when it is about the whole file), a
+    numeric value (the metric that triggered it) and an index into an
+    interned detail string table. Messages are only formatted when they are
+    displayed or exported, so millions of findings cost a few dozen bytes
+    each instead of a dict and an f-string apiece.
+
+    A result created with a sink writes every finding through to it (e.g. as
+    JSON Lines) instead of storing it, so memory stays constant however many
+    findings are reported; len() still counts them.
+
     Attributes:
-        results: List of finding dictionaries, each containing 'type' and 'message' keys.
+        sink: FindingSink that receives findings instead of storing them, or None
+        results: Dict with "warnings" and "errors" views and the "files" set.
 
     Examples:
         >>> result = AnalysisResult()
-        >>> result.results.append({"type": "warning", "message": "Too many functions"})
+        >>> result.append_finding(FindingCode.FUNCTION_COUNT, Severity.WARNING, "a.py", value=6)
         >>> len(result)
         1
         >>> bool(result)
         True
         >>> for finding in result:
         ...     print(finding["message"])
-        Too many functions
+        This file has (6) functions.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, sink: FindingSink | None = None) -> None:
         """Initialize an empty AnalysisResult with no findings."""
-        self.results: dict[str, Any] = {
-            "warnings": [],
-            "errors": [],
-            "files": set(),
+        self.sink = sink
+        self._streamed = 0
+        self._file_table: list[str] = []
+        self._file_ids: dict[str, int] = {}
+        self._detail_table: list[str] = [""]
+        self._detail_ids: dict[str, int] = {"": 0}
+
+        self._codes = array("B")
+        self._severities = array("B")
+        self._file_col = array("I")
+        self._start_lines = array("I")
+        self._end_lines = array("I")
+        self._values = array("q")
+        self._details = array("I")
+        # Row numbers of each severity, in the order they were added
+        self._rows = {Severity.WARNING: array("I"), Severity.ERROR: array("I")}
+
+    @property
+    def results(self) -> dict[str, Any]:
+        """Warnings and errors as list-like views, plus the set of files with findings."""
+        return {
+            "warnings": FindingsView(self, self._rows[Severity.WARNING]),
+            "errors": FindingsView(self, self._rows[Severity.ERROR]),
+            "files": set(self._file_table),
         }
 
     def __repr__(self) -> str:
@@ -38,18 +202,20 @@ class AnalysisResult:
 
     def __str__(self) -> str:
         """Return a user-friendly summary of the analysis."""
+        if self.sink is not None:
+            return self.sink.summary()
         if not self:
             return "Congrats! No errors or warnings found in directory"
 
-        warnings_list = self._format_findings(self.results["warnings"])
-        errors_list = self._format_findings(self.results["errors"])
+        warnings_list = self._format_findings(self["warnings"])
+        errors_list = self._format_findings(self["errors"])
 
         return f"""
 Analysis Complete! There are {len(self)} changes to implement
 
-Warnings: {len(self.results["warnings"])}
-Errors: {len(self.results["errors"])}
-Files to Change: {len(self.results["files"])}
+Warnings: {len(self._rows[Severity.WARNING])}
+Errors: {len(self._rows[Severity.ERROR])}
+Files to Change: {len(self._file_table)}
 
 Warnings:
 {warnings_list}
@@ -58,7 +224,7 @@ Errors:
 {errors_list}
 """
 
-    def _format_findings(self, findings: list[dict[str, Any]]) -> str:
+    def _format_findings(self, findings: FindingsView) -> str:
         """Format a list of findings as a bulleted list."""
         if not findings:
             return "  (none)"
@@ -66,13 +232,13 @@ Errors:
 
     def __len__(self) -> int:
         """Return the number of findings in the results."""
-        return len(self.results["warnings"] + self.results["errors"])
+        return len(self._codes) + self._streamed
 
     def __bool__(self) -> bool:
         """Return True if there are any findings, False otherwise."""
-        return bool(self.results["warnings"] or self.results["errors"])
+        return len(self) > 0
 
-    def __getitem__(self, key: str) -> list[dict[str, Any]]:
+    def __getitem__(self, key: str) -> FindingsView:
         """
         Access findings by category.
 
@@ -80,19 +246,21 @@ Errors:
             key: "warnings" or "errors" to get that category's findings.
 
         Returns:
-            List of findings for that category.
+            List-like view of the findings for that category.
 
         Raises:
             KeyError: If key is not "warnings" or "errors".
         """
-        if key in ("warnings", "errors"):
-            return self.results[key]
+        if key == "warnings":
+            return FindingsView(self, self._rows[Severity.WARNING])
+        if key == "errors":
+            return FindingsView(self, self._rows[Severity.ERROR])
         raise KeyError(f"Invalid key '{key}'. Use 'warnings' or 'errors'.")
 
     def __iter__(self) -> Iterator[dict[str, Any]]:
         """Iterate over all findings (warnings then errors)."""
-        yield from self.results["warnings"]
-        yield from self.results["errors"]
+        yield from self["warnings"]
+        yield from self["errors"]
 
     def __add__(self, other: AnalysisResult) -> AnalysisResult:
         """
@@ -103,18 +271,232 @@ Errors:
         """
         if not isinstance(other, AnalysisResult):
             return NotImplemented
-        combined = AnalysisResult()
-        combined.results = {
-            "warnings": self.results["warnings"] + other.results["warnings"],
-            "errors": self.results["errors"] + other.results["errors"],
-            "files": self.results["files"] | other.results["files"],
-        }
-        return combined
+        return AnalysisResult.merge_all((self, other))
+
+    # -------------------------------------------------------------------------
+    # Adding findings
+    # -------------------------------------------------------------------------
+    def _intern_file(self, filename: str) -> int:
+        file_id = self._file_ids.get(filename)
+        if file_id is None:
+            file_id = self._file_ids[filename] = len(self._file_table)
+            self._file_table.append(filename)
+        return file_id
+
+    def _intern_detail(self, detail: str) -> int:
+        detail_id = self._detail_ids.get(detail)
+        if detail_id is None:
+            detail_id = self._detail_ids[detail] = len(self._detail_table)
+            self._detail_table.append(detail)
+        return detail_id
+
+    def append_finding(
+        self,
+        code: FindingCode,
+        severity: Severity,
+        filename: str,
+        value: int = 0,
+        detail: str = "",
+        start_line: int = 0,
+        end_line: int = 0,
+    ) -> None:
+        """
+        Record a finding without formatting its message.
+
+        Args:
+            code: Rule that produced the finding
+            severity: Severity.WARNING or Severity.ERROR
+            filename: File the finding belongs to
+            value: Metric value that triggered the finding
+            detail: Extra text for the message, e.g. a qualified function name
+            start_line: First line the finding covers, 0 for the whole file
+            end_line: Last line the finding covers, defaults to start_line
+        """
+        end_line = end_line or start_line
+        if self.sink is not None:
+            self._streamed += 1
+            self.sink.write(
+                {
+                    "file": filename,
+                    "message": format_message(code, severity, value, detail),
+                    "rule": RULES[code],
+                    "severity": SEVERITY_NAMES[severity],
+                    "value": value,
+                    "start_line": start_line,
+                    "end_line": end_line,
+                }
+            )
+            return
+        self._rows[severity].append(len(self._codes))
+        self._codes.append(code)
+        self._severities.append(severity)
+        self._file_col.append(self._intern_file(filename))
+        self._start_lines.append(start_line)
+        self._end_lines.append(end_line)
+        self._values.append(value)
+        self._details.append(self._intern_detail(detail))
 
     def append_warning(self, message, filename):
-        self.results["warnings"].append({"file": filename, "message": message})
-        self.results["files"].add(filename)
+        """Record a warning with a free-form message."""
+        self.append_finding(FindingCode.CUSTOM, Severity.WARNING, filename, detail=message)
 
     def append_error(self, message, filename):
-        self.results["errors"].append({"file": filename, "message": message})
-        self.results["files"].add(filename)
+        """Record an error with a free-form message."""
+        self.append_finding(FindingCode.CUSTOM, Severity.ERROR, filename, detail=message)
+
+    def merge(self, other: AnalysisResult, filename: str | None = None) -> None:
+        """
+        Append every finding of other, in order, by extending the column
+        buffers in bulk. Only the file and detail ids of other are remapped
+        into this result's tables, so the cost is linear in the size of
+        other, not of self. If filename is given, the findings are
+        attributed to that file instead of their own.
+        """
+        if self.sink is not None:
+            for row in range(len(other._codes)):
+                self.append_finding(
+                    other._codes[row],
+                    other._severities[row],
+                    filename if filename is not None else other._file_table[other._file_col[row]],
+                    other._values[row],
+                    other._detail_table[other._details[row]],
+                    other._start_lines[row],
+                    other._end_lines[row],
+                )
+            return
+
+        offset = len(self._codes)
+        if not other._codes:
+            return
+        if filename is not None:
+            file_col = array("I", [self._intern_file(filename)]) * len(other._codes)
+        else:
+            file_map = [self._intern_file(name) for name in other._file_table]
+            file_col = array("I", map(file_map.__getitem__, other._file_col))
+        detail_map = [self._intern_detail(detail) for detail in other._detail_table]
+        details = array("I", map(detail_map.__getitem__, other._details))
+        rows = {
+            severity: array("I", (row + offset for row in other_rows))
+            for severity, other_rows in other._rows.items()
+        }
+
+        self._codes.extend(other._codes[:])
+        self._severities.extend(other._severities[:])
+        self._file_col.extend(file_col)
+        self._start_lines.extend(other._start_lines[:])
+        self._end_lines.extend(other._end_lines[:])
+        self._values.extend(other._values[:])
+        self._details.extend(details)
+        for severity, new_rows in rows.items():
+            self._rows[severity].extend(new_rows)
+
+    def __iadd__(self, other: AnalysisResult) -> AnalysisResult:
+        """Merge the findings of other into this result in place."""
+        if not isinstance(other, AnalysisResult):
+            return NotImplemented
+        self.merge(other)
+        return self
+
+    @classmethod
+    def merge_all(cls, results: Iterable[AnalysisResult]) -> AnalysisResult:
+        """
+        Reduce many results (e.g. one per file or per worker) into one.
+
+        Each input is merged exactly once into a single accumulator, so the
+        total cost is linear in the number of findings rather than quadratic
+        as with a chain of ``+``.
+        """
+        merged = cls()
+        for result in results:
+            merged.merge(result)
+        return merged
+
+    # -------------------------------------------------------------------------
+    # Fingerprints
+    # -------------------------------------------------------------------------
+    def _fingerprint(self, row: int) -> int:
+        """
+        64-bit identity of a finding that survives line shifts: its rule, file,
+        subject (e.g. the qualified function name) and a power-of-two bucket of
+        its value, so a complexity going from 11 to 13 is the same finding but
+        one going from 11 to 17 is not.
+        """
+        code = self._codes[row]
+        subject = self._detail_table[self._details[row]] if code in SUBJECT_CODES else ""
+        key = "\0".join(
+            (
+                RULES[code],
+                self._file_table[self._file_col[row]],
+                subject,
+                str(abs(self._values[row]).bit_length()),
+            )
+        )
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+    def counts_by_file(self) -> dict[str, list[int]]:
+        """Number of stored warnings and errors about each file, as {file: [warnings, errors]}."""
+        counts: dict[str, list[int]] = {}
+        for row in range(len(self._codes)):
+            file = self._file_table[self._file_col[row]]
+            file_counts = counts.get(file)
+            if file_counts is None:
+                file_counts = counts[file] = [0, 0]
+            file_counts[self._severities[row] == Severity.ERROR] += 1
+        return counts
+
+    def fingerprints(self) -> array:
+        """Fingerprints of the stored findings, in storage order."""
+        return array("Q", map(self._fingerprint, range(len(self._codes))))
+
+    def without(self, known: Container[int]) -> AnalysisResult:
+        """
+        Return a new result with only the findings whose fingerprint is not
+        in known, e.g. a Baseline of findings that were already accepted.
+        """
+        remaining = AnalysisResult()
+        for row in range(len(self._codes)):
+            if self._fingerprint(row) not in known:
+                remaining.append_finding(
+                    self._codes[row],
+                    self._severities[row],
+                    self._file_table[self._file_col[row]],
+                    self._values[row],
+                    self._detail_table[self._details[row]],
+                    self._start_lines[row],
+                    self._end_lines[row],
+                )
+        return remaining
+
+    # -------------------------------------------------------------------------
+    # Reading findings
+    # -------------------------------------------------------------------------
+    def export(self, sink: FindingSink) -> None:
+        """
+        Write every stored finding to sink, warnings then errors, one at a time.
+
+        Only one finding dict exists at any moment, so a sink such as
+        SarifSink can export millions of findings with bounded memory.
+        """
+        for finding in self:
+            sink.write(finding)
+
+    def _message(self, row: int) -> str:
+        """Format the message of one finding."""
+        return format_message(
+            self._codes[row],
+            self._severities[row],
+            self._values[row],
+            self._detail_table[self._details[row]],
+        )
+
+    def _finding(self, row: int) -> dict[str, Any]:
+        """Build the dict view of one finding."""
+        return {
+            "file": self._file_table[self._file_col[row]],
+            "message": self._message(row),
+            "rule": RULES[self._codes[row]],
+            "severity": SEVERITY_NAMES[self._severities[row]],
+            "value": self._values[row],
+            "start_line": self._start_lines[row],
+            "end_line": self._end_lines[row],
+        }
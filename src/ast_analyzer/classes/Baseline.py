@@ -0,0 +1,83 @@
+"""
+Baseline of accepted findings, so only new findings are reported
+"""
+
+from __future__ import annotations
+
+import bisect
+import pathlib
+import sys
+from array import array
+from collections.abc import Iterable
+
+# File header: format name and version. Version 2 fingerprints use the path
+# relative to the analyzed directory instead of the file's basename
+MAGIC = b"ASTBASE2"
+
+
+class Baseline:
+    """
+    Sorted set of finding fingerprints (see AnalysisResult.fingerprints).
+
+    Teams adopting the analyzer on existing code record the current findings
+    once with --write-baseline. Later runs report only the findings whose
+    fingerprint is not in the baseline, i.e. the set difference of the
+    current findings and the baseline. Fingerprints ignore line numbers, so
+    moving code around does not resurface old findings.
+
+    On disk a baseline is an 8-byte header followed by the sorted, unique
+    fingerprints as little-endian unsigned 64-bit integers, and it is held
+    in memory the same way: 8 bytes per finding, searched with bisect.
+
+    Example:
+        >>> Baseline.from_fingerprints(results.fingerprints()).save("baseline.bin")
+        >>> new = results.without(Baseline.load("baseline.bin"))
+    """
+
+    def __init__(self, fingerprints: array | None = None) -> None:
+        self.fingerprints = fingerprints if fingerprints is not None else array("Q")
+
+    @classmethod
+    def from_fingerprints(cls, fingerprints: Iterable[int]) -> Baseline:
+        """Build a baseline from fingerprints in any order, with repeats."""
+        return cls(array("Q", sorted(set(fingerprints))))
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def __contains__(self, fingerprint: object) -> bool:
+        index = bisect.bisect_left(self.fingerprints, fingerprint)
+        return index < len(self.fingerprints) and self.fingerprints[index] == fingerprint
+
+    def __repr__(self) -> str:
+        return f"Baseline(fingerprints={len(self)})"
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path) -> Baseline:
+        """
+        Load a baseline written by save().
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a baseline
+        """
+        data = pathlib.Path(path).read_bytes()
+        body = data[len(MAGIC) :]
+        if data[: len(MAGIC) - 1] == MAGIC[:-1] and not data.startswith(MAGIC):
+            raise ValueError(
+                f"{path} was written by an older version; re-create it with --write-baseline"
+            )
+        if not data.startswith(MAGIC) or len(body) % 8:
+            raise ValueError(f"{path} is not an ast-analyzer baseline")
+        fingerprints = array("Q")
+        fingerprints.frombytes(body)
+        if sys.byteorder == "big":
+            fingerprints.byteswap()
+        return cls(fingerprints)
+
+    def save(self, path: str | pathlib.Path) -> None:
+        """Write the baseline to path."""
+        fingerprints = array("Q", self.fingerprints)
+        if sys.byteorder == "big":
+            fingerprints.byteswap()
+        pathlib.Path(path).write_bytes(MAGIC + fingerprints.tobytes())
@@ -0,0 +1,94 @@
+"""
+Project-wide index of structural hashes used to find duplicated code
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from ast_analyzer.classes.AnalysisResult import FindingCode, Severity
+
+DEFAULT_MIN_NODES = 40
+
+
+class BlockLocation(NamedTuple):
+    """Where a hashed function or class was found."""
+
+    file: str
+    kind: str
+    qualname: str
+    lineno: int
+    parent: int | None
+
+
+class DuplicateIndex:
+    """
+    Maps the structural hash of every function and class in a project to the
+    places it occurs.
+
+    Structural hashes ignore identifiers, positions and literal values, so
+    copies that were renamed or had constants tweaked still land in the same
+    bucket. Finding duplicates is a single pass over the buckets, so the cost
+    stays linear in the size of the project with no pairwise comparisons.
+
+    A copy is not reported on its own when its enclosing function or class is
+    itself duplicated; the enclosing block is reported instead.
+
+    Args:
+        min_nodes: Smallest subtree, in AST nodes, worth reporting
+
+    Example:
+        >>> index = DuplicateIndex()
+        >>> # CodeAnalyzer(..., duplicate_index=index).analyze() for every file
+        >>> index.check_duplicates(results)
+    """
+
+    def __init__(self, min_nodes: int = DEFAULT_MIN_NODES) -> None:
+        self.min_nodes = min_nodes
+        self._locations: dict[int, list[BlockLocation]] = {}
+
+    def __repr__(self) -> str:
+        return f"DuplicateIndex(min_nodes={self.min_nodes}, hashes={len(self._locations)})"
+
+    def __len__(self) -> int:
+        """Return the number of distinct structural hashes indexed."""
+        return len(self._locations)
+
+    def add(self, filename: str, blocks) -> None:
+        """Index the StructuralBlocks of one file."""
+        for block in blocks:
+            parent = blocks[block.parent].digest if block.parent is not None else None
+            location = BlockLocation(filename, block.kind, block.qualname, block.lineno, parent)
+            self._locations.setdefault(block.digest, []).append(location)
+
+    def _is_nested_copy(self, location: BlockLocation) -> bool:
+        return location.parent is not None and len(self._locations[location.parent]) > 1
+
+    def find_duplicates(self) -> list[list[BlockLocation]]:
+        """Return every group of two or more structurally identical blocks."""
+        groups = [
+            locations
+            for locations in self._locations.values()
+            if len(locations) > 1 and not all(self._is_nested_copy(loc) for loc in locations)
+        ]
+        return sorted(groups, key=lambda group: (group[0].file, group[0].lineno))
+
+    def check_duplicates(self, results) -> None:
+        """
+        Add a finding for every duplicated block.
+
+        If 2 copies, add to warnings list.
+        If >= 3 copies, add to errors list.
+        """
+        for first, *copies in self.find_duplicates():
+            others = ", ".join(f"{loc.file}:{loc.lineno} ({loc.qualname})" for loc in copies)
+            detail = f"{first.kind} {first.qualname} (line {first.lineno}) also at {others}"
+            severity = Severity.ERROR if len(copies) >= 2 else Severity.WARNING
+            results.append_finding(
+                FindingCode.DUPLICATE_CODE,
+                severity,
+                first.file,
+                len(copies) + 1,
+                detail,
+                first.lineno,
+            )
@@ -0,0 +1,263 @@
+"""
+Sinks that receive findings as they are reported instead of keeping them
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import urllib.parse
+from collections import Counter
+from typing import Any, TextIO
+
+# Write buffer for files opened by a StreamSink
+BUFFER_SIZE = 64 * 1024
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# uriBaseId that SARIF artifact locations are relative to
+SARIF_ROOT = "SRCROOT"
+
+
+class FindingSink:
+    """
+    Receives findings one at a time and keeps running totals of them.
+
+    An AnalysisResult created with a sink hands every finding to write()
+    instead of storing it, so memory use does not grow with the number of
+    findings. The base class only counts; subclasses override emit() to send
+    each finding somewhere.
+
+    Example:
+        >>> sink = FindingSink()
+        >>> sink.write({"file": "a.py", "message": "...", "rule": "naming",
+        ...             "severity": "warning", "value": 3})
+        >>> sink.warnings, sink.errors
+        (1, 0)
+    """
+
+    def __init__(self) -> None:
+        self.warnings = 0
+        self.errors = 0
+        self.files: set[str] = set()
+        self.rules: Counter[str] = Counter()
+        # Throughput of the run (RunStats.to_dict), set before close() so
+        # formats with a summary can include it
+        self.run_stats: dict[str, Any] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of findings written so far."""
+        return self.warnings + self.errors
+
+    def __bool__(self) -> bool:
+        """Return True if any finding was written."""
+        return len(self) > 0
+
+    def write(self, finding: dict[str, Any]) -> None:
+        """Count a finding and emit it."""
+        if finding["severity"] == "error":
+            self.errors += 1
+        else:
+            self.warnings += 1
+        self.files.add(finding["file"])
+        self.rules[finding["rule"]] += 1
+        self.emit(finding)
+
+    def emit(self, finding: dict[str, Any]) -> None:
+        """Send a finding to its destination. The base sink discards it."""
+
+    def flush(self) -> None:
+        """Push buffered findings out, e.g. after each file."""
+
+    def close(self) -> None:
+        """Flush and release the destination."""
+        self.flush()
+
+    def __enter__(self) -> FindingSink:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def summary(self) -> str:
+        """Human-readable totals, built from the counters alone."""
+        if not self:
+            return "Congrats! No errors or warnings found in directory"
+
+        by_rule = "\n".join(f"  - {rule}: {count}" for rule, count in sorted(self.rules.items()))
+        return f"""
+Analysis Complete! There are {len(self)} changes to implement
+
+Warnings: {self.warnings}
+Errors: {self.errors}
+Files to Change: {len(self.files)}
+
+Findings by rule:
+{by_rule}
+"""
+
+
+class StreamSink(FindingSink):
+    """
+    Base for sinks that serialize findings to a text stream as they arrive.
+
+    Each finding is encoded on its own and handed to the stream's write
+    buffer, so exporting never holds more than one finding plus the stream
+    buffer in memory, however large the report.
+
+    Args:
+        stream: Text stream to write to. Streams opened by open() are closed
+            with the sink; others (such as sys.stdout) are left open.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__()
+        self.stream = stream
+        self._owns_stream = False
+        self._closed = False
+        self.start()
+
+    @classmethod
+    def open(cls, path: str | pathlib.Path, **options: Any) -> StreamSink:
+        """
+        Open a sink writing to path, or to stdout if path is "-". Options
+        are passed on to the sink's constructor.
+        """
+        if str(path) == "-":
+            return cls(sys.stdout, **options)
+        stream = open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+        sink = cls(stream, **options)
+        sink._owns_stream = True
+        return sink
+
+    def start(self) -> None:
+        """Write whatever comes before the first finding."""
+
+    def finish(self) -> None:
+        """Write whatever comes after the last finding."""
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.finish()
+        self.flush()
+        if self._owns_stream:
+            self.stream.close()
+
+
+class JsonLinesSink(StreamSink):
+    """Writes each finding as one JSON object per line."""
+
+    def emit(self, finding: dict[str, Any]) -> None:
+        self.stream.write(_encode(finding) + "\n")
+
+
+class JsonSink(StreamSink):
+    """
+    Writes a single JSON document, one finding at a time:
+
+        {"findings": [{...}, {...}],
+         "summary": {"warnings": 1, "errors": 1, "files": 2, "rules": {...}}}
+
+    The summary comes from the running counters and is written on close(),
+    with the run's throughput under "throughput" when run_stats is set.
+    """
+
+    def start(self) -> None:
+        self.stream.write('{"findings":[')
+        self._separator = ""
+
+    def emit(self, finding: dict[str, Any]) -> None:
+        self.stream.write(self._separator + _encode(finding))
+        self._separator = ",\n"
+
+    def finish(self) -> None:
+        summary = {
+            "warnings": self.warnings,
+            "errors": self.errors,
+            "files": len(self.files),
+            "rules": dict(sorted(self.rules.items())),
+        }
+        if self.run_stats is not None:
+            summary["throughput"] = self.run_stats
+        self.stream.write('],\n"summary":' + _encode(summary) + "}\n")
+
+
+class SarifSink(StreamSink):
+    """
+    Writes a SARIF 2.1.0 log with one run, one result per finding.
+
+    Results are streamed first and the tool section, which lists the rules
+    that were actually reported, is written on close(); key order does not
+    matter in JSON, so the document is still a valid SARIF log. The run's
+    throughput, when run_stats is set, goes in the run's property bag.
+
+    Finding files are paths relative to the analyzed directory; they are
+    written relative to the SRCROOT base URI, which is set to root when one
+    is given so code-scanning tools can map results back to files.
+
+    Args:
+        stream: Text stream to write to
+        root: Directory the finding paths are relative to
+    """
+
+    def __init__(self, stream: TextIO, root: str | pathlib.Path | None = None) -> None:
+        self.root = pathlib.Path(root).resolve() if root is not None else None
+        super().__init__(stream)
+
+    def start(self) -> None:
+        self.stream.write(
+            '{"$schema":' + _encode(SARIF_SCHEMA) + ',"version":"2.1.0","runs":[{"results":['
+        )
+        self._separator = ""
+
+    def emit(self, finding: dict[str, Any]) -> None:
+        location: dict[str, Any] = {
+            "artifactLocation": {
+                "uri": urllib.parse.quote(finding["file"]),
+                "uriBaseId": SARIF_ROOT,
+            }
+        }
+        if finding.get("start_line"):
+            location["region"] = {
+                "startLine": finding["start_line"],
+                "endLine": finding["end_line"] or finding["start_line"],
+            }
+        result = {
+            "ruleId": finding["rule"],
+            "level": finding["severity"],
+            "message": {"text": finding["message"]},
+            "locations": [{"physicalLocation": location}],
+            "properties": {"value": finding["value"]},
+        }
+        self.stream.write(self._separator + _encode(result))
+        self._separator = ",\n"
+
+    def finish(self) -> None:
+        driver = {
+            "name": "ast-analyzer",
+            "rules": [{"id": rule} for rule in sorted(self.rules)],
+        }
+        extra = ""
+        if self.root is not None:
+            # A base URI must end with a slash
+            base = {SARIF_ROOT: {"uri": self.root.as_uri().rstrip("/") + "/"}}
+            extra += ',"originalUriBaseIds":' + _encode(base)
+        if self.run_stats is not None:
+            extra += ',"properties":{"throughput":' + _encode(self.run_stats) + "}"
+        self.stream.write('],\n"tool":{"driver":' + _encode(driver) + "}" + extra + "}]}\n")
+
+
+SINKS: dict[str, type[StreamSink]] = {
+    "jsonl": JsonLinesSink,
+    "json": JsonSink,
+    "sarif": SarifSink,
+}
+
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
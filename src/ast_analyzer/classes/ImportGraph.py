@@ -0,0 +1,308 @@
+"""
+Project-wide import graph used to detect circular imports across files
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import pathlib
+from typing import Any
+
+from ast_analyzer.classes.AnalysisResult import FindingCode, Severity
+
+GRAPH_VERSION = 3
+
+
+class ImportGraph:
+    """
+    File-to-file import edges for an analyzed project.
+
+    Each file's module-level imports are recorded while it is analyzed. Once
+    every file has been seen, the imports are resolved against the modules in
+    the project and the strongly connected components of the graph are
+    reported as circular imports.
+
+    The graph can be saved and loaded again, so later runs only recompute the
+    edges of files whose size or modification time changed.
+
+    Args:
+        root: Directory being analyzed. File entries are stored relative to it.
+
+    Example:
+        >>> graph = ImportGraph.load(".ast_analyzer_cache/import_graph.json", "./src")
+        >>> # CodeAnalyzer(..., import_graph=graph).analyze() for every file
+        >>> graph.prune()
+        >>> graph.check_cycles(results)
+        >>> graph.save(".ast_analyzer_cache/import_graph.json")
+    """
+
+    def __init__(self, root: str | pathlib.Path) -> None:
+        self.root = pathlib.Path(root).resolve()
+        self.files: dict[str, dict[str, Any]] = {}
+        self._seen: set[str] = set()
+        self._package_dirs: dict[pathlib.Path, bool] = {}
+        # is_fresh() answers, for reporting how well the cache worked
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return f"ImportGraph(root={str(self.root)!r}, files={len(self.files)})"
+
+    def __len__(self) -> int:
+        """Return the number of files in the graph."""
+        return len(self.files)
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+    @classmethod
+    def load(cls, path: str | pathlib.Path, root: str | pathlib.Path) -> ImportGraph:
+        """
+        Load a saved graph for root. A missing, unreadable or outdated file
+        gives an empty graph, so every file's edges are recomputed.
+        """
+        graph = cls(root)
+        try:
+            data = json.loads(pathlib.Path(path).read_text())
+        except FileNotFoundError:
+            return graph
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable import graph {path}: {e}")
+            return graph
+
+        if data.get("version") == GRAPH_VERSION and data.get("root") == str(graph.root):
+            graph.files = data.get("files", {})
+        return graph
+
+    def save(self, path: str | pathlib.Path) -> None:
+        """Write the graph to path, creating its directory if needed."""
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": GRAPH_VERSION, "root": str(self.root), "files": self.files}
+        path.write_text(json.dumps(data, separators=(",", ":")))
+
+    # -------------------------------------------------------------------------
+    # Recording edges
+    # -------------------------------------------------------------------------
+    def _key(self, path: pathlib.Path) -> str:
+        resolved = pathlib.Path(path).resolve()
+        try:
+            return resolved.relative_to(self.root).as_posix()
+        except ValueError:
+            return resolved.as_posix()
+
+    @staticmethod
+    def _stamp(path: pathlib.Path) -> list[int]:
+        stat = pathlib.Path(path).stat()
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def is_fresh(self, path: pathlib.Path) -> bool:
+        """
+        Mark path as part of this run and return True if its stored edges are
+        still valid, meaning the file has not changed since they were recorded.
+        """
+        key = self._key(path)
+        self._seen.add(key)
+        entry = self.files.get(key)
+        try:
+            fresh = entry is not None and entry["stamp"] == self._stamp(path)
+        except OSError:
+            fresh = False
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return fresh
+
+    def update(self, path: pathlib.Path, imports: list[tuple[int, str, tuple[str, ...]]]) -> None:
+        """Replace the stored imports of path with the ones just collected."""
+        path = pathlib.Path(path)
+        key = self._key(path)
+        self._seen.add(key)
+        module, is_package, base = self._module_name(path.resolve())
+        self.files[key] = {
+            "stamp": self._stamp(path),
+            "module": module,
+            "package": is_package,
+            "base": self._key(base),
+            "imports": [[level, name, list(names)] for level, name, names in imports],
+        }
+
+    def imports_of(self, path: pathlib.Path) -> list[tuple[int, str, tuple[str, ...]]]:
+        """Return the stored raw imports of path (empty if it is not in the graph)."""
+        entry = self.files.get(self._key(path))
+        if entry is None:
+            return []
+        return [(level, name, tuple(names)) for level, name, names in entry["imports"]]
+
+    def prune(self) -> None:
+        """Drop entries for files that were not seen during this run."""
+        self.files = {key: entry for key, entry in self.files.items() if key in self._seen}
+
+    def _is_package(self, directory: pathlib.Path) -> bool:
+        is_package = self._package_dirs.get(directory)
+        if is_package is None:
+            is_package = self._package_dirs[directory] = (directory / "__init__.py").is_file()
+        return is_package
+
+    def _module_name(self, path: pathlib.Path) -> tuple[str, bool, pathlib.Path]:
+        """
+        Dotted module name of path, found by walking up through directories
+        that contain an ``__init__.py``. Returns the name, whether the file is
+        a package ``__init__`` and the directory the name is relative to.
+        """
+        is_package = path.stem == "__init__"
+        parts = [] if is_package else [path.stem]
+        directory = path.parent
+        while self._is_package(directory) and directory != directory.parent:
+            parts.append(directory.name)
+            directory = directory.parent
+        return ".".join(reversed(parts)), is_package, directory
+
+    # -------------------------------------------------------------------------
+    # Cycle detection
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _longest_known(
+        name: str, local: dict[str, str], shared: dict[str, str | None]
+    ) -> str | None:
+        """
+        Return the file of the longest prefix of a dotted name that is a
+        project module, looked up next to the importing file first.
+        """
+        while name:
+            key = local.get(name) or shared.get(name)
+            if key:
+                return key
+            name = name.rpartition(".")[0]
+        return None
+
+    def _resolve(
+        self, entry: dict[str, Any], local: dict[str, str], shared: dict[str, str | None]
+    ) -> set[str]:
+        """Resolve the raw imports of one file to the files of project modules."""
+        targets = set()
+        for level, module, names in entry["imports"]:
+            if level:
+                base = entry["module"].split(".") if entry["module"] else []
+                drop = level - 1 if entry["package"] else level
+                if drop > len(base):
+                    continue
+                prefix = ".".join(base[: len(base) - drop] + ([module] if module else []))
+            else:
+                prefix = module
+
+            if not names:
+                target = self._longest_known(prefix, local, shared)
+                if target:
+                    targets.add(target)
+                continue
+            for name in names:
+                submodule = f"{prefix}.{name}" if prefix else name
+                target = local.get(submodule) or shared.get(submodule)
+                target = target or self._longest_known(prefix, local, shared)
+                if target:
+                    targets.add(target)
+        return targets
+
+    def edges(self) -> dict[str, set[str]]:
+        """
+        Return the resolved graph as an adjacency mapping of file keys.
+
+        Module names are only unique within the directory they are relative
+        to, so two script directories can both hold an ``a.py``. Imports
+        resolve against the importing file's own directory first, then
+        against names that only one directory in the project defines.
+        """
+        by_base: dict[str, dict[str, str]] = {}
+        shared: dict[str, str | None] = {}
+        for key, entry in self.files.items():
+            module = entry["module"]
+            if not module:
+                continue
+            by_base.setdefault(entry["base"], {})[module] = key
+            # None marks a name defined in more than one directory
+            shared[module] = None if module in shared else key
+        return {
+            key: self._resolve(entry, by_base[entry["base"]], shared)
+            for key, entry in self.files.items()
+            if entry["module"]
+        }
+
+    def find_cycles(self) -> list[list[str]]:
+        """
+        Return the file keys of every group of modules that import each
+        other, directly or through other modules. Uses Tarjan's strongly
+        connected components algorithm, so the cost is linear in modules plus
+        edges.
+        """
+        graph = self.edges()
+        cycles = [
+            sorted(component)
+            for component in strongly_connected_components(graph)
+            if len(component) > 1 or component[0] in graph.get(component[0], ())
+        ]
+        return sorted(cycles)
+
+    def check_cycles(self, results) -> None:
+        """
+        Add an error to results for every circular import in the project,
+        attributed to the path (relative to root) of its first module.
+        """
+        for cycle in self.find_cycles():
+            results.append_finding(
+                FindingCode.CIRCULAR_IMPORT,
+                Severity.ERROR,
+                cycle[0],
+                len(cycle),
+                ", ".join(self.files[key]["module"] for key in cycle),
+            )
+
+
+def strongly_connected_components(graph: dict[str, set[str]]) -> list[list[str]]:
+    """
+    Iterative Tarjan's algorithm, so deep import chains cannot hit the
+    recursion limit. Nodes that only appear as edge targets are included.
+    """
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components = []
+
+    for start in graph:
+        if start in index:
+            continue
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(graph[start]))]
+
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph.get(child, ()))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
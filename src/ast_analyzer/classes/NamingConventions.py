@@ -0,0 +1,88 @@
+"""
+Configurable naming rules for classes, functions, arguments and variables
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+KINDS = ("class", "function", "argument", "variable")
+
+DEFAULT_PATTERNS: dict[str, list[str]] = {
+    # PascalCase, optionally private
+    "class": [r"_?[A-Z][a-zA-Z0-9]*"],
+    # snake_case, private snake_case or a dunder
+    "function": [r"_{0,2}[a-z][a-z0-9_]*", r"__[a-z][a-z0-9_]*__"],
+    "argument": [r"_{0,2}[a-z][a-z0-9_]*", r"_"],
+    # snake_case, UPPER_CASE constants, PascalCase aliases or a dunder
+    "variable": [
+        r"_{0,2}[a-z][a-z0-9_]*",
+        r"_{0,2}[A-Z][A-Z0-9_]*",
+        r"_?[A-Z][a-zA-Z0-9]*",
+        r"__[a-z][a-z0-9_]*__",
+        r"_",
+    ],
+}
+
+
+class NamingConventions:
+    """
+    Validates identifiers against one precompiled regex per kind of name.
+
+    All of the allowed patterns for a kind are combined into a single regex,
+    and every verdict is memoized per identifier. Identifiers repeat heavily
+    across a codebase, so share one instance between files to get the most
+    out of the cache.
+
+    Args:
+        patterns: Mapping of kind ("class", "function", "argument" or
+            "variable") to a regex or list of regexes an identifier must fully
+            match. Kinds that are left out keep their default patterns.
+
+    Example:
+        >>> conventions = NamingConventions({"function": [r"[a-z_][a-z0-9_]*", r"visit_\\w+"]})
+        >>> conventions.invalid("function", ["visit_If", "doThing", "do_thing"])
+        ['doThing']
+    """
+
+    def __init__(self, patterns: dict[str, str | list[str]] | None = None) -> None:
+        merged = dict(DEFAULT_PATTERNS)
+        for kind, value in (patterns or {}).items():
+            if kind not in KINDS:
+                raise ValueError(f"Unknown naming kind '{kind}'. Use one of {', '.join(KINDS)}.")
+            merged[kind] = [value] if isinstance(value, str) else list(value)
+
+        self.patterns = merged
+        self._matchers = {
+            kind: re.compile("|".join(f"(?:{p})" for p in alternatives)).fullmatch
+            for kind, alternatives in merged.items()
+        }
+        self._verdicts: dict[str, dict[str, bool]] = {kind: {} for kind in KINDS}
+
+    def __repr__(self) -> str:
+        return f"NamingConventions(patterns={self.patterns})"
+
+    def is_valid(self, kind: str, name: str) -> bool:
+        """Return True if name follows the convention for kind."""
+        return not self.invalid(kind, (name,))
+
+    def invalid(self, kind: str, names: Iterable[str]) -> list[str]:
+        """Return the names, in order, that break the convention for kind."""
+        verdicts = self._verdicts[kind]
+        match = self._matchers[kind]
+        bad = []
+        for name in names:
+            valid = verdicts.get(name)
+            if valid is None:
+                valid = verdicts[name] = match(name) is not None
+            if not valid:
+                bad.append(name)
+        return bad
+
+    def cache_size(self) -> int:
+        """Return the number of memoized verdicts across all kinds."""
+        return sum(len(verdicts) for verdicts in self._verdicts.values())
+
+
+default_conventions = NamingConventions()
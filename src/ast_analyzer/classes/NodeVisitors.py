@@ -4,173 +4,523 @@ AST Analyzer
 """
 
 import ast
+import zlib
+from typing import NamedTuple
 
 from ast_analyzer import ASTNode
 
 
-class FunctionCounter(ASTNode.ASTNodeVisitor):
-    """Counts FunctionDef and AsyncFunctionDef nodes using ASTNode trees."""
+class FunctionMetrics(NamedTuple):
+    """One row of the per-function metrics table built by FunctionMetricsPass."""
 
-    def __init__(self):
-        self.count = 0
+    qualname: str
+    lineno: int
+    num_lines: int
+    complexity: int
+    max_depth: int
+    has_docstring: bool
 
-    def __str__(self):
-        return f"Number of functions: {self.count}"
 
-    def visit_FunctionDef(self, node):
-        """Called when a function call (ast.Call node) is encountered."""
-        self.count += 1
-        # Continue visiting child nodes to find nested calls, arguments, etc.
-        self.generic_visit(node)
+class TraversalPass:
+    """
+    Base class for checks that run inside a FusedTraversal.
 
-    def visit_AsyncFunctionDef(self, node):
-        """Called when a function call (ast.Call node) is encountered."""
-        self.count += 1
-        # Continue visiting child nodes to find nested calls, arguments, etc.
-        self.generic_visit(node)
+    Subclasses define enter_<NodeType> and leave_<NodeType> methods. Enter hooks
+    fire before a node's children are walked and leave hooks fire after them, so
+    a pass can keep scope or depth state without walking the tree itself.
+    enter_node and leave_node, if defined, fire for every node.
+    """
 
 
-class ClassCounter(ASTNode.ASTNodeVisitor):
-    """Counts ClassDef nodes using ASTNode trees."""
+class FusedTraversal(ASTNode.ASTNodeVisitor):
+    """
+    Walks an ASTNode tree exactly once, dispatching to every registered pass.
 
-    def __init__(self):
-        self.count = 0
+    Hook lookups are resolved once per node type and cached, so adding a pass
+    only costs the hooks it actually defines.
+    """
 
-    def __str__(self):
-        return f"Number of classes: {self.count}"
+    def __init__(self, passes):
+        self.passes = list(passes)
+        self._hooks = {}
+        self.nodes = 0
+
+    def _hooks_for(self, node_type):
+        """Return the (enter, leave) hook lists for a node type."""
+        hooks = self._hooks.get(node_type)
+        if hooks is None:
+            name = node_type.__name__
+            enters = []
+            for p in self.passes:
+                enters.extend(
+                    getattr(p, hook) for hook in ("enter_node", f"enter_{name}") if hasattr(p, hook)
+                )
+            leaves = []
+            for p in reversed(self.passes):
+                leaves.extend(
+                    getattr(p, hook) for hook in (f"leave_{name}", "leave_node") if hasattr(p, hook)
+                )
+            hooks = self._hooks[node_type] = (enters, leaves)
+        return hooks
+
+    def visit(self, node):
+        """Fire enter hooks, walk the children, then fire leave hooks."""
+        self.nodes += 1
+        enters, leaves = self._hooks_for(type(node.node))
+        for hook in enters:
+            hook(node)
+        for child in node.children:
+            self.visit(child)
+        for hook in leaves:
+            hook(node)
+
+
+class FunctionMetricsPass(TraversalPass):
+    """
+    Builds a FunctionMetrics row for every function in a single traversal.
 
-    def visit_ClassDef(self, node):
-        """Called when a function call (ast.Call node) is encountered."""
-        self.count += 1
-        # Continue visiting child nodes to find nested calls, arguments, etc.
-        self.generic_visit(node)
+    A scope stack tracks the qualified name (``Class.method``, ``outer.inner``)
+    and a frame per open function accumulates its complexity and control-flow
+    nesting depth. Branches inside a nested function count towards that
+    function only. Records are kept in source order.
+    """
 
+    def __init__(self):
+        self.records: list[FunctionMetrics] = []
+        self._scope: list[str] = []
+        # [record index, complexity, current depth, max depth] per open function
+        self._frames: list[list[int]] = []
 
-class MissingDocstringCounter(ASTNode.ASTNodeVisitor):
-    """Checks if FunctionDef, AsyncFunctionDef, ClassDef, and Module nodes contain docstrings using ASTNode trees."""
+    def __str__(self):
+        return f"Functions measured: {len(self.records)}"
+
+    # Scopes
+    def enter_ClassDef(self, node):
+        """Push the class name onto the scope stack."""
+        self._scope.append(node.node.name)
+
+    def leave_ClassDef(self, node):
+        """Pop the class name from the scope stack."""
+        self._scope.pop()
+
+    def enter_FunctionDef(self, node):
+        """Open a new frame and reserve the function's row."""
+        self._scope.append(node.node.name)
+        self._frames.append([len(self.records), 0, 0, 0])
+        self.records.append(None)
+
+    def leave_FunctionDef(self, node):
+        """Close the frame and fill in the function's row."""
+        index, complexity, _, max_depth = self._frames.pop()
+        fn = node.node
+        start_line = getattr(fn, "lineno", None)
+        end_line = getattr(fn, "end_lineno", None)
+        self.records[index] = FunctionMetrics(
+            qualname=".".join(self._scope),
+            lineno=start_line or 0,
+            num_lines=(end_line - start_line + 1) if start_line and end_line else 0,
+            complexity=complexity,
+            max_depth=max_depth,
+            has_docstring=bool(ast.get_docstring(fn)),
+        )
+        self._scope.pop()
+
+    enter_AsyncFunctionDef = enter_FunctionDef
+    leave_AsyncFunctionDef = leave_FunctionDef
+
+    # Complexity
+    def _add_complexity(self, node):
+        """Count a branch, loop or handler towards the innermost function."""
+        if self._frames:
+            self._frames[-1][1] += 1
+
+    enter_IfExp = _add_complexity
+    enter_ListComp = _add_complexity
+    enter_SetComp = _add_complexity
+    enter_DictComp = _add_complexity
+    enter_GeneratorExp = _add_complexity
+    enter_ExceptHandler = _add_complexity
+
+    # Nesting depth
+    def _enter_block(self, node):
+        """Go one control-flow level deeper in the innermost function."""
+        if self._frames:
+            frame = self._frames[-1]
+            frame[2] += 1
+            if frame[2] > frame[3]:
+                frame[3] = frame[2]
+
+    def _leave_block(self, node):
+        """Come back up one control-flow level."""
+        if self._frames:
+            self._frames[-1][2] -= 1
+
+    def _enter_loop(self, node):
+        self._add_complexity(node)
+        self._enter_block(node)
+
+    enter_For = _enter_loop
+    enter_AsyncFor = _enter_loop
+    enter_While = _enter_loop
+    leave_For = _leave_block
+    leave_AsyncFor = _leave_block
+    leave_While = _leave_block
+    enter_With = _enter_block
+    enter_AsyncWith = _enter_block
+    enter_Try = _enter_block
+    enter_TryStar = _enter_block
+    enter_Match = _enter_block
+    leave_With = _leave_block
+    leave_AsyncWith = _leave_block
+    leave_Try = _leave_block
+    leave_TryStar = _leave_block
+    leave_Match = _leave_block
+
+    @staticmethod
+    def _is_elif(node):
+        """An ``elif`` is an If that is the only statement in its parent If's orelse."""
+        parent = node.parent
+        return (
+            parent is not None
+            and isinstance(parent.node, ast.If)
+            and len(parent.node.orelse) == 1
+            and parent.node.orelse[0] is node.node
+        )
+
+    def enter_If(self, node):
+        """Count if/elif statements; elif does not add a nesting level."""
+        self._add_complexity(node)
+        if not self._is_elif(node):
+            self._enter_block(node)
+
+    def leave_If(self, node):
+        if not self._is_elif(node):
+            self._leave_block(node)
+
+
+class ClassCountsPass(TraversalPass):
+    """
+    Counts classes, and the classes and modules without a docstring, in a
+    single traversal. Functions are counted from the FunctionMetrics rows,
+    which record whether each one has a docstring.
+    """
 
     def __init__(self):
-        self.count = 0
-
-    def __bool__(self):
-        return self.count > 0
+        self.classes = 0
+        self.missing_docstrings = 0
 
     def __str__(self):
-        return f"Node is missing {self.count} docstrings"
+        return f"Classes: {self.classes}, missing docstrings: {self.missing_docstrings}"
 
-    def visit_FunctionDef(self, node):
-        """Called when a FunctionDef node is encountered."""
+    def enter_Module(self, node):
+        """Count a module without a docstring."""
         if not ast.get_docstring(node.node):
-            self.count += 1
-        self.generic_visit(node)
+            self.missing_docstrings += 1
 
-    def visit_AsyncFunctionDef(self, node):
-        """Called when an AsyncFunctionDef node is encountered."""
+    def enter_ClassDef(self, node):
+        """Count a class, and whether it lacks a docstring."""
+        self.classes += 1
         if not ast.get_docstring(node.node):
-            self.count += 1
-        self.generic_visit(node)
+            self.missing_docstrings += 1
 
-    def visit_ClassDef(self, node):
-        """Called when a ClassDef node is encountered."""
-        if not ast.get_docstring(node.node):
-            self.count += 1
-        self.generic_visit(node)
 
-    def visit_Module(self, node):
-        """Called when a Module node is encountered."""
-        if not ast.get_docstring(node.node):
-            self.count += 1
-        self.generic_visit(node)
+class ImportUsagePass(TraversalPass):
+    """
+    Finds imports that are never used, in a single traversal.
+
+    Each module, class and function scope keeps a table of the names its
+    imports bind and a set of the names it loads. When a scope closes, its
+    imports are checked against its loads with set lookups, and any loads it
+    could not resolve are handed to the enclosing scope. Names listed in
+    ``__all__`` and names inside string annotations count as loads.
+
+    Explicit re-exports (``import x as x``) and ``__future__`` imports are
+    never reported.
+    """
+
+    def __init__(self):
+        self.unused: list[tuple[str, int]] = []
+        # (bound import name -> line number, loaded names) per open scope
+        self._scopes: list[tuple[dict[str, int], set[str]]] = []
 
+    def __str__(self):
+        return f"Unused imports: {len(self.unused)}"
+
+    # Scopes
+    def _enter_scope(self, node):
+        self._scopes.append(({}, set()))
+
+    def _leave_scope(self, node):
+        imports, loads = self._scopes.pop()
+        for name, lineno in imports.items():
+            if name not in loads:
+                self.unused.append((name, lineno))
+        if self._scopes:
+            self._scopes[-1][1].update(loads.difference(imports))
+        else:
+            self.unused.sort(key=lambda item: item[1])
+
+    enter_Module = _enter_scope
+    leave_Module = _leave_scope
+    enter_ClassDef = _enter_scope
+    leave_ClassDef = _leave_scope
+    leave_FunctionDef = _leave_scope
+    leave_AsyncFunctionDef = _leave_scope
+
+    def enter_FunctionDef(self, node):
+        """Open a function scope; a string return annotation is a load."""
+        self._load_annotation(node.node.returns)
+        self._enter_scope(node)
+
+    enter_AsyncFunctionDef = enter_FunctionDef
+
+    # Bindings
+    def enter_Import(self, node):
+        """Bind the top-level package name (or alias) of each import."""
+        if not self._scopes:
+            return
+        imports = self._scopes[-1][0]
+        for alias in node.node.names:
+            if alias.asname is None:
+                imports[alias.name.partition(".")[0]] = node.node.lineno
+            elif alias.asname != alias.name:
+                imports[alias.asname] = node.node.lineno
+
+    def enter_ImportFrom(self, node):
+        """Bind each imported name (or alias), skipping star and __future__ imports."""
+        if not self._scopes or node.node.module == "__future__":
+            return
+        imports = self._scopes[-1][0]
+        for alias in node.node.names:
+            if alias.name == "*" or alias.asname == alias.name:
+                continue
+            imports[alias.asname or alias.name] = node.node.lineno
+
+    # Loads
+    def enter_Name(self, node):
+        """Record every name that is read or deleted."""
+        if self._scopes and not isinstance(node.node.ctx, ast.Store):
+            self._scopes[-1][1].add(node.node.id)
+
+    def _load_all(self, target, value):
+        """Treat the strings assigned to ``__all__`` as loads."""
+        if (
+            isinstance(target, ast.Name)
+            and target.id == "__all__"
+            and isinstance(value, (ast.List, ast.Tuple))
+        ):
+            loads = self._scopes[-1][1]
+            for elt in value.elts:
+                if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
+                    loads.add(elt.value)
+
+    def enter_Assign(self, node):
+        for target in node.node.targets:
+            self._load_all(target, node.node.value)
+
+    def enter_AugAssign(self, node):
+        self._load_all(node.node.target, node.node.value)
+
+    def enter_AnnAssign(self, node):
+        self._load_all(node.node.target, node.node.value)
+        self._load_annotation(node.node.annotation)
+
+    def enter_arg(self, node):
+        self._load_annotation(node.node.annotation)
+
+    def _load_annotation(self, annotation):
+        """Parse string annotations (``"Foo"``, ``list["Foo"]``) and load their names."""
+        if annotation is None or isinstance(annotation, ast.Name) or not self._scopes:
+            return
+        loads = self._scopes[-1][1]
+        for sub in ast.walk(annotation):
+            if isinstance(sub, ast.Constant) and isinstance(sub.value, str):
+                try:
+                    parsed = ast.parse(sub.value, mode="eval")
+                except SyntaxError:
+                    continue
+                loads.update(n.id for n in ast.walk(parsed) if isinstance(n, ast.Name))
+
+
+class ImportEdgesPass(TraversalPass):
+    """
+    Collects the imports a module performs when it is first imported, as
+    ``(level, module, names)`` tuples for the project ImportGraph.
 
-class FunctionLineCounter(ASTNode.ASTNodeVisitor):
-    """Counts FunctionDef and AsyncFunctionDef nodes using ASTNode trees."""
+    Imports inside functions and ``if TYPE_CHECKING:`` blocks do not run at
+    import time and cannot cause import cycles, so they are skipped.
+    """
 
     def __init__(self):
-        self.num_lines = 0
+        self.imports: list[tuple[int, str, tuple[str, ...]]] = []
+        self._deferred = 0
 
     def __str__(self):
-        return f"Number of lines in function: {self.num_lines}"
+        return f"Module-level imports: {len(self.imports)}"
+
+    def _defer(self, node):
+        self._deferred += 1
+
+    def _undefer(self, node):
+        self._deferred -= 1
+
+    enter_FunctionDef = _defer
+    leave_FunctionDef = _undefer
+    enter_AsyncFunctionDef = _defer
+    leave_AsyncFunctionDef = _undefer
 
-    def visit_FunctionDef(self, node):
-        """Called when a function call (ast.Call node) is encountered."""
-        start_line = getattr(node.node, "lineno", None)
-        end_line = getattr(node.node, "end_lineno", None)
-        num_lines = (end_line - start_line + 1) if start_line and end_line else 0
+    @staticmethod
+    def _is_type_checking(node):
+        test = node.node.test
+        return (isinstance(test, ast.Name) and test.id == "TYPE_CHECKING") or (
+            isinstance(test, ast.Attribute) and test.attr == "TYPE_CHECKING"
+        )
 
-        self.num_lines = num_lines
-        # Continue visiting child nodes to find nested calls, arguments, etc.
-        self.generic_visit(node)
+    def enter_If(self, node):
+        if self._is_type_checking(node):
+            self._defer(node)
 
-    def visit_AsyncFunctionDef(self, node):
-        """Called when an async function call (ast.Call node) is encountered."""
-        start_line = getattr(node.node, "lineno", None)
-        end_line = getattr(node.node, "end_lineno", None)
-        num_lines = (end_line - start_line + 1) if start_line and end_line else 0
+    def leave_If(self, node):
+        if self._is_type_checking(node):
+            self._undefer(node)
 
-        self.num_lines = num_lines
-        # Continue visiting child nodes to find nested calls, arguments, etc.
-        self.generic_visit(node)
+    def enter_Import(self, node):
+        if not self._deferred:
+            for alias in node.node.names:
+                self.imports.append((0, alias.name, ()))
 
+    def enter_ImportFrom(self, node):
+        if not self._deferred:
+            names = tuple(alias.name for alias in node.node.names if alias.name != "*")
+            self.imports.append((node.node.level, node.node.module or "", names))
 
-class ComplexityCounter(ASTNode.ASTNodeVisitor):
+
+class NamingPass(TraversalPass):
     """
-    Calculates complexity score for functions based on:
-    - Branches: if, elif, ternary expressions (+1 each)
-    - Loops: for, while, comprehensions (+1 each)
-    - Exception handlers: except blocks (+1 each)
+    Collects class, function, argument and assignment target names, batched
+    by kind, for NamingConventions to validate in one go.
     """
 
     def __init__(self):
-        self.score = 0
+        self.names: dict[str, list[str]] = {
+            "class": [],
+            "function": [],
+            "argument": [],
+            "variable": [],
+        }
+
+    def __str__(self):
+        return f"Names collected: {sum(len(names) for names in self.names.values())}"
+
+    def enter_ClassDef(self, node):
+        self.names["class"].append(node.node.name)
+
+    def enter_FunctionDef(self, node):
+        self.names["function"].append(node.node.name)
+
+    enter_AsyncFunctionDef = enter_FunctionDef
+
+    def enter_arg(self, node):
+        self.names["argument"].append(node.node.arg)
+
+    def enter_Assign(self, node):
+        variables = self.names["variable"]
+        targets = list(reversed(node.node.targets))
+        while targets:
+            target = targets.pop()
+            if isinstance(target, ast.Name):
+                variables.append(target.id)
+            elif isinstance(target, (ast.Tuple, ast.List)):
+                targets.extend(reversed(target.elts))
+            elif isinstance(target, ast.Starred):
+                targets.append(target.value)
+
+
+class StructuralBlock(NamedTuple):
+    """A function or class subtree fingerprinted by StructuralHashPass."""
+
+    digest: int
+    kind: str
+    qualname: str
+    lineno: int
+    num_nodes: int
+    parent: int | None
+
+
+class StructuralHashPass(TraversalPass):
+    """
+    Computes a Merkle-style structural hash for every subtree, bottom-up, in
+    the same traversal as the other passes.
+
+    A node's hash combines its type with the hashes of its children, so
+    identifiers, attribute names, positions and literal values do not affect
+    it. Renamed copies of the same code hash alike. Only node types are
+    labelled, using stable CRC32 ints, so digests are identical across
+    processes and can be compared between files and runs.
+
+    Every function and class with at least min_nodes nodes is recorded as a
+    StructuralBlock, innermost first. parent is the index of the nearest
+    enclosing recorded block.
+    """
+
+    BLOCK_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+    _labels: dict[str, int] = {}
+
+    def __init__(self, min_nodes=1):
+        self.min_nodes = min_nodes
+        self.blocks: list[StructuralBlock] = []
+        self._scope: list[str] = []
+        # indices of recorded blocks still waiting for their parent, per open block
+        self._open: list[list[int]] = []
+        self._digests: list[int] = []
+        self._sizes: list[int] = []
+        self._marks: list[int] = []
 
     def __str__(self):
-        return f"Complexity score: {self.score}"
-
-    # Branches
-    def visit_If(self, node):
-        """Count if/elif statements."""
-        self.score += 1
-        self.generic_visit(node)
-
-    def visit_IfExp(self, node):
-        """Count ternary expressions (x if cond else y)."""
-        self.score += 1
-        self.generic_visit(node)
-
-    # Loops
-    def visit_For(self, node):
-        """Count for loops."""
-        self.score += 1
-        self.generic_visit(node)
-
-    def visit_While(self, node):
-        """Count while loops."""
-        self.score += 1
-        self.generic_visit(node)
-
-    def visit_ListComp(self, node):
-        """Count list comprehensions."""
-        self.score += 1
-        self.generic_visit(node)
-
-    def visit_SetComp(self, node):
-        """Count set comprehensions."""
-        self.score += 1
-        self.generic_visit(node)
-
-    def visit_DictComp(self, node):
-        """Count dict comprehensions."""
-        self.score += 1
-        self.generic_visit(node)
-
-    def visit_GeneratorExp(self, node):
-        """Count generator expressions."""
-        self.score += 1
-        self.generic_visit(node)
-
-    # Exception handlers
-    def visit_ExceptHandler(self, node):
-        """Count except blocks."""
-        self.score += 1
-        self.generic_visit(node)
+        return f"Structural blocks: {len(self.blocks)}"
+
+    @classmethod
+    def _label(cls, node):
+        """Stable int label for a node: its type, plus the value type of a Constant."""
+        name = type(node).__name__
+        if name == "Constant":
+            name = f"Constant:{type(node.value).__name__}"
+        label = cls._labels.get(name)
+        if label is None:
+            label = cls._labels[name] = zlib.crc32(name.encode())
+        return label
+
+    def enter_node(self, node):
+        self._marks.append(len(self._digests))
+        if isinstance(node.node, self.BLOCK_TYPES):
+            self._scope.append(node.node.name)
+            self._open.append([])
+
+    def leave_node(self, node):
+        start = self._marks.pop()
+        digest = hash((self._label(node.node), *self._digests[start:]))
+        num_nodes = 1 + sum(self._sizes[start:])
+        del self._digests[start:], self._sizes[start:]
+        self._digests.append(digest)
+        self._sizes.append(num_nodes)
+
+        if isinstance(node.node, self.BLOCK_TYPES):
+            children = self._open.pop()
+            if num_nodes >= self.min_nodes:
+                index = len(self.blocks)
+                self.blocks.append(
+                    StructuralBlock(
+                        digest=digest,
+                        kind="class" if isinstance(node.node, ast.ClassDef) else "function",
+                        qualname=".".join(self._scope),
+                        lineno=node.node.lineno,
+                        num_nodes=num_nodes,
+                        parent=None,
+                    )
+                )
+                for child in children:
+                    self.blocks[child] = self.blocks[child]._replace(parent=index)
+                children = [index]
+            if self._open:
+                self._open[-1].extend(children)
+            self._scope.pop()
@@ -0,0 +1,384 @@
+"""
+Time spent per phase of a run, per check and per file
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import pathlib
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+from ast_analyzer.classes.ResultStore import format_rows
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+T = TypeVar("T")
+
+# Allocation sites listed by memory_report()
+TOP_ALLOCATION_SITES = 10
+
+
+class Profiler:
+    """
+    Splits the wall time of a run into phases (discovery, read, dedent,
+    parse, ASTNode construction, traversal, each _check_* method, ...).
+
+    The run is a sequence of laps: lap(phase) charges the time since the
+    previous lap to phase and to the current file, so instrumenting a phase
+    costs one perf_counter_ns() call. The caller only calls into the profiler
+    when one was requested, so a run without --profile pays nothing. Each
+    phase also counts the files it ran for and the AST nodes it visited, as
+    passed to lap() (e.g. by the traversal and each check), so the cost of
+    a check can be read per node.
+
+    With trace=True every lap is also kept as a span, so the run can be
+    written as a Chrome Trace Event file (write_trace) and inspected in a
+    trace viewer such as Perfetto or chrome://tracing. Spans are buffered
+    per profiler and tagged with its process and thread; a profiler per
+    worker can be combined with merge() at the end.
+
+    With memory=True, allocations are traced with tracemalloc and each lap
+    also records how far memory rose above its level at the previous lap,
+    per phase and per file. Whenever a lap sets a new high, a snapshot is
+    taken, so memory_report() can show what was allocated at the worst
+    point of the run (e.g. ASTNode children lists after building a large
+    tree). Tracing slows the run down, so timings are skewed in this mode.
+
+    Args:
+        slowest: Number of slowest files to keep
+        trace: Keep a span per lap and per file for write_trace()
+        memory: Track peak memory per phase and per file with tracemalloc
+
+    Example:
+        >>> profiler = Profiler()
+        >>> for path in profiler.iterate(files, "discover"):
+        ...     profiler.start_file(path)
+        ...     source = path.read_text()
+        ...     profiler.lap("read")
+        ...     tree = ast.parse(source)
+        ...     profiler.lap("parse")
+        ...     check(tree)
+        ...     profiler.lap("check", nodes=node_count)
+        ...     profiler.end_file()
+        >>> print(profiler)
+    """
+
+    def __init__(self, slowest: int = 10, trace: bool = False, memory: bool = False) -> None:
+        self.slowest = slowest
+        self.pid = os.getpid()
+        self.tid = threading.get_native_id()
+        # (name, category, start_ns, duration_ns, file, pid, tid) per span
+        self.spans: list[tuple] | None = [] if trace else None
+        self.started_ns = time.perf_counter_ns()
+        # phase -> [calls, total_ns, files, nodes], in the order phases first ran
+        self.phases: dict[str, list[int]] = {}
+        self.files = 0
+        self.nodes = 0
+        self._slowest_files: list[tuple[int, int, str]] = []
+        self._last_ns = self.started_ns
+        self._file: str | None = None
+        self._file_ns = 0
+        self._file_nodes = 0
+        self._file_started_ns = 0
+
+        self.memory = memory
+        # phase -> [highest rise, total rise] in bytes
+        self.memory_phases: dict[str, list[int]] = {}
+        self._largest_files: list[tuple[int, str]] = []
+        self._peak_snapshot: tracemalloc.Snapshot | None = None
+        self._peak_rise = 0
+        self._peak_where = ""
+        self._memory_base = 0
+        self._file_memory_base = 0
+        self._file_peak = 0
+        if memory:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            self._memory_base = tracemalloc.get_traced_memory()[0]
+
+    def __repr__(self) -> str:
+        return f"Profiler(files={self.files}, phases={len(self.phases)})"
+
+    def lap(self, phase: str, nodes: int = 0) -> None:
+        """
+        Charge the time since the previous lap to phase, which visited nodes
+        AST nodes of the current file.
+        """
+        now = time.perf_counter_ns()
+        elapsed = now - self._last_ns
+        self._last_ns = now
+        self._file_ns += elapsed
+        in_file = int(self._file is not None)
+        totals = self.phases.get(phase)
+        if totals is None:
+            self.phases[phase] = [1, elapsed, in_file, nodes]
+        else:
+            totals[0] += 1
+            totals[1] += elapsed
+            totals[2] += in_file
+            totals[3] += nodes
+        if nodes > self._file_nodes:
+            self._file_nodes = nodes
+        if self.spans is not None:
+            self.spans.append(
+                (phase, "phase", now - elapsed, elapsed, self._file, self.pid, self.tid)
+            )
+        if self.memory:
+            self._memory_lap(phase)
+
+    def _memory_lap(self, phase: str) -> None:
+        """Charge the rise in traced memory since the previous lap to phase."""
+        current, peak = tracemalloc.get_traced_memory()
+        rise = max(peak - self._memory_base, 0)
+        totals = self.memory_phases.get(phase)
+        if totals is None:
+            self.memory_phases[phase] = [rise, rise]
+        else:
+            totals[0] = max(totals[0], rise)
+            totals[1] += rise
+        self._file_peak = max(self._file_peak, peak - self._file_memory_base)
+        if rise > self._peak_rise:
+            self._peak_rise = rise
+            self._peak_where = f"{phase} of {self._file}" if self._file else phase
+            self._peak_snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self._memory_base = tracemalloc.get_traced_memory()[0]
+
+    def restart(self) -> None:
+        """Start the next lap now, leaving the time since the last one uncharged."""
+        if self.memory:
+            tracemalloc.reset_peak()
+            self._memory_base = tracemalloc.get_traced_memory()[0]
+        self._last_ns = time.perf_counter_ns()
+
+    def iterate(self, items: Iterable[T], phase: str) -> Iterator[T]:
+        """
+        Yield from items, charging the time spent producing each one (e.g.
+        walking the directory tree) to phase.
+        """
+        iterator = iter(items)
+        while True:
+            self.restart()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.lap(phase)
+                return
+            self.lap(phase)
+            yield item
+
+    # -------------------------------------------------------------------------
+    # Files
+    # -------------------------------------------------------------------------
+    def start_file(self, path: str) -> None:
+        """Start charging laps to path as well as to their phase."""
+        self._file = path
+        self._file_ns = 0
+        self._file_nodes = 0
+        self.restart()
+        self._file_started_ns = self._last_ns
+        self._file_memory_base = self._memory_base
+        self._file_peak = 0
+
+    def end_file(self) -> None:
+        """
+        Rank the current file by the time charged to it, and by the most nodes
+        a phase visited in it. Call it even when the file could not be read or
+        parsed.
+        """
+        self.files += 1
+        self.nodes += self._file_nodes
+        if self.spans is not None:
+            self.spans.append(
+                (
+                    self._file,
+                    "file",
+                    self._file_started_ns,
+                    self._last_ns - self._file_started_ns,
+                    self._file,
+                    self.pid,
+                    self.tid,
+                )
+            )
+        entry = (self._file_ns, self._file_nodes, self._file)
+        if len(self._slowest_files) < self.slowest:
+            heapq.heappush(self._slowest_files, entry)
+        elif entry > self._slowest_files[0]:
+            heapq.heapreplace(self._slowest_files, entry)
+        if self.memory:
+            entry = (self._file_peak, self._file)
+            if len(self._largest_files) < self.slowest:
+                heapq.heappush(self._largest_files, entry)
+            elif entry > self._largest_files[0]:
+                heapq.heapreplace(self._largest_files, entry)
+        self._file = None
+
+    def slowest_files(self) -> list[tuple[str, int, int]]:
+        """The slowest files as (path, nanoseconds, nodes), slowest first."""
+        ranked = sorted(self._slowest_files, reverse=True)
+        return [(path, elapsed, nodes) for elapsed, nodes, path in ranked]
+
+    def merge(self, other: Profiler) -> None:
+        """Add the phases, files and spans of another profiler, e.g. a worker's."""
+        for phase, counts in other.phases.items():
+            totals = self.phases.setdefault(phase, [0, 0, 0, 0])
+            for i, count in enumerate(counts):
+                totals[i] += count
+        self.files += other.files
+        self.nodes += other.nodes
+        for entry in other._slowest_files:
+            if len(self._slowest_files) < self.slowest:
+                heapq.heappush(self._slowest_files, entry)
+            elif entry > self._slowest_files[0]:
+                heapq.heapreplace(self._slowest_files, entry)
+        if self.spans is not None and other.spans is not None:
+            self.spans.extend(other.spans)
+
+    # -------------------------------------------------------------------------
+    # Trace
+    # -------------------------------------------------------------------------
+    def write_trace(self, path: str | pathlib.Path) -> None:
+        """
+        Write the spans as a Chrome Trace Event JSON file: one complete ("X")
+        event per span, in microseconds since the profiler started, plus a
+        name for every process and thread that recorded spans.
+        """
+        if self.spans is None:
+            raise ValueError("Profiler was created without trace=True")
+        with open(path, "w", encoding="utf-8") as stream:
+            stream.write('{"displayTimeUnit":"ms","traceEvents":[')
+            separator = ""
+            threads = set()
+            for name, category, start, duration, file, pid, tid in sorted(
+                self.spans, key=lambda span: span[2]
+            ):
+                event = {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self.started_ns) / 1e3,
+                    "dur": duration / 1e3,
+                    "pid": pid,
+                    "tid": tid,
+                }
+                if file is not None:
+                    event["args"] = {"file": file}
+                stream.write(separator + json.dumps(event, separators=(",", ":")))
+                separator = ",\n"
+                threads.add((pid, tid))
+            for pid, tid in sorted(threads):
+                for kind, key, value in (
+                    ("process_name", "name", f"ast-analyzer {pid}"),
+                    ("thread_name", "name", f"worker {tid}"),
+                ):
+                    event = {"name": kind, "ph": "M", "pid": pid, "tid": tid, "args": {key: value}}
+                    stream.write(separator + json.dumps(event, separators=(",", ":")))
+                    separator = ",\n"
+            stream.write("]}\n")
+
+    # -------------------------------------------------------------------------
+    # Memory
+    # -------------------------------------------------------------------------
+    def stop(self) -> None:
+        """Stop tracing allocations, if this profiler started it."""
+        if self.memory and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def largest_files(self) -> list[tuple[str, int]]:
+        """The files that needed the most memory as (path, peak bytes), largest first."""
+        return [(path, peak) for peak, path in sorted(self._largest_files, reverse=True)]
+
+    def allocation_sites(self, limit: int = TOP_ALLOCATION_SITES) -> list[tuple[str, int, int]]:
+        """
+        The source lines holding the most memory at the run's highest lap, as
+        (file:line, bytes, blocks).
+        """
+        if self._peak_snapshot is None:
+            return []
+        snapshot = self._peak_snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+        return [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+
+    def memory_report(self) -> str:
+        """Peak memory per phase and per file, and the top allocation sites."""
+        header = "Memory (tracemalloc"
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux and in bytes on macOS
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if os.uname().sysname == "Darwin":
+                max_rss //= 1024
+            header += f", peak RSS {max_rss / 1024:.1f} MiB"
+        rows = [
+            (phase, calls, f"{highest / 1024:.1f}", f"{total / calls / 1024:.1f}")
+            for phase, (highest, total) in self.memory_phases.items()
+            for calls in (self.phases[phase][0],)
+        ]
+        sections = [f"{header}):\n" + format_rows(rows, ("phase", "calls", "peak KiB", "mean KiB"))]
+        files = [(path, f"{peak / 1024:.1f}") for path, peak in self.largest_files()]
+        if files:
+            sections.append(
+                f"Largest {len(files)} files by peak memory:\n"
+                + format_rows(files, ("path", "peak KiB"))
+            )
+        sites = [
+            (site, f"{size / 1024:.1f}", count) for site, size, count in self.allocation_sites()
+        ]
+        if sites:
+            sections.append(
+                f"Top allocation sites at the highest peak ({self._peak_where}):\n"
+                + format_rows(sites, ("line", "KiB", "blocks"))
+            )
+        return "\n\n".join(sections)
+
+    # -------------------------------------------------------------------------
+    # Report
+    # -------------------------------------------------------------------------
+    def __str__(self) -> str:
+        wall_ns = time.perf_counter_ns() - self.started_ns
+        measured = sum(totals[1] for totals in self.phases.values()) or 1
+        rows = [
+            (
+                phase,
+                calls,
+                files,
+                nodes,
+                f"{total / 1e6:.1f}",
+                f"{total / calls / 1e3:.1f}",
+                f"{total / nodes:.0f}" if nodes else "",
+                f"{100 * total / measured:.1f}",
+            )
+            for phase, (calls, total, files, nodes) in self.phases.items()
+        ]
+        sections = [
+            f"Profile ({self.files} files, {self.nodes} AST nodes, "
+            f"{wall_ns / 1e9:.2f}s wall):\n"
+            + format_rows(
+                rows, ("phase", "calls", "files", "nodes", "total ms", "mean us", "ns/node", "%")
+            )
+        ]
+        files = [
+            (path, f"{elapsed / 1e6:.1f}", nodes) for path, elapsed, nodes in self.slowest_files()
+        ]
+        if files:
+            sections.append(
+                f"Slowest {len(files)} files:\n" + format_rows(files, ("path", "ms", "nodes"))
+            )
+        return "\n\n".join(sections)
@@ -0,0 +1,366 @@
+"""
+SQLite store of findings and per-file metrics across runs
+"""
+
+from __future__ import annotations
+
+import datetime
+import pathlib
+import sqlite3
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from ast_analyzer.classes.AnalysisResult import AnalysisResult
+
+STORE_VERSION = 2
+
+# Files are buffered and written with executemany() in batches of this size
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    root TEXT NOT NULL,
+    files INTEGER NOT NULL DEFAULT 0,
+    warnings INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+-- One row per distinct content of a file analyzed with a given configuration
+-- (config is a fingerprint of the analyzer version, thresholds and naming
+-- rules). Unchanged files point new runs at their existing version instead of
+-- storing their metrics and findings again.
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    digest TEXT NOT NULL,
+    config TEXT NOT NULL,
+    functions INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    max_complexity INTEGER NOT NULL,
+    total_complexity INTEGER NOT NULL,
+    max_depth INTEGER NOT NULL,
+    UNIQUE (file_id, digest, config)
+);
+CREATE TABLE IF NOT EXISTS run_files (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    version_id INTEGER NOT NULL REFERENCES versions(id),
+    PRIMARY KEY (run_id, version_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS run_files_version ON run_files (version_id);
+-- Findings about a single file, stored once per version
+CREATE TABLE IF NOT EXISTS findings (
+    version_id INTEGER NOT NULL REFERENCES versions(id),
+    rule TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_version ON findings (version_id);
+CREATE INDEX IF NOT EXISTS findings_rule ON findings (rule);
+-- Findings that depend on the whole project (circular imports, duplicates)
+CREATE TABLE IF NOT EXISTS project_findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS project_findings_run ON project_findings (run_id);
+"""
+
+# Every finding of the run :run, per file and project-wide
+RUN_FINDINGS = """
+SELECT f.path, fi.rule, fi.severity, fi.value, fi.start_line, fi.end_line, fi.message
+FROM run_files rf
+JOIN versions v ON v.id = rf.version_id
+JOIN files f ON f.id = v.file_id
+JOIN findings fi ON fi.version_id = v.id
+WHERE rf.run_id = :run
+UNION ALL
+SELECT file, rule, severity, value, start_line, end_line, message
+FROM project_findings WHERE run_id = :run
+"""
+
+
+class FileMetrics(NamedTuple):
+    """Per-file totals of the per-function metrics."""
+
+    functions: int
+    lines: int
+    max_complexity: int
+    total_complexity: int
+    max_depth: int
+
+    @classmethod
+    def from_functions(cls, records, num_lines: int) -> FileMetrics:
+        """Summarize a file's FunctionMetrics rows."""
+        return cls(
+            functions=len(records),
+            lines=num_lines,
+            max_complexity=max((r.complexity for r in records), default=0),
+            total_complexity=sum(r.complexity for r in records),
+            max_depth=max((r.max_depth for r in records), default=0),
+        )
+
+
+class ResultStore:
+    """
+    Keeps the findings and per-file metrics of every run in a SQLite
+    database, so questions about history can be answered with a query
+    instead of a re-analysis.
+
+    A file's metrics and findings are stored once per distinct content
+    (keyed by its hash) and analysis configuration. A run that sees an
+    unchanged file with the same configuration only links the run to the
+    existing version; a changed configuration stores the file again, since
+    its findings may differ. New rows are buffered and written with
+    executemany() in batches, all inside one transaction per run.
+
+    Example:
+        >>> with ResultStore("results.db") as store:
+        ...     store.begin_run("src", config_fingerprint(naming))
+        ...     store.add_file("pkg/mod.py", digest, metrics, file_results)
+        ...     store.add_project_findings(project_results)
+        ...     store.finish_run()
+        >>> store.top_files("max_complexity", prefix="payments/", runs=30, limit=50)
+    """
+
+    METRICS = FileMetrics._fields
+
+    def __init__(self, path: str | pathlib.Path) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.run_id: int | None = None
+        self._file_ids: dict[str, int] = {}
+        self._version_ids: dict[tuple[int, str], int] = {}
+        self._config = ""
+        self._pending: list[tuple[str, str, FileMetrics, AnalysisResult]] = []
+        self._files_in_run = 0
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is not None and self.run_id is not None:
+            self.connection.rollback()
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _migrate(self) -> None:
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, STORE_VERSION):
+            raise ValueError(
+                f"{self.path} was written by an incompatible version (store version {version})"
+            )
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version={STORE_VERSION}")
+        self.connection.commit()
+
+    # -------------------------------------------------------------------------
+    # Recording a run
+    # -------------------------------------------------------------------------
+    def begin_run(self, root: str | pathlib.Path, config: str = "") -> int:
+        """
+        Start recording a run over root and return its id. config identifies
+        the analysis configuration; stored versions of files are only reused
+        by runs with the same config.
+        """
+        started_at = datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds")
+        cursor = self.connection.execute(
+            "INSERT INTO runs (started_at, root) VALUES (?, ?)",
+            (started_at, str(pathlib.Path(root).resolve())),
+        )
+        self.run_id = cursor.lastrowid
+        self._file_ids = dict(self.connection.execute("SELECT path, id FROM files"))
+        self._config = config
+        self._version_ids = {
+            (file_id, digest): version_id
+            for version_id, file_id, digest in self.connection.execute(
+                "SELECT id, file_id, digest FROM versions WHERE config = ?", (config,)
+            )
+        }
+        self._files_in_run = 0
+        return self.run_id
+
+    def add_file(
+        self, path: str, digest: str, metrics: FileMetrics, results: AnalysisResult
+    ) -> None:
+        """
+        Record a file seen in this run: its path relative to the run's root,
+        a hash of its content, its metrics and the findings about it alone.
+        """
+        self._pending.append((path, digest, metrics, results))
+        self._files_in_run += 1
+        if len(self._pending) >= BATCH_SIZE:
+            self._flush()
+
+    def add_project_findings(self, results: AnalysisResult) -> None:
+        """Record findings that depend on the whole project, such as circular imports."""
+        self.connection.executemany(
+            "INSERT INTO project_findings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((self.run_id, *_finding_row(finding)) for finding in results),
+        )
+
+    def finish_run(self) -> None:
+        """Write everything still buffered, store the run totals and commit."""
+        self._flush()
+        self.connection.execute(
+            "UPDATE runs SET files = :files,"
+            " warnings = (SELECT COUNT(*) FROM (" + RUN_FINDINGS + ") WHERE severity = 'warning'),"
+            " errors = (SELECT COUNT(*) FROM (" + RUN_FINDINGS + ") WHERE severity = 'error')"
+            " WHERE id = :run",
+            {"files": self._files_in_run, "run": self.run_id},
+        )
+        self.connection.commit()
+        self.run_id = None
+
+    def _flush(self) -> None:
+        """Insert the buffered files, skipping the metrics and findings of known versions."""
+        if not self._pending:
+            return
+        cursor = self.connection.cursor()
+        cursor.executemany(
+            "INSERT OR IGNORE INTO files (path) VALUES (?)",
+            ((path,) for path, *_ in self._pending if path not in self._file_ids),
+        )
+        missing = [path for path, *_ in self._pending if path not in self._file_ids]
+        for start in range(0, len(missing), BATCH_SIZE):
+            batch = missing[start : start + BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            self._file_ids.update(
+                cursor.execute(f"SELECT path, id FROM files WHERE path IN ({placeholders})", batch)
+            )
+
+        new_versions = []
+        for path, digest, metrics, results in self._pending:
+            key = (self._file_ids[path], digest)
+            if key not in self._version_ids:
+                cursor.execute(
+                    "INSERT INTO versions (file_id, digest, config, functions, lines, "
+                    "max_complexity, total_complexity, max_depth) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, self._config, *metrics),
+                )
+                self._version_ids[key] = cursor.lastrowid
+                new_versions.append((cursor.lastrowid, results))
+
+        cursor.executemany(
+            "INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (version_id, *_finding_row(finding)[1:])
+                for version_id, results in new_versions
+                for finding in results
+            ),
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO run_files VALUES (?, ?)",
+            (
+                (self.run_id, self._version_ids[(self._file_ids[path], digest)])
+                for path, digest, *_ in self._pending
+            ),
+        )
+        self._pending.clear()
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    def _recent_runs(self, runs: int | None) -> list[int]:
+        query = "SELECT id FROM runs ORDER BY id DESC"
+        if runs is not None:
+            return [row[0] for row in self.connection.execute(query + " LIMIT ?", (runs,))]
+        return [row[0] for row in self.connection.execute(query)]
+
+    def runs(self, limit: int = 20) -> list[tuple]:
+        """The most recent runs as (id, started_at, root, files, warnings, errors)."""
+        return self.connection.execute(
+            "SELECT id, started_at, root, files, warnings, errors FROM runs "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def top_files(
+        self,
+        metric: str = "max_complexity",
+        prefix: str = "",
+        runs: int | None = None,
+        limit: int = 50,
+    ) -> list[tuple[str, int]]:
+        """
+        Files with the highest value of a metric, as (path, value).
+
+        Args:
+            metric: One of the FileMetrics fields
+            prefix: Only files whose path starts with this, e.g. "payments/"
+            runs: Only consider the most recent runs; all runs if None
+            limit: Number of files to return
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Use one of: {', '.join(self.METRICS)}")
+        run_ids = self._recent_runs(runs)
+        if not run_ids:
+            return []
+        placeholders = ",".join("?" * len(run_ids))
+        return self.connection.execute(
+            f"SELECT f.path, MAX(v.{metric}) AS value FROM run_files rf "
+            "JOIN versions v ON v.id = rf.version_id "
+            "JOIN files f ON f.id = v.file_id "
+            f"WHERE rf.run_id IN ({placeholders}) AND substr(f.path, 1, ?) = ? "
+            "GROUP BY f.path ORDER BY value DESC, f.path LIMIT ?",
+            (*run_ids, len(prefix), prefix, limit),
+        ).fetchall()
+
+    def findings(
+        self, run: int | None = None, rule: str | None = None, prefix: str = "", limit: int = 100
+    ) -> list[tuple]:
+        """
+        Findings of a run (the latest by default) as
+        (path, rule, severity, value, start_line, end_line, message).
+        """
+        if run is None:
+            latest = self._recent_runs(1)
+            if not latest:
+                return []
+            run = latest[0]
+        return self.connection.execute(
+            "SELECT * FROM (" + RUN_FINDINGS + ") "
+            "WHERE (:rule IS NULL OR rule = :rule) AND substr(path, 1, :length) = :prefix "
+            "LIMIT :limit",
+            {"run": run, "rule": rule, "length": len(prefix), "prefix": prefix, "limit": limit},
+        ).fetchall()
+
+
+def _finding_row(finding: dict) -> tuple:
+    return (
+        finding["file"],
+        finding["rule"],
+        finding["severity"],
+        finding["value"],
+        finding["start_line"],
+        finding["end_line"],
+        finding["message"],
+    )
+
+
+def format_rows(rows: Iterable[tuple], headers: tuple[str, ...]) -> str:
+    """Format query rows as an aligned plain-text table."""
+    rows = [tuple(str(value) for value in row) for row in rows]
+    widths = [max([len(h), *(len(row[i]) for row in rows)]) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths, strict=True)).rstrip()]
+    lines.extend(
+        "  ".join(v.ljust(w) for v, w in zip(row, widths, strict=True)).rstrip() for row in rows
+    )
+    return "\n".join(lines)
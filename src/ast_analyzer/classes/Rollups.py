@@ -0,0 +1,158 @@
+"""
+Single-pass aggregates of a run: worst files per metric and per-directory totals
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any
+
+from ast_analyzer.classes.AnalysisResult import AnalysisResult
+from ast_analyzer.classes.ResultStore import FileMetrics, format_rows
+
+# Per-file values that files are ranked by
+FINDING_METRICS = ("warnings", "errors")
+TOP_METRICS = (*FileMetrics._fields, *FINDING_METRICS)
+
+# Totals kept for every directory
+DIRECTORY_FIELDS = ("files", "lines", "functions", "warnings", "errors")
+
+
+class Rollups:
+    """
+    Aggregates a run one file at a time:
+
+    - the k files with the highest value of each FileMetrics field and of
+      their warnings and errors, kept in one min-heap of size k per metric,
+      so each file costs O(log k). Findings are fed separately, so the
+      rollups count exactly what was reported (findings left after the
+      baseline): each file's own findings with add_findings() as it is
+      reported, and the project findings (circular imports, duplicates,
+      linters) with add_project_findings() at the end of the run
+    - warnings and errors per file with project findings, merged into the
+      heaps when read. A file whose own findings fell out of its heap is
+      ranked by its project findings alone
+    - totals per directory prefix ("." for the whole tree, then "pkg",
+      "pkg/sub", ...) down to max_depth levels, so memory grows with the
+      number of directories and project findings, not files or findings
+
+    Example:
+        >>> rollups = Rollups(k=10, max_depth=2)
+        >>> rollups.add_file("payments/api.py", metrics)
+        >>> rollups.add_findings(reported_results)
+        >>> rollups.add_project_findings(reported_project_results)
+        >>> rollups.top("max_complexity")
+        [('payments/api.py', 31), ...]
+        >>> rollups.directories()["payments"]
+        {'files': 1, 'lines': 420, 'functions': 12, 'warnings': 3, 'errors': 1}
+    """
+
+    def __init__(self, k: int = 10, max_depth: int | None = None) -> None:
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.max_depth = max_depth
+        self._heaps: dict[str, list[tuple[int, str]]] = {metric: [] for metric in TOP_METRICS}
+        # [warnings, errors] per file with project findings
+        self._project_findings: dict[str, list[int]] = {}
+        self._directories: dict[str, list[int]] = {}
+
+    def __repr__(self) -> str:
+        return f"Rollups(k={self.k}, max_depth={self.max_depth})"
+
+    def add_file(self, path: str, metrics: FileMetrics) -> None:
+        """
+        Count one file, given its path relative to the analyzed directory
+        (with forward slashes) and its metrics.
+        """
+        for metric, value in zip(FileMetrics._fields, metrics, strict=True):
+            self._push(metric, value, path)
+        self._add_totals(path, (1, metrics.lines, metrics.functions, 0, 0))
+
+    def add_findings(self, results: AnalysisResult) -> None:
+        """
+        Count the reported findings about a file. Each file's findings are
+        expected in a single call.
+        """
+        for path, (warnings, errors) in results.counts_by_file().items():
+            if warnings:
+                self._push("warnings", warnings, path)
+            if errors:
+                self._push("errors", errors, path)
+            self._add_totals(path, (0, 0, 0, warnings, errors))
+
+    def add_project_findings(self, results: AnalysisResult) -> None:
+        """Count reported project findings, attributed to the files they are about."""
+        for path, (warnings, errors) in results.counts_by_file().items():
+            counts = self._project_findings.setdefault(path, [0, 0])
+            counts[0] += warnings
+            counts[1] += errors
+            self._add_totals(path, (0, 0, 0, warnings, errors))
+
+    def _push(self, metric: str, value: int, path: str) -> None:
+        heap = self._heaps[metric]
+        if len(heap) < self.k:
+            heapq.heappush(heap, (value, path))
+        elif value > heap[0][0]:
+            heapq.heapreplace(heap, (value, path))
+
+    def _add_totals(self, path: str, row: tuple[int, ...]) -> None:
+        for directory in self._prefixes(path):
+            totals = self._directories.get(directory)
+            if totals is None:
+                self._directories[directory] = list(row)
+            else:
+                for i, value in enumerate(row):
+                    totals[i] += value
+
+    def _prefixes(self, path: str) -> list[str]:
+        """The directories containing path, from the root down to max_depth levels."""
+        parts = path.split("/")[:-1]
+        if self.max_depth is not None:
+            parts = parts[: self.max_depth]
+        return ["."] + ["/".join(parts[: i + 1]) for i in range(len(parts))]
+
+    # -------------------------------------------------------------------------
+    # Reading aggregates
+    # -------------------------------------------------------------------------
+    def top(self, metric: str) -> list[tuple[str, int]]:
+        """The worst files for metric as (path, value), highest value first."""
+        if metric not in self._heaps:
+            raise ValueError(f"Unknown metric '{metric}'. Use one of: {', '.join(TOP_METRICS)}")
+        candidates = self._heaps[metric]
+        if metric in FINDING_METRICS and self._project_findings:
+            column = FINDING_METRICS.index(metric)
+            totals = {path: value for value, path in candidates}
+            for path, counts in self._project_findings.items():
+                totals[path] = totals.get(path, 0) + counts[column]
+            candidates = [(value, path) for path, value in totals.items()]
+        ranked = heapq.nsmallest(self.k, candidates, key=lambda item: (-item[0], item[1]))
+        return [(path, value) for value, path in ranked if value > 0]
+
+    def directories(self) -> dict[str, dict[str, int]]:
+        """Totals per directory prefix, sorted by path."""
+        return {
+            directory: dict(zip(DIRECTORY_FIELDS, totals, strict=True))
+            for directory, totals in sorted(self._directories.items())
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Every aggregate as plain data, e.g. for a dashboard."""
+        return {
+            "top": {metric: self.top(metric) for metric in TOP_METRICS},
+            "directories": self.directories(),
+        }
+
+    def __str__(self) -> str:
+        sections = []
+        for metric in TOP_METRICS:
+            rows = self.top(metric)
+            if rows:
+                sections.append(
+                    f"Top {self.k} files by {metric}:\n{format_rows(rows, ('path', metric))}"
+                )
+        rows = [(directory, *totals.values()) for directory, totals in self.directories().items()]
+        sections.append(
+            "Totals by directory:\n" + format_rows(rows, ("directory", *DIRECTORY_FIELDS))
+        )
+        return "\n\n".join(sections)
@@ -1,5 +1,23 @@
 """Classes package for AST Analyzer."""
 
 from ast_analyzer.classes import AnalysisResult
+from ast_analyzer.classes import Baseline
+from ast_analyzer.classes import DuplicateIndex
+from ast_analyzer.classes import FindingSink
+from ast_analyzer.classes import ImportGraph
+from ast_analyzer.classes import NamingConventions
+from ast_analyzer.classes import Profiler
+from ast_analyzer.classes import ResultStore
+from ast_analyzer.classes import Rollups
 
-__all__ = ["AnalysisResult"]
+__all__ = [
+    "AnalysisResult",
+    "Baseline",
+    "DuplicateIndex",
+    "FindingSink",
+    "ImportGraph",
+    "NamingConventions",
+    "Profiler",
+    "ResultStore",
+    "Rollups",
+]
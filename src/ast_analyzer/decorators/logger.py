@@ -1,8 +1,25 @@
 import functools
 import logging
+import reprlib
 
 from typing import Callable, Any, Optional
 
+# Default cap on the length of each logged argument and result
+DEFAULT_MAX_REPR = 80
+
+
+class _LazyFormat:
+    """Formats a value only when a handler actually emits the record."""
+
+    __slots__ = ("value", "format")
+
+    def __init__(self, value: Any, format: Callable[[Any], str]):
+        self.value = value
+        self.format = format
+
+    def __str__(self) -> str:
+        return self.format(self.value)
+
 
 class logger:
     """Decorator for logging function calls during AST analysis.
@@ -14,6 +31,12 @@ class logger:
         level: Logging level (e.g., logging.DEBUG, logging.INFO)
         name: Optional logger name (defaults to function's module)
         message: Optional log message (defaults to function's name)
+        max_repr: Longest text logged for an argument or result; longer ones,
+            and large argument containers, are shortened with "..."
+
+    Nothing is formatted unless the logger is enabled for level, and then
+    only when a handler emits the record, so the decorator is cheap to leave
+    on hot functions in production.
 
     Example:
         >>> @logger(logging.INFO)
@@ -25,10 +48,33 @@ class logger:
         ...     pass
     """
 
-    def __init__(self, level: int, name: Optional[str] = None, message: Optional[str] = None):
+    def __init__(
+        self,
+        level: int,
+        name: Optional[str] = None,
+        message: Optional[str] = None,
+        max_repr: int = DEFAULT_MAX_REPR,
+    ):
         self.level = level
         self.logname = name
         self.logmsg = message
+        self.max_repr = max_repr
+        self.repr = reprlib.Repr(maxstring=max_repr, maxother=max_repr, maxlevel=2)
+
+    def _shorten(self, value: Any) -> str:
+        """
+        A result cut to max_repr characters. Strings are logged as they are,
+        sliced before anything is built from them; other values go through
+        the bounded reprlib formatter, so a large result is never formatted
+        in full.
+        """
+        if isinstance(value, str):
+            text = value[: self.max_repr + 1]
+        else:
+            text = self.repr.repr(value)
+        if len(text) > self.max_repr:
+            return text[: self.max_repr - 3] + "..."
+        return text
 
     def __call__(self, fn: Callable[..., Any]):
         self.fn = fn
@@ -38,16 +84,29 @@ class logger:
 
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
-            self.log.log(self.level, f"Begin Function {self.logmsg} | Args: {args}")
+            if self.log.isEnabledFor(self.level):
+                self.log.log(
+                    self.level,
+                    "Begin Function %s | Args: %s",
+                    self.logmsg,
+                    _LazyFormat(args, self.repr.repr),
+                )
             try:
                 result = fn(*args, **kwargs)
             except:
                 self.log.exception(
-                    f"Error during execution of {self.logmsg}. See traceback below",
+                    "Error during execution of %s. See traceback below",
+                    self.logmsg,
                 )
                 raise
             else:
-                self.log.log(self.level, f"Function {self.logname} Complete. Result: {result}")
+                if self.log.isEnabledFor(self.level):
+                    self.log.log(
+                        self.level,
+                        "Function %s Complete. Result: %s",
+                        self.logname,
+                        _LazyFormat(result, self._shorten),
+                    )
                 return result
 
         return wrapper
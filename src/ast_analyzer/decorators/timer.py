@@ -1,24 +1,72 @@
+import atexit
 import functools
+import sys
+import threading
 import time
+import types
 
 from typing import Callable, Any
 
+from ast_analyzer.reporter import StreamingStats
+
 DEFAULT_FMT = "[{curr_time} | {time_taken:0.2f}s] {fn_name}({args}) -> {result}"
 
+# Quiet timers, reported together by report() and at exit
+_quiet_timers: list["timer"] = []
+
 
 class timer:
     """
     Custom decorator that allows for functions to have timing metrics display per run
+
+    With quiet=True nothing is formatted or printed per call. Each call's
+    duration is recorded in nanoseconds into a histogram instead, and
+    report() (or the summary printed at exit) shows percentiles per function.
+    That keeps the overhead low enough for hot functions such as visitors.
+
+    Example:
+        >>> @timer(quiet=True)
+        ... def visit(node): ...
+        >>> visit.percentiles()
+        {'p50': 1200, 'p95': 3100, 'p99': 8400}
     """
 
-    def __init__(self, fn: Callable, fmt: str = DEFAULT_FMT):
+    def __new__(cls, fn: Callable | None = None, *args: Any, **options: Any):
+        # @timer(quiet=True) is called without the function first
+        if fn is None and not args:
+            return functools.partial(cls, **options)
+        return super().__new__(cls)
+
+    def __init__(self, fn: Callable, fmt: str = DEFAULT_FMT, quiet: bool = False):
         functools.wraps(fn)(self)
         self.fn = fn
         self.fmt = fmt
+        self.quiet = quiet
         self.accumulated_time = 0.0
         self.times_called = 0
+        self.stats = StreamingStats()
+        self._lock = threading.Lock()
+        if quiet:
+            _quiet_timers.append(self)
+
+    def __get__(self, instance: Any, owner: type | None = None):
+        # Bind like a function so the decorator also works on methods
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
 
     def __call__(self, *args: Any, **kwargs: Any):
+        if self.quiet:
+            start_ns = time.perf_counter_ns()
+            try:
+                return self.fn(*args, **kwargs)
+            finally:
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                with self._lock:
+                    self.stats.add(elapsed_ns)
+                    self.accumulated_time += elapsed_ns / 1e9
+                    self.times_called += 1
+
         # Start timer
         curr_time = time.strftime("%H:%M:%S", time.localtime())
         start_time = time.perf_counter()
@@ -50,5 +98,38 @@ class timer:
             print(f"{'-' * 20} WARNING: Function took longer than 0.5s {'-' * 20}")
         return _result
 
+    def percentiles(self) -> dict[str, int]:
+        """p50, p95 and p99 of the recorded call durations, in nanoseconds."""
+        with self._lock:
+            return {f"p{p}": self.stats.percentile(p) for p in (50, 95, 99)}
+
     def __repr__(self):
         return f"Function '{self.fn.__name__}' called {self.times_called} times. Total time: {self.accumulated_time:.2f}s."
+
+
+def report() -> str:
+    """Call counts and latency percentiles of every quiet timer that ran."""
+    lines = [f"{'function':<40} {'calls':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'total':>10}"]
+    for timed in _quiet_timers:
+        if not timed.times_called:
+            continue
+        p = timed.percentiles()
+        lines.append(
+            f"{timed.fn.__qualname__:<40} {timed.times_called:>10} "
+            f"{_format_ns(p['p50']):>10} {_format_ns(p['p95']):>10} "
+            f"{_format_ns(p['p99']):>10} {timed.accumulated_time:>9.3f}s"
+        )
+    return "\n".join(lines)
+
+
+def _format_ns(ns: int) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.1f}{unit}"
+    return f"{ns}ns"
+
+
+@atexit.register
+def _report_at_exit() -> None:
+    if any(timed.times_called for timed in _quiet_timers):
+        print(report(), file=sys.stderr)
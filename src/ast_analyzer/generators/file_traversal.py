@@ -82,7 +82,13 @@ def skip_virtual_envs(
 
 
 def skip_cache(files: Generator[pathlib.Path, None, None]) -> Generator[pathlib.Path, None, None]:
-    caches = ["__pycache__/", ".mypy_cache/", ".pytest_cache/", ".ruff_cache/"]
+    caches = [
+        "__pycache__/",
+        ".mypy_cache/",
+        ".pytest_cache/",
+        ".ruff_cache/",
+        ".ast_analyzer_cache/",
+    ]
     for file in files:
         full_path = str(file)
         if not any(cache in full_path for cache in caches):
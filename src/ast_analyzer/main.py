@@ -6,72 +6,703 @@ Entry point for the AST Analyzer application
 
 import argparse
 import ast
+import cProfile
+import hashlib
 import logging
+import os
+import pathlib
+import re
+import sqlite3
+import sys
 import textwrap
+from array import array
+from typing import NamedTuple
 
 from ast_analyzer import ASTNode
 from ast_analyzer import analyzer
+from ast_analyzer import batch
 from ast_analyzer import parser
+from ast_analyzer import reporter
 from ast_analyzer.classes import AnalysisResult
+from ast_analyzer.classes import Baseline
+from ast_analyzer.classes import DuplicateIndex
+from ast_analyzer.classes import FindingSink
+from ast_analyzer.classes import ImportGraph
+from ast_analyzer.classes import NamingConventions
+from ast_analyzer.classes import Profiler
+from ast_analyzer.classes import ResultStore
+from ast_analyzer.classes import Rollups
 from ast_analyzer.generators import file_traversal
 
+CACHE_DIR_NAME = ".ast_analyzer_cache"
 
-def main():
-    # Step 1: Parse CLI arguments for directory
-    parser = argparse.ArgumentParser(
+
+class FileAnalysis(NamedTuple):
+    """
+    What a byte-identical copy of an analyzed file needs to reuse its analysis.
+    One is kept per distinct file for the whole run, so it holds only the
+    findings (None for a clean file), the structural blocks, the totals and
+    the complexity and length of each function, not the function rows.
+    """
+
+    path: pathlib.Path
+    results: AnalysisResult.AnalysisResult | None
+    blocks: tuple
+    metrics: ResultStore.FileMetrics
+    # Complexity and length of each function, interleaved
+    function_sizes: array
+    batch_row: int | None = None
+
+    @classmethod
+    def from_analysis(cls, path, results, code_analyzer, metrics):
+        """Keep what reuse needs from a file's analysis."""
+        sizes = array("I")
+        for record in code_analyzer.function_metrics:
+            sizes.extend((record.complexity, record.num_lines))
+        return cls(
+            path=path,
+            results=results if results else None,
+            blocks=tuple(code_analyzer.structural_blocks),
+            metrics=metrics,
+            function_sizes=sizes,
+            batch_row=code_analyzer.batch_row,
+        )
+
+
+def reuse_analysis(original, file, path, import_graph, duplicate_index):
+    """
+    Give file the findings of a byte-identical file that was already analyzed,
+    and record it in the project-wide stages as if it had been analyzed itself.
+    Returns the findings, attributed to path (file relative to the analyzed
+    directory).
+    """
+    file_results = AnalysisResult.AnalysisResult()
+    if original.results is not None:
+        file_results.merge(original.results, filename=path)
+    if not import_graph.is_fresh(file):
+        import_graph.update(file, import_graph.imports_of(original.path))
+    duplicate_index.add(path, original.blocks)
+    return file_results
+
+
+def query(argv):
+    """Answer questions about past runs from a --store database."""
+    arg_parser = argparse.ArgumentParser(
+        prog="ast-analyzer query",
+        description="Query findings and metrics recorded with --store",
+    )
+    arg_parser.add_argument("store", help="Path to the SQLite database written by --store")
+    subparsers = arg_parser.add_subparsers(dest="question", required=True)
+
+    subparsers.add_parser("runs", help="List recent runs").add_argument(
+        "--limit", type=int, default=20, help="Number of runs to show (default: 20)"
+    )
+
+    top_files = subparsers.add_parser("top-files", help="Files with the highest metric value")
+    top_files.add_argument(
+        "--metric",
+        default="max_complexity",
+        choices=ResultStore.ResultStore.METRICS,
+        help="Metric to rank files by (default: max_complexity)",
+    )
+    top_files.add_argument("--prefix", default="", help="Only paths starting with this")
+    top_files.add_argument("--runs", type=int, help="Only the most recent RUNS runs")
+    top_files.add_argument("--limit", type=int, default=50, help="Number of files (default: 50)")
+
+    findings = subparsers.add_parser("findings", help="Findings of a run")
+    findings.add_argument("--run", type=int, help="Run id (default: the latest run)")
+    findings.add_argument("--rule", help="Only this rule, e.g. complexity")
+    findings.add_argument("--prefix", default="", help="Only paths starting with this")
+    findings.add_argument("--limit", type=int, default=100, help="Number of rows (default: 100)")
+    args = arg_parser.parse_args(argv)
+
+    if not pathlib.Path(args.store).is_file():
+        arg_parser.error(f"no store at {args.store}")
+    with ResultStore.ResultStore(args.store) as store:
+        if args.question == "runs":
+            rows = store.runs(args.limit)
+            headers = ("run", "started_at", "root", "files", "warnings", "errors")
+        elif args.question == "top-files":
+            rows = store.top_files(args.metric, args.prefix, args.runs, args.limit)
+            headers = ("path", args.metric)
+        else:
+            rows = store.findings(args.run, args.rule, args.prefix, args.limit)
+            headers = ("path", "rule", "severity", "value", "start", "end", "message")
+    print(ResultStore.format_rows(rows, headers))
+
+
+def relative_path(file, directory):
+    """Path of file relative to the analyzed directory, with forward slashes."""
+    return pathlib.PurePath(os.path.relpath(file, directory)).as_posix()
+
+
+def build_parser():
+    """The command line of an analysis run."""
+    arg_parser = argparse.ArgumentParser(
         prog="ast-analyzer",
         description="Analyze Python codebases for code quality metrics",
     )
-    parser.add_argument(
+    arg_parser.add_argument(
         "directory",
         help="Path to the directory to analyze",
     )
-    parser.add_argument(
+    arg_parser.add_argument(
         "--show-logs",
         action="store_true",
         help="Show detailed logging output",
     )
-    args = parser.parse_args()
+    arg_parser.add_argument(
+        "--cache-dir",
+        help=f"Directory for data reused between runs (default: <directory>/{CACHE_DIR_NAME})",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write cached data; recompute everything",
+    )
+    arg_parser.add_argument(
+        "--naming",
+        action="append",
+        default=[],
+        metavar="KIND=REGEX",
+        help=(
+            "Override the naming convention for class, function, argument or variable "
+            "names. Repeat a kind to allow several patterns."
+        ),
+    )
+    output_formats = arg_parser.add_mutually_exclusive_group()
+    output_formats.add_argument(
+        "--jsonl",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help=(
+            "Stream findings as JSON Lines to PATH (stdout if omitted) as each file "
+            "completes, instead of keeping them for the final report"
+        ),
+    )
+    output_formats.add_argument(
+        "--json",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="Stream findings as a single JSON document to PATH (stdout if omitted)",
+    )
+    output_formats.add_argument(
+        "--sarif",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="Stream findings as a SARIF 2.1.0 log to PATH (stdout if omitted)",
+    )
+    arg_parser.add_argument(
+        "--store",
+        metavar="DB",
+        help=(
+            "Record this run's findings and per-file metrics in a SQLite database. "
+            "Query it with: ast-analyzer query DB"
+        ),
+    )
+    arg_parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        help=(
+            "Only report findings that are not in this baseline, and exit with "
+            "status 1 if there are any"
+        ),
+    )
+    arg_parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="Record every current finding in the --baseline file instead of filtering",
+    )
+    arg_parser.add_argument(
+        "--top",
+        type=int,
+        metavar="K",
+        help=(
+            "Report the K worst files per metric and totals per directory instead "
+            "of listing every finding"
+        ),
+    )
+    arg_parser.add_argument(
+        "--directory-depth",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Directory levels to total with --top (default: 2)",
+    )
+    arg_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help=(
+            "Evaluate complexity, length, nesting and count thresholds for batches of "
+            'files at once with NumPy (needs: pip install "AST-Analyzer[batch]")'
+        ),
+    )
+    arg_parser.add_argument(
+        "--linters",
+        metavar="NAMES",
+        help=(
+            "Comma-separated external linters to run alongside the analysis "
+            f"({', '.join(reporter.LINTERS)}); their findings are reported with the rest"
+        ),
+    )
+    arg_parser.add_argument(
+        "--linter-jobs",
+        type=int,
+        metavar="N",
+        help="Linter processes to run at once (default: number of CPUs)",
+    )
+    arg_parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show files done, throughput and ETA on stderr while the run goes",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=int,
+        const=10,
+        metavar="N",
+        help=(
+            "Print the time spent per phase and per check, and the N slowest files (default: 10)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help=(
+            "Write a Chrome Trace Event JSON timeline of each file's read, parse, "
+            "build and check phases to FILE (open it in Perfetto or chrome://tracing)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help=(
+            "Trace allocations and report peak memory per phase and per file, and "
+            "the top allocation sites (slows the run down)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--cprofile",
+        metavar="FILE",
+        help="Write cProfile statistics of the whole run to FILE (read with pstats)",
+    )
+    return arg_parser
 
-    # Configure logging based on flag
-    log_level = logging.INFO if args.show_logs else logging.WARNING
-    logging.basicConfig(level=log_level)
 
-    directory = args.directory
+class AnalysisRun:
+    """
+    One analysis of a directory: the stages set up from the command line
+    options, and the state shared by every file until the summary is printed.
 
-    # Step 2: Filter out all invalid files from directory
-    working_files = file_traversal.get_working_files(directory)
-    results = AnalysisResult.AnalysisResult()
+    Invalid options are reported through arg_parser.error(), which exits.
+
+    Example:
+        >>> run = AnalysisRun(args, arg_parser)
+        >>> for file in run.working_files:
+        ...     run.analyze_file(file)
+        >>> run.finish()
+        >>> status = run.print_summary()
+    """
+
+    def __init__(self, args, arg_parser):
+        self.args = args
+        self.arg_parser = arg_parser
+        if args.write_baseline and not args.baseline:
+            arg_parser.error("--write-baseline requires --baseline FILE")
+        self.naming = self._naming_conventions()
+
+        self.profiler = None
+        if args.profile is not None or args.trace or args.memory_report:
+            self.profiler = Profiler.Profiler(
+                args.profile or 10, trace=bool(args.trace), memory=args.memory_report
+            )
+
+        self.directory = directory = args.directory
+        cache_dir = None
+        if not args.no_cache:
+            cache_dir = pathlib.Path(args.cache_dir or pathlib.Path(directory) / CACHE_DIR_NAME)
+        self.cache_dir = cache_dir
+
+        # Step 2: Filter out all invalid files from directory
+        self.working_files = file_traversal.get_working_files(directory)
+        if self.profiler:
+            self.working_files = self.profiler.iterate(self.working_files, "discover")
+        self.sink, self.output = self._open_sink()
+        self.rollups = self._rollups()
+        # With rollups only totals are printed, so findings are counted rather than kept
+        if self.rollups is not None and self.sink is None:
+            self.sink = FindingSink.FindingSink()
+        self.results = AnalysisResult.AnalysisResult(sink=self.sink)
+        if cache_dir:
+            self.import_graph = ImportGraph.ImportGraph.load(
+                cache_dir / "import_graph.json", directory
+            )
+        else:
+            self.import_graph = ImportGraph.ImportGraph(directory)
+        self.duplicate_index = DuplicateIndex.DuplicateIndex()
+        self.baseline = self._load_baseline()
+        self.fingerprints = array("Q")
+        self.suppressed = 0
+
+        self.store = self._open_store()
+        self.analyzed_files: dict[str, FileAnalysis] = {}
+        self.evaluator = self._batch_evaluator()
+        self.progress = self._progress()
+        self.collector = reporter.MetricsCollector()
+        self.run_stats = reporter.RunStats()
+        self.linters = self._linters()
+
+    def _naming_conventions(self):
+        naming_patterns = {}
+        for rule in self.args.naming:
+            kind, sep, pattern = rule.partition("=")
+            if not sep:
+                self.arg_parser.error(f"--naming expects KIND=REGEX, got '{rule}'")
+            naming_patterns.setdefault(kind, []).append(pattern)
+        try:
+            return NamingConventions.NamingConventions(naming_patterns)
+        except (ValueError, re.error) as e:
+            self.arg_parser.error(f"invalid --naming rule: {e}")
+
+    def _open_sink(self):
+        """The sink of the requested output format and where it writes, or (None, None)."""
+        for output_format, sink_class in FindingSink.SINKS.items():
+            output = getattr(self.args, output_format)
+            if output:
+                options = {"root": self.directory} if sink_class is FindingSink.SarifSink else {}
+                try:
+                    return sink_class.open(output, **options), output
+                except OSError as e:
+                    self.arg_parser.error(f"cannot write --{output_format} output: {e}")
+        return None, None
+
+    def _rollups(self):
+        if self.args.top is None:
+            return None
+        try:
+            return Rollups.Rollups(self.args.top, self.args.directory_depth)
+        except ValueError as e:
+            self.arg_parser.error(f"--top: {e}")
+
+    def _load_baseline(self):
+        if not self.args.baseline or self.args.write_baseline:
+            return None
+        try:
+            return Baseline.Baseline.load(self.args.baseline)
+        except (OSError, ValueError) as e:
+            self.arg_parser.error(f"cannot read --baseline: {e}")
+
+    def _open_store(self):
+        if not self.args.store:
+            return None
+        try:
+            store = ResultStore.ResultStore(self.args.store)
+        except (sqlite3.Error, ValueError) as e:
+            self.arg_parser.error(f"cannot open --store database: {e}")
+        store.begin_run(self.directory, analyzer.config_fingerprint(self.naming))
+        return store
+
+    def _batch_evaluator(self):
+        if not self.args.batch:
+            return None
+        if self.args.store or self.args.top is not None:
+            self.arg_parser.error("--batch cannot be combined with --store or --top")
+        try:
+            return batch.BatchEvaluator()
+        except ImportError as e:
+            self.arg_parser.error(str(e))
+
+    def _progress(self):
+        if not self.args.progress:
+            return None
+        # Walking the tree is cheap next to analysis, so count the files with
+        # a walk of their own to know the total, rather than holding the
+        # whole list in memory
+        if self.profiler:
+            self.profiler.restart()
+        total = sum(1 for _ in file_traversal.get_working_files(self.directory))
+        if self.profiler:
+            self.profiler.lap("count files")
+        return reporter.Progress(total)
+
+    def _linters(self):
+        if not self.args.linters:
+            return None
+        try:
+            return reporter.ExternalLinters(
+                [name.strip() for name in self.args.linters.split(",") if name.strip()],
+                jobs=self.args.linter_jobs,
+                cache_path=self.cache_dir / "linters.json" if self.cache_dir else None,
+                root=self.directory,
+            )
+        except ValueError as e:
+            self.arg_parser.error(f"--linters: {e}")
+
+    def report(self, file_results, project=False):
+        """
+        Add a batch of findings to the run, minus those in the baseline.
+        project is True for the findings of the end-of-run project checks.
+        """
+        if self.args.write_baseline:
+            self.fingerprints.extend(file_results.fingerprints())
+        if self.baseline is not None:
+            new_results = file_results.without(self.baseline)
+            self.suppressed += len(file_results) - len(new_results)
+            file_results = new_results
+        if self.rollups:
+            if project:
+                self.rollups.add_project_findings(file_results)
+            else:
+                self.rollups.add_findings(file_results)
+        self.results.merge(file_results)
+        if self.sink is not None:
+            self.sink.flush()
+
+    def analyze_file(self, file):
+        """Analyze one file, or reuse the analysis of an identical one, and report it."""
+        profiler = self.profiler
+        # Linters run in the background on batches of files
+        if self.linters:
+            self.linters.add(file)
+        path = relative_path(file, self.directory)
+        if profiler:
+            profiler.start_file(path)
 
-    # Step 3: Start iterating through each file
-    for file in working_files:
         # Step 4: Parse through the lines of each file
         try:
             with parser.Parser(file) as f:
-                # Step 5: Create an AST Node of each file
                 content = f.read()
-                dedented_code = textwrap.dedent(content)
-                test_tree = ast.parse(dedented_code)
-                node = ASTNode.ASTNode(test_tree)
-
-                # Step 6: Run the nodes through our analysis
-                code_analyzer = analyzer.CodeAnalyzer(node, file, results)
+                if profiler:
+                    profiler.lap("read")
 
-                # Step 7: Generate a report based on findings
-                code_analyzer.analyze()
+                # Identical files (vendored packages, generated __init__.py) are
+                # only parsed and analyzed once
+                data = content.encode()
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                original = self.analyzed_files.get(digest)
+                if original is not None:
+                    file_results = self._reuse(original, file, path)
+                    self.run_stats.add_file(len(data), reused=True)
+                else:
+                    file_results, original, nodes = self._analyze(file, path, content)
+                    self.analyzed_files[digest] = original
+                    self.run_stats.add_file(len(data), nodes)
+                self._record(path, digest, original, file_results)
 
         except FileNotFoundError:
             logging.exception(f"File not found: {file}")
+            self.run_stats.skip_file()
 
         except SyntaxError:
             logging.exception(f"{file} contains a Syntax error")
+            self.run_stats.skip_file()
 
         except UnicodeDecodeError:
             logging.exception(f"{file} contains encoding issues")
+            self.run_stats.skip_file()
 
-    # Step 8: Print results to user
-    print(results)
+        finally:
+            if profiler:
+                profiler.end_file()
+
+        if self.evaluator and self.evaluator.pending >= batch.EVALUATE_EVERY:
+            self.report(self.evaluator.evaluate())
+        if self.progress:
+            self.progress.advance()
+
+    def _reuse(self, original, file, path):
+        """The findings of a byte-identical copy of an analyzed file."""
+        file_results = reuse_analysis(original, file, path, self.import_graph, self.duplicate_index)
+        if self.evaluator:
+            self.evaluator.repeat_file(original.batch_row, path)
+        if self.profiler:
+            self.profiler.lap("reuse")
+        return file_results
+
+    def _analyze(self, file, path, content):
+        """
+        Parse and analyze a file. Returns its findings, what copies of it
+        reuse, and its number of AST nodes.
+        """
+        profiler = self.profiler
+        # Step 5: Create an AST Node of each file
+        dedented_code = textwrap.dedent(content)
+        if profiler:
+            profiler.lap("dedent")
+        test_tree = ast.parse(dedented_code)
+        if profiler:
+            profiler.lap("parse")
+        node = ASTNode.ASTNode(test_tree)
+        if profiler:
+            profiler.lap("build")
+
+        # Step 6: Run the nodes through our analysis
+        file_results = AnalysisResult.AnalysisResult()
+        code_analyzer = analyzer.CodeAnalyzer(
+            node,
+            file,
+            file_results,
+            import_graph=self.import_graph,
+            naming=self.naming,
+            duplicate_index=self.duplicate_index,
+            batch=self.evaluator,
+            profiler=profiler,
+            name=path,
+        )
+
+        # Step 7: Generate a report based on findings
+        code_analyzer.analyze()
+        metrics = ResultStore.FileMetrics.from_functions(
+            code_analyzer.function_metrics, len(content.splitlines())
+        )
+        analysis = FileAnalysis.from_analysis(file, file_results, code_analyzer, metrics)
+        return file_results, analysis, code_analyzer.node_count
+
+    def _record(self, path, digest, analysis, file_results):
+        """Count a file's metrics and report its findings."""
+        metrics = analysis.metrics
+        sizes = analysis.function_sizes
+        self.collector.add_file_metrics(metrics.functions, metrics.lines)
+        for i in range(0, len(sizes), 2):
+            self.collector.add_function_metrics(sizes[i], sizes[i + 1])
+        if self.store:
+            self.store.add_file(path, digest, metrics, file_results)
+        if self.rollups:
+            self.rollups.add_file(path, metrics)
+        self.report(file_results)
+        if self.profiler:
+            self.profiler.lap("record")
+
+    def finish(self):
+        """Run the project-wide checks and save what later runs reuse."""
+        if self.progress:
+            self.progress.close()
+        project_results = self._project_checks()
+        if self.store:
+            self.store.add_project_findings(project_results)
+            self.store.finish_run()
+            self.store.close()
+        if self.args.write_baseline:
+            try:
+                Baseline.Baseline.from_fingerprints(self.fingerprints).save(self.args.baseline)
+            except OSError as e:
+                self.arg_parser.error(f"cannot write --baseline: {e}")
+        if self.cache_dir:
+            try:
+                self.import_graph.save(self.cache_dir / "import_graph.json")
+                if self.linters:
+                    self.linters.save()
+            except OSError as e:
+                logging.warning(f"Could not save cache to {self.cache_dir}: {e}")
+
+    def _project_checks(self):
+        """
+        Report the findings that need every file to have been seen. Returns
+        the project findings (circular imports, duplicates and linters).
+        """
+        profiler = self.profiler
+        # Step 8: Run project-wide checks once every file has been seen
+        if profiler:
+            profiler.restart()
+        if self.evaluator:
+            self.report(self.evaluator.evaluate())
+            if profiler:
+                profiler.lap("batch evaluate")
+        self.import_graph.prune()
+        project_results = AnalysisResult.AnalysisResult()
+        self.import_graph.check_cycles(project_results)
+        self.duplicate_index.check_duplicates(project_results)
+        if profiler:
+            profiler.lap("project checks")
+        if self.linters:
+            self.linters.collect(project_results)
+            if profiler:
+                profiler.lap("wait for linters")
+        self.report(project_results, project=True)
+        return project_results
+
+    def print_summary(self):
+        """
+        Print the findings and statistics, and write the profiling outputs.
+        Returns the exit status with --baseline, None otherwise.
+        """
+        args = self.args
+        profiler = self.profiler
+        run_stats = self.run_stats
+        # Step 9: Print results to user. When findings are streamed to stdout the
+        # summary goes to stderr so the output stays machine-readable
+        import_graph = self.import_graph
+        run_stats.add_cache(
+            "import_graph", import_graph.hits, import_graph.hits + import_graph.misses
+        )
+        if self.linters:
+            run_stats.add_cache("linters", self.linters.reused, self.linters.lookups)
+        run_stats.finish()
+        summary_stream = sys.stdout
+        if self.sink is not None:
+            self.sink.run_stats = run_stats.to_dict()
+            self.sink.close()
+            if self.output == "-":
+                summary_stream = sys.stderr
+        print(self.results, file=summary_stream)
+        if self.rollups:
+            print(f"{self.rollups}\n", file=summary_stream)
+        if self.evaluator is not None:
+            print(f"{self.evaluator}\n", file=summary_stream)
+        print(f"{self.collector}\n", file=summary_stream)
+        print(f"\n{run_stats}", file=summary_stream)
+        if args.profile is not None:
+            print(f"\n{profiler}", file=summary_stream)
+        if args.memory_report:
+            print(f"\n{profiler.memory_report()}", file=summary_stream)
+            profiler.stop()
+        if args.trace:
+            try:
+                profiler.write_trace(args.trace)
+            except OSError as e:
+                logging.warning(f"Could not write --trace output: {e}")
+        if self.baseline is not None:
+            print(f"Baseline: {self.suppressed} known findings not reported", file=summary_stream)
+            return 1 if self.results else 0
+        return None
+
+
+def main():
+    if sys.argv[1:2] == ["query"]:
+        return query(sys.argv[2:])
+
+    # Step 1: Parse CLI arguments for directory
+    arg_parser = build_parser()
+    args = arg_parser.parse_args()
+
+    # Configure logging based on flag
+    log_level = logging.INFO if args.show_logs else logging.WARNING
+    logging.basicConfig(level=log_level)
+
+    cprofile = None
+    if args.cprofile:
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    run = AnalysisRun(args, arg_parser)
+    # Step 3: Start iterating through each file
+    for file in run.working_files:
+        run.analyze_file(file)
+    run.finish()
+    status = run.print_summary()
+
+    if cprofile:
+        cprofile.disable()
+        try:
+            cprofile.dump_stats(args.cprofile)
+        except OSError as e:
+            logging.warning(f"Could not write --cprofile output: {e}")
+    return status
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
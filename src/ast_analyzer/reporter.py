@@ -5,30 +5,753 @@ Take the analysis of the project and generate a user friendly report to be displ
 on how to improve said project
 """
 
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import pathlib
+import re
+import shutil
+import subprocess
+import sys
+import time
+from array import array
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from ast_analyzer.classes.AnalysisResult import AnalysisResult, FindingCode, Severity
+
+# Values below this get a histogram bucket each; larger values share
+# logarithmic buckets, SUBBUCKETS per doubling (about 4% wide)
+EXACT_LIMIT = 64
+SUBBUCKETS = 16
+# Enough buckets for values up to 2**40
+NUM_BUCKETS = EXACT_LIMIT + (40 - EXACT_LIMIT.bit_length() + 1) * SUBBUCKETS
+
 
 def reporter():
     return "reporter"
 
 
+def bucket_of(value: int) -> int:
+    """Histogram bucket of a non-negative integer value."""
+    if value < EXACT_LIMIT:
+        return max(value, 0)
+    bucket = EXACT_LIMIT + int(math.log2(value / EXACT_LIMIT) * SUBBUCKETS)
+    return min(bucket, NUM_BUCKETS - 1)
+
+
+def bucket_value(bucket: int) -> int:
+    """Representative value of a bucket: its value, or its rounded geometric midpoint."""
+    if bucket < EXACT_LIMIT:
+        return bucket
+    return round(EXACT_LIMIT * 2 ** ((bucket - EXACT_LIMIT + 0.5) / SUBBUCKETS))
+
+
+class StreamingStats:
+    """
+    Count, mean, variance, min, max and approximate percentiles of a stream
+    of non-negative integers, in constant memory.
+
+    Mean and variance are updated with Welford's algorithm. Percentiles come
+    from a fixed histogram: exact for values below EXACT_LIMIT, within about
+    4% above it. Two instances can be merged (Chan et al.'s parallel update
+    for the moments, bucket-wise sums for the histogram), so workers can
+    each keep their own and combine them at the end.
+
+    Example:
+        >>> stats = StreamingStats()
+        >>> for value in (3, 5, 10):
+        ...     stats.add(value)
+        >>> stats.mean, stats.max, stats.percentile(50)
+        (6.0, 10, 5)
+    """
+
+    __slots__ = ("count", "mean", "_m2", "min", "max", "_buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: int | None = None
+        self.max: int | None = None
+        self._buckets = array("Q", bytes(8 * NUM_BUCKETS))
+
+    def __repr__(self) -> str:
+        return f"StreamingStats(count={self.count}, mean={self.mean:.2f}, max={self.max})"
+
+    def add(self, value: int) -> None:
+        """Add one value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self._buckets[bucket_of(value)] += 1
+
+    def merge(self, other: StreamingStats) -> None:
+        """Fold the values seen by other into this instance."""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            self._buckets = array("Q", other._buckets)
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for i, bucket_count in enumerate(other._buckets):
+            if bucket_count:
+                self._buckets[i] += bucket_count
+
+    @property
+    def variance(self) -> float:
+        """Population variance (0.0 with fewer than two values)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def percentile(self, p: float) -> int:
+        """
+        Approximate p-th percentile (0-100), never outside [min, max].
+        Returns 0 when no values were added.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for bucket, bucket_count in enumerate(self._buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(max(bucket_value(bucket), self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, int | float]:
+        """Every statistic as a dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "stdev": self.stdev,
+            "min": self.min or 0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max or 0,
+        }
+
+
 class MetricsCollector:
     """
-    Use built-in functionality of black, ruff, and mypy to generate additional
-    reports based on standard practices
+    Streaming statistics over the analyzed code, fed once per file and once
+    per function.
+
+    Besides the running totals, it keeps a StreamingStats for lines and
+    functions per file and for complexity and length per function, so memory
+    stays constant however large the repository is. Collectors filled by
+    separate workers can be combined with merge().
+
+    Example:
+        >>> collector = MetricsCollector()
+        >>> collector.add_file_metrics(fn_count=2, ln_count=40)
+        >>> collector.add_function_metrics(complexity=3, num_lines=12)
+        >>> collector.get_summary()["lines_per_file"]["mean"]
+        40.0
     """
 
     def __init__(self):
         self.total_fns = 0
         self.total_lines = 0
         self.files_analyzed = 0
+        self.stats = {
+            "lines_per_file": StreamingStats(),
+            "functions_per_file": StreamingStats(),
+            "complexity": StreamingStats(),
+            "function_lines": StreamingStats(),
+        }
 
     def add_file_metrics(self, fn_count, ln_count):
         self.total_fns += fn_count
         self.total_lines += ln_count
         self.files_analyzed += 1
+        self.stats["functions_per_file"].add(fn_count)
+        self.stats["lines_per_file"].add(ln_count)
+
+    def add_function_metrics(self, complexity, num_lines):
+        self.stats["complexity"].add(complexity)
+        self.stats["function_lines"].add(num_lines)
+
+    def merge(self, other: MetricsCollector) -> None:
+        """Fold the files and functions counted by other into this collector."""
+        self.total_fns += other.total_fns
+        self.total_lines += other.total_lines
+        self.files_analyzed += other.files_analyzed
+        for name, stats in self.stats.items():
+            stats.merge(other.stats[name])
 
     def get_summary(self):
+        avg_fns_per_file = self.total_fns / self.files_analyzed if self.files_analyzed else 0.0
         return {
             "files": self.files_analyzed,
             "functions": self.total_fns,
-            "avg_fns_per_file": self.total_fns / self.files_analyzed,
+            "avg_fns_per_file": avg_fns_per_file,
+            **{name: stats.summary() for name, stats in self.stats.items()},
+        }
+
+    def __str__(self):
+        headers = ("metric", "count", "mean", "stdev", "min", "p50", "p90", "p99", "max")
+        rows = [headers]
+        for name, stats in self.stats.items():
+            summary = stats.summary()
+            rows.append(
+                (
+                    name,
+                    str(summary["count"]),
+                    *(f"{summary[key]:.1f}" for key in ("mean", "stdev")),
+                    *(str(summary[key]) for key in ("min", "p50", "p90", "p99", "max")),
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(headers))]
+        lines = [
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths, strict=True))
+            )
+            for row in rows
+        ]
+        return "Code metrics:\n" + "\n".join(lines)
+
+
+class RunStats:
+    """
+    Throughput of a run: files, bytes and AST nodes per second, reused and
+    skipped files, the hits of each cache, and wall versus CPU time.
+
+    Counting is a few integer additions per file; rates are only computed
+    when the run is finished. Byte-identical files are counted as hits of
+    the "identical_files" cache; other caches are added with add_cache().
+
+    Example:
+        >>> stats = RunStats()
+        >>> stats.add_file(2048, nodes=310)
+        >>> stats.add_file(2048, reused=True)
+        >>> stats.add_cache("import_graph", hits=1, lookups=2)
+        >>> stats.finish()
+        >>> stats.to_dict()["caches"]["identical_files"]
+        {'hits': 1, 'lookups': 2, 'hit_ratio': 0.5}
+    """
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.bytes = 0
+        self.nodes = 0
+        self.reused_files = 0
+        self.skipped_files = 0
+        # Cache name -> (hits, lookups)
+        self.caches: dict[str, tuple[int, int]] = {}
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self.wall_seconds: float | None = None
+        self.cpu_seconds: float | None = None
+
+    def __repr__(self) -> str:
+        return f"RunStats(files={self.files}, bytes={self.bytes}, nodes={self.nodes})"
+
+    def add_file(self, size: int, nodes: int = 0, reused: bool = False) -> None:
+        """Count a file of size bytes whose tree had nodes AST nodes."""
+        self.files += 1
+        self.bytes += size
+        self.nodes += nodes
+        if reused:
+            self.reused_files += 1
+
+    def skip_file(self) -> None:
+        """Count a file that could not be read or parsed."""
+        self.skipped_files += 1
+
+    def add_cache(self, name: str, hits: int, lookups: int) -> None:
+        """Record how many of a cache's lookups during the run were hits."""
+        self.caches[name] = (hits, lookups)
+
+    def finish(self) -> None:
+        """Stop the clocks."""
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.process_time() - self._cpu_start
+
+    def _rate(self, count: int) -> float:
+        if self.wall_seconds is None:
+            self.finish()
+        return round(count / self.wall_seconds, 1) if self.wall_seconds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Every statistic as plain data, e.g. for machine-readable output."""
+        rates = {
+            "files_per_second": self._rate(self.files),
+            "bytes_per_second": self._rate(self.bytes),
+            "nodes_per_second": self._rate(self.nodes),
         }
+        caches = {"identical_files": (self.reused_files, self.files), **self.caches}
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "nodes": self.nodes,
+            "reused_files": self.reused_files,
+            "skipped_files": self.skipped_files,
+            "caches": {
+                name: {
+                    "hits": hits,
+                    "lookups": lookups,
+                    "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+                }
+                for name, (hits, lookups) in caches.items()
+            },
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            **rates,
+        }
+
+    def __str__(self) -> str:
+        stats = self.to_dict()
+        caches = ", ".join(
+            f"{name.replace('_', ' ')} {cache['hits']}/{cache['lookups']} "
+            f"({100 * cache['hit_ratio']:.1f}%)"
+            for name, cache in stats["caches"].items()
+        )
+        return (
+            "Throughput:\n"
+            f"  {stats['files']} files ({stats['reused_files']} reused, "
+            f"{stats['skipped_files']} skipped), {stats['bytes']} bytes, "
+            f"{stats['nodes']} AST nodes\n"
+            f"  {stats['files_per_second']} files/s, {stats['bytes_per_second']} bytes/s, "
+            f"{stats['nodes_per_second']} nodes/s\n"
+            f"  Cache hits: {caches}\n"
+            f"  Wall time: {stats['wall_seconds']:.2f}s, CPU time: {stats['cpu_seconds']:.2f}s"
+        )
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as e.g. 45s, 3m07s or 1h02m."""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+class Progress:
+    """
+    Files done out of a known total, throughput and ETA, written to a stream
+    (stderr by default) while a run is going.
+
+    advance() only compares the clock with the time of the next update, so
+    it can be called for every file; the line is rewritten at most every
+    interval seconds (0.25s on a terminal, where the line is redrawn in
+    place, and 5s otherwise, e.g. in CI logs). The ETA assumes the remaining
+    files go at the average rate so far.
+
+    Args:
+        total: Number of files the run will go through
+        stream: Where progress is written
+        interval: Seconds between updates
+
+    Example:
+        >>> progress = Progress(len(files))
+        >>> for path in files:
+        ...     analyze(path)
+        ...     progress.advance()
+        >>> progress.close()
+    """
+
+    def __init__(self, total: int, stream=None, interval: float | None = None) -> None:
+        self.total = total
+        self.done = 0
+        self.stream = stream if stream is not None else sys.stderr
+        self.interactive = self.stream.isatty()
+        if interval is None:
+            interval = 0.25 if self.interactive else 5.0
+        self.interval = interval
+        self._started = time.monotonic()
+        self._next_update = self._started + interval
+        self._written = False
+
+    def __repr__(self) -> str:
+        return f"Progress(done={self.done}, total={self.total})"
+
+    def advance(self, count: int = 1) -> None:
+        """Count files as done, writing an update if one is due."""
+        self.done += count
+        now = time.monotonic()
+        if now >= self._next_update:
+            self._next_update = now + self.interval
+            self._write(self.line(now))
+
+    def line(self, now: float | None = None) -> str:
+        """The current progress as one line."""
+        elapsed = (now if now is not None else time.monotonic()) - self._started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        percent = 100 * self.done / self.total if self.total else 100.0
+        width = len(str(self.total))
+        text = f"[{self.done:>{width}}/{self.total} {percent:3.0f}%] {rate:.1f} files/s"
+        if rate and self.done < self.total:
+            text += f", ETA {format_duration((self.total - self.done) / rate)}"
+        return text
+
+    def _write(self, text: str) -> None:
+        if self.interactive:
+            self.stream.write(f"\r\x1b[K{text}")
+        else:
+            self.stream.write(f"{text}\n")
+        self.stream.flush()
+        self._written = True
+
+    def close(self) -> None:
+        """Clear the progress line so the report starts on a clean line."""
+        if self.interactive and self._written:
+            self.stream.write("\r\x1b[K")
+            self.stream.flush()
+
+
+# Files passed to one linter process
+LINTER_BATCH_SIZE = 100
+LINTER_CACHE_VERSION = 2
+
+MYPY_LINE = re.compile(
+    r"^(?P<path>.+?):(?P<line>\d+):(?:\d+:)?(?:(?P<end_line>\d+):\d+:)? "
+    r"(?P<level>error|warning): (?P<message>.*?)(?:  \[(?P<code>[\w-]+)\])?$"
+)
+
+
+class Linter(NamedTuple):
+    """How to run one external linter and read its output."""
+
+    # Command line; the files to check (for whole-set tools, the top-level
+    # entries of the analyzed directory that hold them) are appended
+    command: list[str]
+    parse: Callable[[str, str], list[LinterFinding]]
+    # Exit statuses of a run that completed (others mean the tool crashed)
+    ok_returncodes: frozenset[int]
+    # Whether a file's findings depend on that file alone. mypy's do not:
+    # they change with the modules a file imports
+    per_file: bool
+
+
+class LinterFinding(NamedTuple):
+    """One problem reported by an external linter."""
+
+    path: str
+    severity: int
+    line: int
+    end_line: int
+    message: str
+
+
+def parse_ruff(stdout: str, stderr: str) -> list[LinterFinding]:
+    """Parse `ruff check --output-format=json` output."""
+    findings = []
+    for item in json.loads(stdout or "[]"):
+        line = item["location"]["row"] if item.get("location") else 0
+        end_line = item["end_location"]["row"] if item.get("end_location") else line
+        code = item.get("code") or "syntax-error"
+        findings.append(
+            LinterFinding(
+                item["filename"],
+                Severity.WARNING,
+                line,
+                end_line,
+                f"ruff {code}: {item['message']}",
+            )
+        )
+    return findings
+
+
+def parse_black(stdout: str, stderr: str) -> list[LinterFinding]:
+    """Parse the `would reformat <path>` lines of `black --check`."""
+    prefix = "would reformat "
+    return [
+        LinterFinding(line[len(prefix) :], Severity.WARNING, 0, 0, "black: would reformat file")
+        for line in stderr.splitlines()
+        if line.startswith(prefix)
+    ]
+
+
+def parse_mypy(stdout: str, stderr: str) -> list[LinterFinding]:
+    """Parse mypy's `path:line: error: message  [code]` lines."""
+    findings = []
+    for line in stdout.splitlines():
+        match = MYPY_LINE.match(line)
+        if match is None:
+            continue
+        start = int(match["line"])
+        code = f" [{match['code']}]" if match["code"] else ""
+        findings.append(
+            LinterFinding(
+                match["path"],
+                Severity.ERROR if match["level"] == "error" else Severity.WARNING,
+                start,
+                int(match["end_line"] or start),
+                f"mypy: {match['message']}{code}",
+            )
+        )
+    return findings
+
+
+# Supported tools
+LINTERS = {
+    "black": Linter(["black", "--check"], parse_black, frozenset({0, 1}), per_file=True),
+    "ruff": Linter(
+        ["ruff", "check", "--output-format=json", "--exit-zero"],
+        parse_ruff,
+        frozenset({0}),
+        per_file=True,
+    ),
+    "mypy": Linter(
+        ["mypy", "--no-error-summary", "--no-pretty", "--show-error-end", "--no-color-output"],
+        parse_mypy,
+        frozenset({0, 1}),
+        per_file=False,
+    ),
+}
+
+
+class ExternalLinters:
+    """
+    Runs black, ruff and mypy over the files found by the analysis, and turns
+    what they report into AnalysisResult findings.
+
+    Files are handed over one at a time with add() while the AST analysis
+    runs. For tools whose findings depend on one file at a time (black,
+    ruff), files are grouped into batches of LINTER_BATCH_SIZE and each batch
+    is started as one subprocess on a thread pool as soon as it is full, so
+    the linters work in parallel with each other and with the analysis, and
+    the project is only walked once. mypy checks files against the modules
+    they import, so it runs once over the whole file set when collect() is
+    called; that also keeps a single process on its .mypy_cache. It runs in
+    root, so the project's own mypy config applies, and is given the
+    top-level entries of root that hold the files rather than every path, so
+    the command line stays short on large projects.
+
+    With a cache, a file whose size and modification time match the last run
+    is not passed to a per-file tool again, and mypy is not run again if no
+    file in the set changed; previous findings are reused. Results are only
+    cached for runs that completed: a batch whose tool could not be started,
+    crashed (an unexpected exit status) or printed unreadable output is
+    reported with a warning and checked again next time. Tools that are not
+    installed are skipped with a warning.
+
+    Args:
+        tools: Names from LINTERS to run
+        jobs: Maximum number of linter processes at once
+        cache_path: JSON file that findings are reused from and saved to
+        root: Directory findings are attributed relative to (basenames if None)
+
+    Example:
+        >>> linters = ExternalLinters(["ruff", "mypy"], cache_path=".ast_analyzer_cache/linters.json")
+        >>> for path in files:
+        ...     linters.add(path)
+        >>> results.merge(linters.collect())
+        >>> linters.save()
+    """
+
+    def __init__(self, tools, jobs=None, cache_path=None, root=None):
+        unknown = [tool for tool in tools if tool not in LINTERS]
+        if unknown:
+            raise ValueError(f"Unknown linter '{unknown[0]}'. Use one of: {', '.join(LINTERS)}")
+        self.tools = []
+        for tool in tools:
+            if shutil.which(LINTERS[tool].command[0]) is None:
+                logging.warning(f"{tool} is not installed; skipping it")
+            else:
+                self.tools.append(tool)
+        self.cache_path = pathlib.Path(cache_path) if cache_path else None
+        self.root = pathlib.Path(root).resolve() if root is not None else None
+        # Last run's entries: {tool: {"digest": ..., "files": {path: entry}}}
+        self.cache = self._load_cache()
+        # Per tool and file: how many results were looked up, and reused
+        self.lookups = 0
+        self.reused = 0
+        # This run's entries, only for files whose check completed
+        self._files = {tool: {} for tool in self.tools}
+        self._digests = {}
+        self._stamps = {}
+        self._pending = {tool: [] for tool in self.tools}
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1)
+
+    def _load_cache(self):
+        """The last run's entries per tool, empty if there is no usable cache."""
+        empty = {tool: {"digest": None, "files": {}} for tool in self.tools}
+        if self.cache_path is None:
+            return empty
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except FileNotFoundError:
+            return empty
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable linter cache {self.cache_path}: {e}")
+            return empty
+        if data.get("version") != LINTER_CACHE_VERSION:
+            return empty
+        tools = data.get("tools", {})
+        return {tool: tools.get(tool, empty[tool]) for tool in self.tools}
+
+    def save(self):
+        """Write the entries of this run to the cache file."""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tools = {
+            tool: {"digest": self._digests.get(tool), "files": self._files[tool]}
+            for tool in self.tools
+        }
+        data = {"version": LINTER_CACHE_VERSION, "tools": tools}
+        self.cache_path.write_text(json.dumps(data, separators=(",", ":")))
+
+    @staticmethod
+    def _stamp(path):
+        stat = path.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def add(self, path):
+        """Queue a file, starting a batch for each tool that has a full one."""
+        path = pathlib.Path(path).resolve()
+        key = str(path)
+        try:
+            stamp = self._stamp(path)
+        except OSError:
+            return
+        self._stamps[key] = stamp
+        for tool in self.tools:
+            if not LINTERS[tool].per_file:
+                continue
+            self.lookups += 1
+            entry = self.cache[tool]["files"].get(key)
+            if entry is not None and entry["stamp"] == stamp:
+                self._files[tool][key] = entry
+                self.reused += 1
+                continue
+            pending = self._pending[tool]
+            pending.append(key)
+            if len(pending) >= LINTER_BATCH_SIZE:
+                self._start(tool, pending)
+                self._pending[tool] = []
+
+    def _start(self, tool, paths, targets=None, cwd=None):
+        self._futures.append(self._executor.submit(self._run, tool, paths, targets, cwd))
+
+    @staticmethod
+    def _run(tool, paths, targets=None, cwd=None):
+        """
+        Run tool in cwd over targets (the files themselves if None). Returns
+        the tool, the files and what it reported, or None instead of the
+        findings if the run failed.
+        """
+        linter = LINTERS[tool]
+        try:
+            process = subprocess.run(
+                [*linter.command, *(targets or paths)], capture_output=True, text=True, cwd=cwd
+            )
+            if process.returncode not in linter.ok_returncodes:
+                output = (process.stderr or process.stdout).strip().splitlines()
+                raise ValueError(
+                    f"exit status {process.returncode}" + (f": {output[-1]}" if output else "")
+                )
+            findings = linter.parse(process.stdout, process.stderr)
+        except (OSError, ValueError) as e:
+            logging.warning(f"{tool} failed on a batch of {len(paths)} files: {e}")
+            return tool, paths, None
+        if cwd is not None:
+            findings = [f._replace(path=os.path.join(cwd, f.path)) for f in findings]
+        return tool, paths, findings
+
+    def _whole_set_targets(self):
+        """
+        The directory whole-set tools run in, and the top-level entries of it
+        that hold the added files. Without a root, that is the deepest
+        directory holding every file.
+        """
+        paths = [pathlib.Path(key) for key in self._stamps]
+        base = self.root or pathlib.Path(os.path.commonpath([path.parent for path in paths]))
+        targets = {
+            path.relative_to(base).parts[0] if path.is_relative_to(base) else str(path)
+            for path in paths
+        }
+        return str(base), sorted(targets)
+
+    def _digest(self):
+        """Hash of every added file and its stamp, for tools that check the whole set."""
+        data = json.dumps(sorted(self._stamps.items()), separators=(",", ":"))
+        return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+    def _name(self, key):
+        """Name the findings about the file at key are attributed to."""
+        path = pathlib.PurePath(key)
+        if self.root is not None and path.is_relative_to(self.root):
+            return path.relative_to(self.root).as_posix()
+        return path.name
+
+    def collect(self, results=None):
+        """
+        Run the whole-set tools, wait for every batch and return the findings
+        of all files added, as an AnalysisResult (results, if given). Files
+        that were not added in this run are dropped from the cache.
+        """
+        for tool, pending in self._pending.items():
+            if pending:
+                self._start(tool, pending)
+        self._pending = {tool: [] for tool in self.tools}
+
+        digest = self._digest()
+        cwd, targets = self._whole_set_targets() if self._stamps else (None, None)
+        for tool in self.tools:
+            if LINTERS[tool].per_file or not self._stamps:
+                continue
+            cached = self.cache[tool]
+            self.lookups += len(self._stamps)
+            if cached["digest"] == digest:
+                self._files[tool] = cached["files"]
+                self._digests[tool] = digest
+                self.reused += len(self._stamps)
+            else:
+                self._start(tool, sorted(self._stamps), targets, cwd)
+
+        for future in self._futures:
+            tool, paths, findings = future.result()
+            if findings is None:
+                continue
+            entries = self._files[tool]
+            for key in paths:
+                entries[key] = {"stamp": self._stamps[key], "findings": []}
+            for finding in findings:
+                entry = entries.get(str(pathlib.Path(finding.path).resolve()))
+                if entry is not None:
+                    entry["findings"].append(list(finding[1:]))
+            if not LINTERS[tool].per_file:
+                self._digests[tool] = digest
+        self._futures = []
+        self._executor.shutdown()
+
+        results = results if results is not None else AnalysisResult()
+        for tool in self.tools:
+            for key, entry in self._files[tool].items():
+                filename = self._name(key)
+                for severity, line, end_line, message in entry["findings"]:
+                    results.append_finding(
+                        FindingCode.LINTER, severity, filename, 0, message, line, end_line
+                    )
+        return results
@@ -4,8 +4,10 @@ tests.classes.test_analysisresult
 Test suite for the AnalysisResult container class.
 """
 
+from collections.abc import Sequence
+
 import pytest
-from ast_analyzer.classes.AnalysisResult import AnalysisResult
+from ast_analyzer.classes.AnalysisResult import MESSAGES, AnalysisResult, FindingCode, Severity
 
 
 # =============================================================================
@@ -170,12 +172,12 @@ class TestAnalysisResultGetitem:
     """Tests for AnalysisResult.__getitem__"""
 
     def test_getitem_warnings_returns_list(self, populated_analysis_result):
-        """Accessing 'warnings' returns a list."""
-        assert isinstance(populated_analysis_result["warnings"], list)
+        """Accessing 'warnings' returns a list-like view."""
+        assert isinstance(populated_analysis_result["warnings"], Sequence)
 
     def test_getitem_errors_returns_list(self, populated_analysis_result):
-        """Accessing 'errors' returns a list."""
-        assert isinstance(populated_analysis_result["errors"], list)
+        """Accessing 'errors' returns a list-like view."""
+        assert isinstance(populated_analysis_result["errors"], Sequence)
 
     def test_getitem_warnings_count(self, populated_analysis_result):
         """Accessing 'warnings' returns correct count."""
@@ -331,6 +333,124 @@ class TestAnalysisResultAdd:
             _ = empty_analysis_result + []
 
 
+# =============================================================================
+# merge / __iadd__ / merge_all Tests
+# =============================================================================
+@pytest.mark.analysis_result
+class TestAnalysisResultMerge:
+    """Tests for in-place and k-way merging"""
+
+    def test_merge_appends_in_order(self, populated_analysis_result):
+        """merge() appends the other result's findings after its own."""
+        result = AnalysisResult()
+        result.append_error("Existing", "file0.py")
+        result.merge(populated_analysis_result)
+        assert len(result) == 4
+        assert [f["file"] for f in result["errors"]] == ["file0.py", "file2.py"]
+        assert [f["file"] for f in result["warnings"]] == ["file1.py", "file3.py"]
+
+    def test_merge_remaps_interned_tables(self):
+        """Files and details already known are reused, not duplicated."""
+        first, second = AnalysisResult(), AnalysisResult()
+        first.append_finding(FindingCode.COMPLEXITY, Severity.WARNING, "a.py", 11, "f")
+        second.append_finding(FindingCode.COMPLEXITY, Severity.ERROR, "b.py", 16, "g")
+        second.append_finding(FindingCode.COMPLEXITY, Severity.WARNING, "a.py", 12, "f")
+        first.merge(second)
+        assert first._file_table == ["a.py", "b.py"]
+        assert first._detail_table == ["", "f", "g"]
+        assert [f["message"] for f in first] == [
+            "Moderate complexity score (11) in f",
+            "Moderate complexity score (12) in f",
+            "High complexity score (16) in g",
+        ]
+
+    def test_merge_empty_with_filename(self):
+        """Merging no findings under a filename does not count that file."""
+        result = AnalysisResult()
+        result.merge(AnalysisResult(), filename="clean.py")
+        assert result._file_table == []
+        assert result.results["files"] == set()
+
+    def test_iadd_is_in_place(self, empty_analysis_result, populated_analysis_result):
+        """+= merges into the left operand and returns it."""
+        result = empty_analysis_result
+        result += populated_analysis_result
+        assert result is empty_analysis_result
+        assert len(result) == 3
+        assert len(populated_analysis_result) == 3
+
+    def test_iadd_with_itself(self, populated_analysis_result):
+        """Merging a result into itself doubles its findings."""
+        result = populated_analysis_result
+        result += result
+        assert len(result) == 6
+        assert len(result["errors"]) == 2
+
+    def test_iadd_invalid_type_raises_typeerror(self, empty_analysis_result):
+        """+= with a non-AnalysisResult raises TypeError."""
+        with pytest.raises(TypeError):
+            empty_analysis_result += "string"
+
+    def test_merge_all(self):
+        """merge_all() reduces many results into one, in order."""
+        parts = []
+        for i in range(5):
+            part = AnalysisResult()
+            part.append_warning(f"warning {i}", f"file{i}.py")
+            parts.append(part)
+        merged = AnalysisResult.merge_all(parts)
+        assert len(merged) == 5
+        assert [f["message"] for f in merged] == [f"warning {i}" for i in range(5)]
+        assert merged.results["files"] == {f"file{i}.py" for i in range(5)}
+
+    def test_merge_all_empty(self):
+        """merge_all() of nothing is an empty result."""
+        assert len(AnalysisResult.merge_all([])) == 0
+
+
+# =============================================================================
+# Fingerprint Tests
+# =============================================================================
+def complexity_result(value, qualname="f", filename="a.py", start_line=1):
+    result = AnalysisResult()
+    result.append_finding(
+        FindingCode.COMPLEXITY, Severity.WARNING, filename, value, qualname, start_line
+    )
+    return result
+
+
+@pytest.mark.analysis_result
+class TestAnalysisResultFingerprints:
+    """Tests for finding fingerprints and baseline filtering"""
+
+    def test_stable_across_line_shifts(self):
+        """Moving a function does not change its findings' fingerprints."""
+        assert (
+            complexity_result(12, start_line=3).fingerprints()
+            == complexity_result(12, start_line=40).fingerprints()
+        )
+
+    def test_same_bucket(self):
+        """Small changes in the metric keep the fingerprint."""
+        assert complexity_result(12).fingerprints() == complexity_result(14).fingerprints()
+
+    def test_different_bucket(self):
+        assert complexity_result(12).fingerprints() != complexity_result(17).fingerprints()
+
+    def test_identity_parts(self):
+        base = complexity_result(12).fingerprints()
+        assert complexity_result(12, qualname="g").fingerprints() != base
+        assert complexity_result(12, filename="b.py").fingerprints() != base
+
+    def test_without(self, populated_analysis_result):
+        """without() keeps only findings whose fingerprint is unknown."""
+        known = set(populated_analysis_result.fingerprints()[:1])
+        remaining = populated_analysis_result.without(known)
+        assert len(remaining) == 2
+        assert remaining.results["files"] == {"file2.py", "file3.py"}
+        assert remaining["errors"][0]["message"] == "Function too long"
+
+
 # =============================================================================
 # append_warning Tests
 # =============================================================================
@@ -461,3 +581,79 @@ class TestAnalysisResultIntegration:
         assert len(combined["warnings"]) == 2
         assert len(combined["errors"]) == 2
         assert len(combined.results["files"]) == 3
+
+
+# =============================================================================
+# Columnar Storage Tests
+# =============================================================================
+@pytest.mark.analysis_result
+class TestAnalysisResultColumnar:
+    """Tests for coded findings and the columnar storage behind them"""
+
+    def test_append_finding_formats_message_on_access(self, empty_analysis_result):
+        """Coded findings render their template with value and detail."""
+        empty_analysis_result.append_finding(
+            FindingCode.COMPLEXITY,
+            Severity.ERROR,
+            "a.py",
+            value=17,
+            detail="Parser.run",
+            start_line=3,
+            end_line=30,
+        )
+        finding = empty_analysis_result["errors"][0]
+        assert finding == {
+            "file": "a.py",
+            "message": "High complexity score (17) in Parser.run",
+            "rule": "complexity",
+            "severity": "error",
+            "value": 17,
+            "start_line": 3,
+            "end_line": 30,
+        }
+
+    def test_end_line_defaults_to_start_line(self, empty_analysis_result):
+        empty_analysis_result.append_finding(
+            FindingCode.DUPLICATE_CODE, Severity.WARNING, "a.py", 2, "function f", start_line=7
+        )
+        finding = empty_analysis_result["warnings"][0]
+        assert (finding["start_line"], finding["end_line"]) == (7, 7)
+
+    def test_every_code_has_templates(self):
+        """Every non-custom code has a message for both severities."""
+        for code in FindingCode:
+            if code is not FindingCode.CUSTOM:
+                for severity in Severity:
+                    assert (code, severity) in MESSAGES
+
+    def test_files_and_details_are_interned(self, empty_analysis_result):
+        """Repeated file names and details are stored once."""
+        for _ in range(100):
+            empty_analysis_result.append_finding(
+                FindingCode.NESTING_DEPTH, Severity.WARNING, "same.py", 5, "f"
+            )
+        assert len(empty_analysis_result) == 100
+        assert empty_analysis_result._file_table == ["same.py"]
+        assert empty_analysis_result._detail_table == ["", "f"]
+
+    def test_counts_by_file(self, populated_analysis_result):
+        populated_analysis_result.append_error("Too deep", "file1.py")
+        assert populated_analysis_result.counts_by_file() == {
+            "file1.py": [1, 1],
+            "file2.py": [0, 1],
+            "file3.py": [1, 0],
+        }
+
+    def test_views_support_slicing_and_equality(self, populated_analysis_result):
+        warnings = populated_analysis_result["warnings"]
+        assert warnings[-1]["file"] == "file3.py"
+        assert [f["file"] for f in warnings[:1]] == ["file1.py"]
+        assert warnings == list(warnings)
+
+    def test_merge_with_filename(self, populated_analysis_result):
+        """merge() can attribute copied findings to another file."""
+        result = AnalysisResult()
+        result.merge(populated_analysis_result, filename="copy.py")
+        assert len(result) == 3
+        assert result.results["files"] == {"copy.py"}
+        assert [f["message"] for f in result] == [f["message"] for f in populated_analysis_result]
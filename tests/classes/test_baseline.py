@@ -0,0 +1,51 @@
+"""
+tests.classes.test_baseline
+
+Test suite for the Baseline of accepted findings.
+"""
+
+from array import array
+
+import pytest
+
+from ast_analyzer.classes.Baseline import MAGIC, Baseline
+
+
+class TestBaseline:
+    """Tests for Baseline"""
+
+    def test_from_fingerprints_sorts_and_dedupes(self):
+        baseline = Baseline.from_fingerprints([5, 1, 5, 3])
+        assert list(baseline.fingerprints) == [1, 3, 5]
+        assert len(baseline) == 3
+
+    def test_contains(self):
+        baseline = Baseline.from_fingerprints([10, 2**64 - 1, 7])
+        assert 7 in baseline
+        assert 2**64 - 1 in baseline
+        assert 8 not in baseline
+        assert 11 not in baseline
+        assert 0 not in Baseline()
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "baseline.bin"
+        Baseline.from_fingerprints([3, 1, 2**63]).save(path)
+        assert path.read_bytes().startswith(MAGIC)
+        assert path.stat().st_size == len(MAGIC) + 3 * 8
+        assert Baseline.load(path).fingerprints == array("Q", [1, 3, 2**63])
+
+    def test_load_rejects_other_files(self, tmp_path):
+        path = tmp_path / "baseline.bin"
+        path.write_bytes(b"not a baseline")
+        with pytest.raises(ValueError):
+            Baseline.load(path)
+
+    def test_load_older_version(self, tmp_path):
+        path = tmp_path / "old.bin"
+        path.write_bytes(b"ASTBASE1" + bytes(8))
+        with pytest.raises(ValueError, match="older version"):
+            Baseline.load(path)
+
+    def test_load_missing(self, tmp_path):
+        with pytest.raises(OSError):
+            Baseline.load(tmp_path / "missing.bin")
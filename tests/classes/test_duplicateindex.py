@@ -0,0 +1,83 @@
+"""
+tests.classes.test_duplicateindex
+
+Test suite for the project-wide DuplicateIndex.
+"""
+
+import ast
+
+from ast_analyzer.analyzer import CodeAnalyzer
+from ast_analyzer.ASTNode import ASTNode
+from ast_analyzer.classes.AnalysisResult import AnalysisResult
+from ast_analyzer.classes.DuplicateIndex import DuplicateIndex
+
+HELPER = """
+def {name}(items, limit):
+    found = []
+    for item in items:
+        if item.size > limit:
+            found.append(item.name)
+        elif item.size == limit:
+            found.insert(0, item.name)
+    return sorted(found)
+"""
+
+
+class FakePath:
+    def __init__(self, name):
+        self.name = name
+
+
+def index_files(index, files):
+    """Analyze {filename: source} into index and return the shared results."""
+    results = AnalysisResult()
+    for name, code in files.items():
+        tree = ASTNode(ast.parse(code))
+        CodeAnalyzer(tree, FakePath(name), results, duplicate_index=index)._check_duplicate_code()
+    return results
+
+
+class TestDuplicateIndex:
+    """Tests for DuplicateIndex"""
+
+    def test_unique_code_has_no_duplicates(self):
+        index = DuplicateIndex(min_nodes=10)
+        index_files(index, {"a.py": HELPER.format(name="a"), "b.py": "def b(x):\n    return x\n"})
+        assert index.find_duplicates() == []
+
+    def test_renamed_copies_across_files(self):
+        """A renamed copy in another file is reported once, as a warning."""
+        index = DuplicateIndex(min_nodes=10)
+        results = index_files(
+            index, {"a.py": HELPER.format(name="pick"), "b.py": HELPER.format(name="choose")}
+        )
+        groups = index.find_duplicates()
+        assert [[(loc.file, loc.qualname) for loc in g] for g in groups] == [
+            [("a.py", "pick"), ("b.py", "choose")]
+        ]
+
+        index.check_duplicates(results)
+        assert len(results["warnings"]) == 1
+        assert results["warnings"][0]["file"] == "a.py"
+        assert "b.py:2 (choose)" in results["warnings"][0]["message"]
+
+    def test_three_copies_is_error(self):
+        index = DuplicateIndex(min_nodes=10)
+        results = index_files(index, {f"{n}.py": HELPER.format(name=n) for n in ("a", "b", "c")})
+        index.check_duplicates(results)
+        assert len(results["errors"]) == 1
+
+    def test_methods_of_copied_class_not_reported_separately(self):
+        """Only the enclosing class is reported when a whole class is copied."""
+        cls = "class {name}:" + HELPER.replace("\n", "\n    ").replace("(items", "(self, items")
+        index = DuplicateIndex(min_nodes=10)
+        index_files(index, {"a.py": cls.format(name="A"), "b.py": cls.format(name="B")})
+        groups = index.find_duplicates()
+        assert len(groups) == 1
+        assert groups[0][0].kind == "class"
+
+    def test_small_blocks_ignored(self):
+        """Blocks below min_nodes are never indexed."""
+        index = DuplicateIndex()
+        index_files(index, {"a.py": "def f(): pass\n", "b.py": "def g(): pass\n"})
+        assert len(index) == 0
@@ -0,0 +1,218 @@
+"""
+tests.classes.test_findingsink
+
+Test suite for the streaming finding sinks.
+"""
+
+import io
+import json
+
+import pytest
+
+from ast_analyzer.classes.AnalysisResult import AnalysisResult, FindingCode, Severity
+from ast_analyzer.classes.FindingSink import FindingSink, JsonLinesSink, JsonSink, SarifSink
+
+
+def make_finding(severity="warning", file="a.py", rule="naming", lines=(0, 0)):
+    return {
+        "file": file,
+        "message": "m",
+        "rule": rule,
+        "severity": severity,
+        "value": 1,
+        "start_line": lines[0],
+        "end_line": lines[1],
+    }
+
+
+# =============================================================================
+# FindingSink Tests
+# =============================================================================
+class TestFindingSink:
+    """Tests for the counting base sink"""
+
+    def test_counts(self):
+        sink = FindingSink()
+        sink.write(make_finding())
+        sink.write(make_finding("error", "b.py"))
+        sink.write(make_finding("warning", "b.py", "complexity"))
+        assert (sink.warnings, sink.errors, len(sink)) == (2, 1, 3)
+        assert sink.files == {"a.py", "b.py"}
+        assert sink.rules == {"naming": 2, "complexity": 1}
+
+    def test_summary_from_counters(self):
+        sink = FindingSink()
+        sink.write(make_finding("error"))
+        summary = sink.summary()
+        assert "There are 1 changes to implement" in summary
+        assert "Errors: 1" in summary
+        assert "  - naming: 1" in summary
+
+    def test_empty_summary(self):
+        sink = FindingSink()
+        assert not sink
+        assert "Congrats!" in sink.summary()
+
+
+# =============================================================================
+# JsonLinesSink Tests
+# =============================================================================
+class TestJsonLinesSink:
+    """Tests for JSON Lines output"""
+
+    def test_one_object_per_line(self):
+        stream = io.StringIO()
+        sink = JsonLinesSink(stream)
+        sink.write(make_finding())
+        sink.write(make_finding("error"))
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line)["severity"] for line in lines] == ["warning", "error"]
+
+    def test_open_file_is_closed_with_sink(self, tmp_path):
+        path = tmp_path / "out.jsonl"
+        with JsonLinesSink.open(path) as sink:
+            sink.write(make_finding())
+        assert sink.stream.closed
+        assert json.loads(path.read_text()) == make_finding()
+
+    def test_open_dash_is_stdout(self, capsys):
+        sink = JsonLinesSink.open("-")
+        sink.write(make_finding())
+        sink.close()
+        assert json.loads(capsys.readouterr().out) == make_finding()
+
+
+# =============================================================================
+# JsonSink Tests
+# =============================================================================
+class TestJsonSink:
+    """Tests for the streamed JSON document"""
+
+    def test_document(self):
+        stream = io.StringIO()
+        with JsonSink(stream) as sink:
+            sink.write(make_finding())
+            sink.write(make_finding("error", "b.py", "complexity", (3, 9)))
+        document = json.loads(stream.getvalue())
+        assert document["findings"][1] == make_finding("error", "b.py", "complexity", (3, 9))
+        assert document["summary"] == {
+            "warnings": 1,
+            "errors": 1,
+            "files": 2,
+            "rules": {"complexity": 1, "naming": 1},
+        }
+
+    def test_empty_document(self):
+        stream = io.StringIO()
+        JsonSink(stream).close()
+        assert json.loads(stream.getvalue())["findings"] == []
+
+    def test_close_twice(self):
+        stream = io.StringIO()
+        sink = JsonSink(stream)
+        sink.close()
+        sink.close()
+        json.loads(stream.getvalue())
+
+    def test_run_stats_in_summary(self):
+        stream = io.StringIO()
+        sink = JsonSink(stream)
+        sink.run_stats = {"files": 3, "files_per_second": 1.5}
+        sink.close()
+        summary = json.loads(stream.getvalue())["summary"]
+        assert summary["throughput"] == {"files": 3, "files_per_second": 1.5}
+
+
+# =============================================================================
+# SarifSink Tests
+# =============================================================================
+class TestSarifSink:
+    """Tests for the streamed SARIF log"""
+
+    def test_log(self):
+        stream = io.StringIO()
+        with SarifSink(stream) as sink:
+            sink.write(make_finding("error", "b.py", "complexity", (3, 9)))
+            sink.write(make_finding())
+        log = json.loads(stream.getvalue())
+        assert log["version"] == "2.1.0"
+        run = log["runs"][0]
+        assert run["tool"]["driver"]["rules"] == [{"id": "complexity"}, {"id": "naming"}]
+
+        first, second = run["results"]
+        assert first["ruleId"] == "complexity"
+        assert first["level"] == "error"
+        assert first["properties"] == {"value": 1}
+        location = first["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"] == {"uri": "b.py", "uriBaseId": "SRCROOT"}
+        assert location["region"] == {"startLine": 3, "endLine": 9}
+        # Whole-file findings have no region
+        assert "region" not in second["locations"][0]["physicalLocation"]
+        assert "properties" not in run
+
+    def test_root_base_uri(self, tmp_path):
+        stream = io.StringIO()
+        with SarifSink(stream, root=tmp_path) as sink:
+            sink.write(make_finding(file="pkg/my mod.py"))
+        run = json.loads(stream.getvalue())["runs"][0]
+        base = run["originalUriBaseIds"]["SRCROOT"]["uri"]
+        assert base == tmp_path.resolve().as_uri() + "/"
+        location = run["results"][0]["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"]["uri"] == "pkg/my%20mod.py"
+
+    def test_run_stats_in_properties(self):
+        stream = io.StringIO()
+        sink = SarifSink(stream)
+        sink.run_stats = {"files": 3}
+        sink.close()
+        run = json.loads(stream.getvalue())["runs"][0]
+        assert run["properties"] == {"throughput": {"files": 3}}
+
+
+# =============================================================================
+# AnalysisResult write-through Tests
+# =============================================================================
+@pytest.mark.analysis_result
+class TestAnalysisResultWithSink:
+    """Tests for an AnalysisResult that writes findings through to a sink"""
+
+    def test_findings_are_written_not_stored(self):
+        stream = io.StringIO()
+        result = AnalysisResult(sink=JsonLinesSink(stream))
+        result.append_warning("Custom warning", "a.py")
+        result.append_finding(FindingCode.COMPLEXITY, Severity.ERROR, "b.py", 16, "run")
+
+        assert len(result) == 2
+        assert bool(result)
+        assert len(result["warnings"]) == 0
+        rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert rows[0]["message"] == "Custom warning"
+        assert rows[1] == {
+            "file": "b.py",
+            "message": "High complexity score (16) in run",
+            "rule": "complexity",
+            "severity": "error",
+            "value": 16,
+            "start_line": 0,
+            "end_line": 0,
+        }
+
+    def test_merge_writes_through(self, populated_analysis_result):
+        sink = FindingSink()
+        result = AnalysisResult(sink=sink)
+        result.merge(populated_analysis_result)
+        assert (sink.warnings, sink.errors) == (2, 1)
+        assert len(result) == 3
+
+    def test_export_stored_findings(self, populated_analysis_result):
+        stream = io.StringIO()
+        with JsonSink(stream) as sink:
+            populated_analysis_result.export(sink)
+        findings = json.loads(stream.getvalue())["findings"]
+        assert [f["file"] for f in findings] == ["file1.py", "file3.py", "file2.py"]
+
+    def test_str_is_sink_summary(self):
+        sink = FindingSink()
+        result = AnalysisResult(sink=sink)
+        result.append_error("e", "a.py")
+        assert str(result) == sink.summary()
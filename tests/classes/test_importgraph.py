@@ -0,0 +1,213 @@
+"""
+tests.classes.test_importgraph
+
+Test suite for the project-wide ImportGraph.
+"""
+
+import ast
+
+import pytest
+
+from ast_analyzer.analyzer import CodeAnalyzer
+from ast_analyzer.ASTNode import ASTNode
+from ast_analyzer.classes.AnalysisResult import AnalysisResult
+from ast_analyzer.classes.ImportGraph import ImportGraph, strongly_connected_components
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Factory that writes {relative path: source} files under tmp_path."""
+
+    def _write(files):
+        for name, source in files.items():
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(source)
+        return tmp_path
+
+    return _write
+
+
+def analyze_project(root, graph):
+    """Run CodeAnalyzer over every Python file under root, feeding graph."""
+    results = AnalysisResult()
+    for path in sorted(root.rglob("*.py")):
+        tree = ASTNode(ast.parse(path.read_text()))
+        CodeAnalyzer(tree, path, results, import_graph=graph)._check_circular_imports()
+    graph.prune()
+    return results
+
+
+class TestStronglyConnectedComponents:
+    """Tests for strongly_connected_components"""
+
+    def test_finds_cycle(self):
+        graph = {"a": {"b"}, "b": {"c"}, "c": {"a"}, "d": {"a"}}
+        components = sorted(sorted(c) for c in strongly_connected_components(graph))
+        assert ["a", "b", "c"] in components
+        assert ["d"] in components
+
+    def test_deep_chain_does_not_recurse(self):
+        """Long import chains do not hit the recursion limit."""
+        graph = {str(i): {str(i + 1)} for i in range(20000)}
+        assert len(strongly_connected_components(graph)) == 20001
+
+
+class TestImportGraph:
+    """Tests for ImportGraph"""
+
+    def test_no_cycles(self, project):
+        root = project({"pkg/__init__.py": "", "pkg/a.py": "import pkg.b\n", "pkg/b.py": ""})
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        assert graph.find_cycles() == []
+
+    def test_absolute_import_cycle(self, project):
+        root = project(
+            {
+                "pkg/__init__.py": "",
+                "pkg/a.py": "from pkg import b\n",
+                "pkg/b.py": "import pkg.a\n",
+            }
+        )
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        assert graph.find_cycles() == [["pkg/a.py", "pkg/b.py"]]
+
+    def test_relative_import_cycle(self, project):
+        root = project(
+            {
+                "pkg/__init__.py": "from .sub import thing\n",
+                "pkg/sub/__init__.py": "from .mod import thing\n",
+                "pkg/sub/mod.py": "from .. import VERSION\nthing = 1\n",
+                "pkg/other.py": "",
+            }
+        )
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        assert graph.find_cycles() == [["pkg/__init__.py", "pkg/sub/__init__.py", "pkg/sub/mod.py"]]
+
+    def test_src_layout_resolves_package_names(self, project):
+        """Directories without __init__.py are not part of module names."""
+        root = project(
+            {
+                "src/pkg/__init__.py": "",
+                "src/pkg/a.py": "from pkg.b import x\n",
+                "src/pkg/b.py": "from pkg.a import y\n",
+            }
+        )
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        assert graph.find_cycles() == [["src/pkg/a.py", "src/pkg/b.py"]]
+
+    def test_same_module_names_in_two_directories(self, project):
+        """Script directories sharing module names keep their own edges."""
+        root = project(
+            {
+                "a_dir/a.py": "import b\n",
+                "a_dir/b.py": "import a\n",
+                "z_dir/a.py": "",
+                "z_dir/b.py": "",
+            }
+        )
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        assert graph.find_cycles() == [["a_dir/a.py", "a_dir/b.py"]]
+
+    def test_unique_names_resolve_across_directories(self, project):
+        root = project(
+            {
+                "src/pkg/__init__.py": "",
+                "src/pkg/a.py": "import helpers\n",
+                "tools/helpers.py": "from pkg import a\n",
+            }
+        )
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        assert graph.find_cycles() == [["src/pkg/a.py", "tools/helpers.py"]]
+
+    def test_deferred_imports_ignored(self, project):
+        """Function-level and TYPE_CHECKING imports cannot create cycles."""
+        root = project(
+            {
+                "a.py": "import b\n",
+                "b.py": (
+                    "from typing import TYPE_CHECKING\n"
+                    "if TYPE_CHECKING:\n    import a\n"
+                    "def f():\n    import a\n"
+                ),
+            }
+        )
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        assert graph.find_cycles() == []
+
+    def test_check_cycles_appends_error(self, project):
+        root = project({"a.py": "import b\n", "b.py": "import a\n"})
+        graph = ImportGraph(root)
+        results = analyze_project(root, graph)
+        graph.check_cycles(results)
+        assert len(results["errors"]) == 1
+        assert results["errors"][0]["file"] == "a.py"
+        assert "a, b" in results["errors"][0]["message"]
+
+    def test_check_cycles_uses_relative_path(self, project):
+        root = project(
+            {
+                "pkg/__init__.py": "",
+                "pkg/a.py": "from pkg import b\n",
+                "pkg/b.py": "from pkg import a\n",
+            }
+        )
+        graph = ImportGraph(root)
+        results = analyze_project(root, graph)
+        graph.check_cycles(results)
+        assert results["errors"][0]["file"] == "pkg/a.py"
+
+
+class TestImportGraphPersistence:
+    """Tests for saving and incrementally updating an ImportGraph"""
+
+    def test_round_trip(self, project, tmp_path):
+        root = project({"a.py": "import b\n", "b.py": "import a\n"})
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        graph.save(tmp_path / "cache" / "graph.json")
+
+        loaded = ImportGraph.load(tmp_path / "cache" / "graph.json", root)
+        assert loaded.files == graph.files
+        assert loaded.find_cycles() == [["a.py", "b.py"]]
+
+    def test_unchanged_files_are_fresh(self, project, tmp_path):
+        """Only changed files have their edges recomputed."""
+        root = project({"a.py": "import b\n", "b.py": ""})
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        graph.save(tmp_path / "graph.json")
+
+        (root / "b.py").write_text("import a\n# changed\n")
+        loaded = ImportGraph.load(tmp_path / "graph.json", root)
+        assert loaded.is_fresh(root / "a.py")
+        assert not loaded.is_fresh(root / "b.py")
+
+        analyze_project(root, loaded)
+        assert loaded.find_cycles() == [["a.py", "b.py"]]
+
+    def test_removed_files_are_pruned(self, project, tmp_path):
+        root = project({"a.py": "import b\n", "b.py": "import a\n"})
+        graph = ImportGraph(root)
+        analyze_project(root, graph)
+        graph.save(tmp_path / "graph.json")
+
+        (root / "b.py").unlink()
+        loaded = ImportGraph.load(tmp_path / "graph.json", root)
+        analyze_project(root, loaded)
+        assert list(loaded.files) == ["a.py"]
+        assert loaded.find_cycles() == []
+
+    def test_load_ignores_bad_file(self, tmp_path):
+        (tmp_path / "graph.json").write_text("not json")
+        assert len(ImportGraph.load(tmp_path / "graph.json", tmp_path)) == 0
+
+    def test_load_missing_file(self, tmp_path):
+        assert len(ImportGraph.load(tmp_path / "missing.json", tmp_path)) == 0
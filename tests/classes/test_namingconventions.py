@@ -0,0 +1,64 @@
+"""
+tests.classes.test_namingconventions
+
+Test suite for NamingConventions.
+"""
+
+import pytest
+
+from ast_analyzer.classes.NamingConventions import NamingConventions
+
+
+class TestDefaultConventions:
+    """Tests for the default naming patterns"""
+
+    @pytest.mark.parametrize(
+        "kind,name,valid",
+        [
+            ("class", "MyClass", True),
+            ("class", "_Private", True),
+            ("class", "my_class", False),
+            ("function", "do_thing", True),
+            ("function", "__init__", True),
+            ("function", "_helper", True),
+            ("function", "doThing", False),
+            ("argument", "_", True),
+            ("argument", "self", True),
+            ("argument", "maxValue", False),
+            ("variable", "MAX_SIZE", True),
+            ("variable", "JsonDict", True),
+            ("variable", "__all__", True),
+            ("variable", "myVar", False),
+        ],
+    )
+    def test_is_valid(self, kind, name, valid):
+        assert NamingConventions().is_valid(kind, name) is valid
+
+
+class TestNamingConventions:
+    """Tests for NamingConventions configuration and memoization"""
+
+    def test_invalid_returns_bad_names_in_order(self):
+        conventions = NamingConventions()
+        assert conventions.invalid("function", ["a", "bB", "c", "dD"]) == ["bB", "dD"]
+
+    def test_custom_patterns_are_combined(self):
+        """Several patterns for one kind are all allowed."""
+        conventions = NamingConventions({"function": [r"[a-z_]+", r"visit_[A-Z]\w*"]})
+        assert conventions.invalid("function", ["visit_If", "run", "doIt"]) == ["doIt"]
+
+    def test_custom_pattern_keeps_other_defaults(self):
+        conventions = NamingConventions({"class": r"[a-z]+"})
+        assert conventions.is_valid("class", "lower")
+        assert not conventions.is_valid("function", "camelCase")
+
+    def test_unknown_kind_raises(self):
+        with pytest.raises(ValueError):
+            NamingConventions({"module": r".*"})
+
+    def test_verdicts_memoized_per_identifier(self):
+        """Repeated identifiers are only matched once."""
+        conventions = NamingConventions()
+        names = ["good_name", "badName"] * 1000
+        assert len(conventions.invalid("variable", names)) == 1000
+        assert conventions.cache_size() == 2
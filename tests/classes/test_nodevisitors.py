@@ -0,0 +1,279 @@
+"""
+tests.classes.test_nodevisitors
+
+Test suite for the fused traversal and its passes.
+"""
+
+import ast
+import zlib
+
+from ast_analyzer.ASTNode import ASTNode
+from ast_analyzer.classes import NodeVisitors
+
+
+def run_passes(code, *passes):
+    """Run the given passes over code in a single fused traversal."""
+    NodeVisitors.FusedTraversal(passes).visit(ASTNode(ast.parse(code)))
+    return passes
+
+
+class TestFusedTraversal:
+    """Tests for NodeVisitors.FusedTraversal"""
+
+    def test_enter_and_leave_order(self):
+        """Enter hooks run before children and leave hooks after."""
+
+        class Recorder(NodeVisitors.TraversalPass):
+            def __init__(self):
+                self.events = []
+
+            def enter_FunctionDef(self, node):
+                self.events.append(("enter", node.node.name))
+
+            def leave_FunctionDef(self, node):
+                self.events.append(("leave", node.node.name))
+
+        (recorder,) = run_passes("def a():\n    def b(): pass\n", Recorder())
+        assert recorder.events == [
+            ("enter", "a"),
+            ("enter", "b"),
+            ("leave", "b"),
+            ("leave", "a"),
+        ]
+
+    def test_passes_share_one_walk(self):
+        """Every pass sees each node during the same traversal."""
+
+        class Counter(NodeVisitors.TraversalPass):
+            def __init__(self):
+                self.count = 0
+
+            def enter_Name(self, node):
+                self.count += 1
+
+        first, second = run_passes("x = y + z", Counter(), Counter())
+        assert first.count == second.count == 3
+
+
+class TestFunctionMetricsPass:
+    """Tests for NodeVisitors.FunctionMetricsPass"""
+
+    def test_records_in_source_order(self):
+        """Nested functions are recorded after their parent, in source order."""
+        code = "def outer():\n    def inner(): pass\ndef last(): pass\n"
+        (metrics,) = run_passes(code, NodeVisitors.FunctionMetricsPass())
+        assert [r.qualname for r in metrics.records] == ["outer", "outer.inner", "last"]
+
+    def test_qualified_names_include_classes(self):
+        """Methods are qualified with their class name."""
+        code = "class A:\n    class B:\n        async def run(self): pass\n"
+        (metrics,) = run_passes(code, NodeVisitors.FunctionMetricsPass())
+        assert metrics.records[0].qualname == "A.B.run"
+
+    def test_complexity_belongs_to_innermost_function(self):
+        """Branches inside a nested function do not count for the outer one."""
+        code = """
+def outer():
+    if a: pass
+    def inner():
+        for x in y:
+            if x: pass
+    return [i for i in y]
+"""
+        (metrics,) = run_passes(code, NodeVisitors.FunctionMetricsPass())
+        outer, inner = metrics.records
+        assert outer.complexity == 2
+        assert inner.complexity == 2
+
+    def test_lines_and_docstring(self):
+        """Line span and docstring presence are recorded per function."""
+        code = 'def a():\n    """Doc."""\n    return 1\n\ndef b():\n    pass\n'
+        (metrics,) = run_passes(code, NodeVisitors.FunctionMetricsPass())
+        a, b = metrics.records
+        assert (a.lineno, a.num_lines, a.has_docstring) == (1, 3, True)
+        assert (b.lineno, b.num_lines, b.has_docstring) == (5, 2, False)
+
+    def test_max_depth(self):
+        """Nesting depth tracks the deepest control-flow block."""
+        code = """
+def f():
+    for x in y:
+        with open(x) as fh:
+            try:
+                if fh: pass
+            except OSError: pass
+    while True: pass
+"""
+        (metrics,) = run_passes(code, NodeVisitors.FunctionMetricsPass())
+        assert metrics.records[0].max_depth == 4
+
+    def test_match_and_nested_function_depth(self):
+        """match counts as a level and nested functions start again at zero."""
+        code = """
+def f(cmd):
+    match cmd:
+        case "go":
+            if cmd:
+                def g():
+                    while True: pass
+"""
+        (metrics,) = run_passes(code, NodeVisitors.FunctionMetricsPass())
+        f, g = metrics.records
+        assert f.max_depth == 2
+        assert g.max_depth == 1
+
+    def test_elif_does_not_nest(self):
+        """An elif chain stays at the same depth as its if."""
+        code = """
+def f():
+    if a: pass
+    elif b: pass
+    elif c: pass
+    else: pass
+"""
+        (metrics,) = run_passes(code, NodeVisitors.FunctionMetricsPass())
+        assert metrics.records[0].max_depth == 1
+        assert metrics.records[0].complexity == 3
+
+    def test_module_level_code_not_recorded(self):
+        """Control flow outside of functions does not produce records."""
+        (metrics,) = run_passes("if a:\n    pass\n", NodeVisitors.FunctionMetricsPass())
+        assert metrics.records == []
+
+
+class TestClassCountsPass:
+    """Tests for NodeVisitors.ClassCountsPass"""
+
+    def test_counts_nested_classes_and_missing_docstrings(self):
+        code = '''
+class Outer:
+    """Documented."""
+    class Inner:
+        pass
+def f():
+    class Local:
+        pass
+'''
+        (counts,) = run_passes(code, NodeVisitors.ClassCountsPass())
+        assert counts.classes == 3
+        # The module, Inner and Local; functions are left to FunctionMetricsPass
+        assert counts.missing_docstrings == 3
+
+    def test_documented_module(self):
+        (counts,) = run_passes('"""Module."""\n', NodeVisitors.ClassCountsPass())
+        assert (counts.classes, counts.missing_docstrings) == (0, 0)
+
+
+class TestImportUsagePass:
+    """Tests for NodeVisitors.ImportUsagePass"""
+
+    def unused(self, code):
+        (imports,) = run_passes(code, NodeVisitors.ImportUsagePass())
+        return [name for name, _ in imports.unused]
+
+    def test_used_imports_not_reported(self):
+        """Imports loaded anywhere in the module are used."""
+        code = "import os\nimport os.path\nfrom a import b as c\nos.getcwd(c)\n"
+        assert self.unused(code) == []
+
+    def test_unused_imports_reported_in_line_order(self):
+        """Unused imports are reported by bound name in source order."""
+        code = "import json\nfrom typing import Any, List\nimport numpy as np\nx: List = 1\n"
+        assert self.unused(code) == ["json", "Any", "np"]
+
+    def test_use_in_nested_function(self):
+        """A module import used only inside a function is used."""
+        code = "import os\ndef f():\n    def g():\n        return os.sep\n"
+        assert self.unused(code) == []
+
+    def test_function_scope_import(self):
+        """An import inside a function is only satisfied by loads in that function."""
+        code = "def f():\n    import os\ndef g():\n    return os\n"
+        assert self.unused(code) == ["os"]
+
+    def test_dunder_all_counts_as_use(self):
+        """Names exported through __all__ are used."""
+        code = "from a import b, c, d\n__all__ = ['b']\n__all__ += ('c',)\n"
+        assert self.unused(code) == ["d"]
+
+    def test_string_annotations_count_as_use(self):
+        """Names inside string annotations are used."""
+        code = "from a import A, B, C\ndef f(x: 'A') -> list['B']:\n    y: 'dict[str, C]' = {}\n"
+        assert self.unused(code) == []
+
+    def test_reexports_and_future_ignored(self):
+        """Explicit re-exports, star imports and __future__ are never reported."""
+        code = "from __future__ import annotations\nimport a as a\nfrom b import c as c\nfrom d import *\n"
+        assert self.unused(code) == []
+
+
+class TestNamingPass:
+    """Tests for NodeVisitors.NamingPass"""
+
+    def test_collects_names_by_kind(self):
+        code = """
+class Shape:
+    def area(self, scale=1, *args, **kwargs):
+        width, (height, *rest) = size = dims
+        self.cached = width
+"""
+        (naming,) = run_passes(code, NodeVisitors.NamingPass())
+        assert naming.names == {
+            "class": ["Shape"],
+            "function": ["area"],
+            "argument": ["self", "scale", "args", "kwargs"],
+            "variable": ["width", "height", "rest", "size"],
+        }
+
+
+class TestStructuralHashPass:
+    """Tests for NodeVisitors.StructuralHashPass"""
+
+    def digests(self, code):
+        (structure,) = run_passes(code, NodeVisitors.StructuralHashPass())
+        return {block.qualname: block.digest for block in structure.blocks}
+
+    def test_renamed_copy_hashes_alike(self):
+        """Identifiers, literal values and positions do not change the hash."""
+        code = """
+def total(items):
+    return sum(i * 2 for i in items if i)
+
+
+def add_up(values):
+    return sum(v * 3 for v in values if v)
+"""
+        digests = self.digests(code)
+        assert digests["total"] == digests["add_up"]
+
+    def test_structure_changes_hash(self):
+        """A different operator or statement shape changes the hash."""
+        code = """
+def a(x):
+    return x * 2
+def b(x):
+    return x + 2
+def c(x):
+    x = x * 2
+    return x
+"""
+        digests = self.digests(code)
+        assert len(set(digests.values())) == 3
+
+    def test_labels_are_stable_between_runs(self):
+        """Labels do not depend on the process' string hash seed."""
+        label = NodeVisitors.StructuralHashPass._label(ast.parse("'s'").body[0].value)
+        assert label == zlib.crc32(b"Constant:str")
+
+    def test_blocks_record_parents(self):
+        """Methods point at their class; blocks are recorded innermost first."""
+        code = "class A:\n    def m(self): pass\n    def n(self): pass\n"
+        (structure,) = run_passes(code, NodeVisitors.StructuralHashPass())
+        assert [b.qualname for b in structure.blocks] == ["A.m", "A.n", "A"]
+        assert [b.parent for b in structure.blocks] == [2, 2, None]
+
+    def test_small_blocks_skipped(self):
+        """Blocks under min_nodes are not recorded but their parents still link."""
+        code = "class A:\n    def m(self): pass\n    x = [1, 2, 3, 4, 5, 6]\n"
+        (structure,) = run_passes(code, NodeVisitors.StructuralHashPass(min_nodes=10))
+        assert [b.qualname for b in structure.blocks] == ["A"]
@@ -0,0 +1,179 @@
+"""
+tests.classes.test_profiler
+
+Test suite for the per-phase run profiler.
+"""
+
+import ast
+import json
+import threading
+import tracemalloc
+
+import pytest
+
+from ast_analyzer.classes.Profiler import Profiler
+
+
+class TestLaps:
+    """Tests for charging time to phases"""
+
+    def test_lap_counts_calls(self):
+        profiler = Profiler()
+        for _ in range(3):
+            profiler.lap("parse")
+        profiler.lap("build")
+        assert profiler.phases["parse"][0] == 3
+        assert profiler.phases["build"][0] == 1
+        assert list(profiler.phases) == ["parse", "build"]
+
+    def test_lap_charges_elapsed_time(self):
+        profiler = Profiler()
+        profiler.restart()
+        sum(range(100_000))
+        profiler.lap("work")
+        assert profiler.phases["work"][1] > 0
+
+    def test_iterate_charges_production_only(self):
+        profiler = Profiler()
+        items = list(profiler.iterate(iter([1, 2, 3]), "discover"))
+        assert items == [1, 2, 3]
+        # One lap per item plus the final, exhausted call
+        assert profiler.phases["discover"][0] == 4
+
+
+class TestFiles:
+    """Tests for per-file totals"""
+
+    def run_file(self, profiler, path, source):
+        profiler.start_file(path)
+        tree = ast.parse(source)
+        profiler.lap("parse", nodes=len(list(ast.walk(tree))))
+        profiler.end_file()
+
+    def test_counts_files_and_nodes(self):
+        profiler = Profiler()
+        self.run_file(profiler, "a.py", "x = 1\n")
+        self.run_file(profiler, "b.py", "y = 2\n")
+        assert profiler.files == 2
+        assert profiler.nodes == 2 * len(list(ast.walk(ast.parse("x = 1\n"))))
+
+    def test_counts_per_phase(self):
+        profiler = Profiler()
+        profiler.lap("discover")
+        self.run_file(profiler, "a.py", "x = 1\n")
+        self.run_file(profiler, "b.py", "x = 1\nx = 2\n")
+        assert profiler.phases["parse"][2:] == [2, 5 + 9]
+        assert profiler.phases["discover"][2:] == [0, 0]
+        assert "ns/node" in str(profiler)
+
+    def test_keeps_slowest(self):
+        profiler = Profiler(slowest=2)
+        for i in range(5):
+            self.run_file(profiler, f"m{i}.py", "x = 1\n")
+        slowest = profiler.slowest_files()
+        assert len(slowest) == 2
+        assert slowest[0][1] >= slowest[1][1]
+
+    def test_str(self):
+        profiler = Profiler()
+        self.run_file(profiler, "a.py", "x = 1\n")
+        report = str(profiler)
+        assert report.startswith("Profile (1 files, 5 AST nodes")
+        assert "parse" in report
+        assert "Slowest 1 files:" in report
+
+
+class TestTrace:
+    """Tests for the Chrome Trace Event export"""
+
+    def test_spans_only_with_trace(self):
+        assert Profiler().spans is None
+        profiler = Profiler(trace=True)
+        profiler.lap("parse")
+        assert [span[:2] for span in profiler.spans] == [("parse", "phase")]
+
+    def test_write_trace(self, tmp_path):
+        profiler = Profiler(trace=True)
+        TestFiles().run_file(profiler, "a.py", "x = 1\n")
+        profiler.write_trace(tmp_path / "trace.json")
+        events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+        spans = [event for event in events if event["ph"] == "X"]
+        assert {(event["name"], event["cat"]) for event in spans} == {
+            ("parse", "phase"),
+            ("a.py", "file"),
+        }
+        assert all(event["args"] == {"file": "a.py"} for event in spans)
+        assert all(event["ts"] >= 0 and event["dur"] >= 0 for event in spans)
+        assert {event["name"] for event in events if event["ph"] == "M"} == {
+            "process_name",
+            "thread_name",
+        }
+
+    def test_write_trace_requires_trace(self, tmp_path):
+        with pytest.raises(ValueError):
+            Profiler().write_trace(tmp_path / "trace.json")
+
+    def test_merge(self):
+        main = Profiler(slowest=2, trace=True)
+        TestFiles().run_file(main, "a.py", "x = 1\n")
+        workers = []
+
+        def work():
+            worker = Profiler(trace=True)
+            TestFiles().run_file(worker, "b.py", "y = 2\n")
+            workers.append(worker)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+        main.merge(workers[0])
+        assert main.files == 2
+        assert main.phases["parse"][0] == 2
+        assert {path for path, _, _ in main.slowest_files()} == {"a.py", "b.py"}
+        assert len({span[-1] for span in main.spans}) == 2
+
+
+class TestMemory:
+    """Tests for tracemalloc-based memory accounting"""
+
+    @pytest.fixture
+    def profiler(self):
+        profiler = Profiler(memory=True)
+        yield profiler
+        profiler.stop()
+
+    def test_starts_and_stops_tracing(self, profiler):
+        assert tracemalloc.is_tracing()
+        profiler.stop()
+        assert not tracemalloc.is_tracing()
+
+    def test_records_rise_per_phase(self, profiler):
+        profiler.start_file("big.py")
+        kept = [bytearray(1024) for _ in range(1000)]
+        profiler.lap("build")
+        profiler.end_file()
+        assert len(kept) == 1000
+        assert profiler.memory_phases["build"][0] >= 1000 * 1024
+        [(path, peak)] = profiler.largest_files()
+        assert path == "big.py" and peak >= 1000 * 1024
+
+    def test_allocation_sites(self, profiler):
+        profiler.start_file("big.py")
+        kept = [bytearray(1024) for _ in range(1000)]
+        profiler.lap("build")
+        site, size, _ = profiler.allocation_sites()[0]
+        assert len(kept) == 1000
+        assert site.startswith(__file__)
+        assert size >= 1000 * 1024
+
+    def test_memory_report(self, profiler):
+        TestFiles().run_file(profiler, "a.py", "x = 1\n")
+        report = profiler.memory_report()
+        assert report.startswith("Memory (tracemalloc")
+        assert "parse" in report
+        assert "Largest 1 files by peak memory:" in report
+
+    def test_off_by_default(self):
+        profiler = Profiler()
+        profiler.lap("parse")
+        assert profiler.memory_phases == {}
@@ -0,0 +1,158 @@
+"""
+tests.classes.test_resultstore
+
+Test suite for the SQLite result store.
+"""
+
+import sqlite3
+
+import pytest
+
+from ast_analyzer.classes import ResultStore as ResultStoreModule
+from ast_analyzer.classes.AnalysisResult import AnalysisResult, FindingCode, Severity
+from ast_analyzer.classes.NodeVisitors import FunctionMetrics
+from ast_analyzer.classes.ResultStore import FileMetrics, ResultStore, format_rows
+
+
+def make_results(filename, complexity):
+    results = AnalysisResult()
+    results.append_finding(
+        FindingCode.COMPLEXITY, Severity.WARNING, filename, complexity, "f", 1, 20
+    )
+    return results
+
+
+def record_run(store, files, root=".", config=""):
+    """Record a run of {path: (digest, max_complexity)}."""
+    store.begin_run(root, config)
+    for path, (digest, complexity) in files.items():
+        metrics = FileMetrics(1, 20, complexity, complexity, 1)
+        store.add_file(path, digest, metrics, make_results(path, complexity))
+    store.finish_run()
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultStore(tmp_path / "results.db") as store:
+        yield store
+
+
+def count(store, table):
+    return store.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+# =============================================================================
+# FileMetrics Tests
+# =============================================================================
+class TestFileMetrics:
+    """Tests for FileMetrics.from_functions"""
+
+    def test_from_functions(self):
+        records = [
+            FunctionMetrics("f", 1, 10, 3, 2, True),
+            FunctionMetrics("g", 12, 5, 7, 1, False),
+        ]
+        assert FileMetrics.from_functions(records, 40) == FileMetrics(2, 40, 7, 10, 2)
+
+    def test_no_functions(self):
+        assert FileMetrics.from_functions([], 3) == FileMetrics(0, 3, 0, 0, 0)
+
+
+# =============================================================================
+# Recording Tests
+# =============================================================================
+class TestRecording:
+    """Tests for recording runs"""
+
+    def test_run_totals(self, store):
+        record_run(store, {"a.py": ("1", 12), "pkg/b.py": ("2", 16)})
+        (run,) = store.runs()
+        assert run[3:] == (2, 2, 0)
+
+    def test_unchanged_files_reuse_versions(self, store):
+        """A second run over the same content adds no metrics or findings."""
+        files = {"a.py": ("1", 12), "pkg/b.py": ("2", 16)}
+        record_run(store, files)
+        record_run(store, files)
+        assert count(store, "versions") == 2
+        assert count(store, "findings") == 2
+        assert count(store, "run_files") == 4
+        assert len(store.findings()) == 2
+
+    def test_changed_file_adds_version(self, store):
+        record_run(store, {"a.py": ("1", 12)})
+        record_run(store, {"a.py": ("2", 30)})
+        assert count(store, "versions") == 2
+        assert count(store, "files") == 1
+        assert store.findings()[0][3] == 30
+
+    def test_changed_config_adds_version(self, store):
+        """Unchanged files are stored again when the analysis config changes."""
+        record_run(store, {"a.py": ("1", 12)}, config="old")
+        record_run(store, {"a.py": ("1", 30)}, config="new")
+        assert count(store, "versions") == 2
+        assert store.findings()[0][3] == 30
+        record_run(store, {"a.py": ("1", 12)}, config="old")
+        assert count(store, "versions") == 2
+
+    def test_batches(self, store, monkeypatch):
+        """Files are written in batches and all of them end up stored."""
+        monkeypatch.setattr(ResultStoreModule, "BATCH_SIZE", 3)
+        record_run(store, {f"m{i}.py": (str(i), i) for i in range(10)})
+        assert count(store, "versions") == 10
+        assert count(store, "run_files") == 10
+
+    def test_project_findings(self, store):
+        store.begin_run(".")
+        project = AnalysisResult()
+        project.append_finding(FindingCode.CIRCULAR_IMPORT, Severity.ERROR, "a.py", 2, "a, b")
+        store.add_project_findings(project)
+        store.finish_run()
+        assert store.findings() == [
+            ("a.py", "circular-import", "error", 2, 0, 0, "Circular import between a, b")
+        ]
+        assert store.runs()[0][5] == 1
+
+    def test_incompatible_version(self, tmp_path):
+        path = tmp_path / "results.db"
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA user_version=99")
+        connection.close()
+        with pytest.raises(ValueError):
+            ResultStore(path)
+
+
+# =============================================================================
+# Query Tests
+# =============================================================================
+class TestQueries:
+    """Tests for the query helpers"""
+
+    def test_top_files(self, store):
+        record_run(
+            store, {"payments/a.py": ("1", 12), "payments/b.py": ("2", 3), "c.py": ("3", 40)}
+        )
+        assert store.top_files(prefix="payments/") == [("payments/a.py", 12), ("payments/b.py", 3)]
+        assert store.top_files(limit=1) == [("c.py", 40)]
+
+    def test_top_files_recent_runs(self, store):
+        record_run(store, {"a.py": ("1", 50)})
+        record_run(store, {"a.py": ("2", 5)})
+        assert store.top_files(runs=1) == [("a.py", 5)]
+        assert store.top_files() == [("a.py", 50)]
+
+    def test_unknown_metric(self, store):
+        with pytest.raises(ValueError):
+            store.top_files("bogus")
+
+    def test_empty_store(self, store):
+        assert store.top_files() == []
+        assert store.findings() == []
+
+    def test_findings_filters(self, store):
+        record_run(store, {"a.py": ("1", 12), "pkg/b.py": ("2", 16)})
+        assert [row[0] for row in store.findings(prefix="pkg/")] == ["pkg/b.py"]
+        assert store.findings(rule="naming") == []
+
+    def test_format_rows(self):
+        assert format_rows([("a.py", 12)], ("path", "value")) == "path  value\na.py  12"
@@ -0,0 +1,130 @@
+"""
+tests.classes.test_rollups
+
+Test suite for the streaming top-K and per-directory rollups.
+"""
+
+import pytest
+
+from ast_analyzer.classes.AnalysisResult import AnalysisResult
+from ast_analyzer.classes.ResultStore import FileMetrics
+from ast_analyzer.classes.Rollups import TOP_METRICS, Rollups
+
+
+def add(rollups, path, complexity=1, lines=10, warnings=0, errors=0):
+    results = AnalysisResult()
+    for _ in range(warnings):
+        results.append_warning("w", path)
+    for _ in range(errors):
+        results.append_error("e", path)
+    rollups.add_file(path, FileMetrics(2, lines, complexity, complexity, 1))
+    rollups.add_findings(results)
+
+
+class TestTopK:
+    """Tests for the per-metric top-K heaps"""
+
+    def test_keeps_k_highest(self):
+        rollups = Rollups(k=3)
+        for i, complexity in enumerate([5, 40, 1, 17, 22, 3]):
+            add(rollups, f"m{i}.py", complexity=complexity)
+        assert rollups.top("max_complexity") == [("m1.py", 40), ("m4.py", 22), ("m3.py", 17)]
+
+    def test_heaps_are_bounded(self):
+        rollups = Rollups(k=2)
+        for i in range(100):
+            add(rollups, f"m{i}.py", complexity=i, warnings=1, errors=1)
+        assert all(len(heap) == 2 for heap in rollups._heaps.values())
+        assert rollups.top("max_complexity") == [("m99.py", 99), ("m98.py", 98)]
+
+    def test_zero_values_left_out(self):
+        rollups = Rollups(k=5)
+        add(rollups, "a.py", errors=1)
+        add(rollups, "b.py")
+        assert rollups.top("errors") == [("a.py", 1)]
+
+    def test_findings_ranked(self):
+        rollups = Rollups(k=2)
+        for i in range(5):
+            add(rollups, f"m{i}.py", warnings=i)
+        assert rollups.top("warnings") == [("m4.py", 4), ("m3.py", 3)]
+        assert len(rollups._heaps["warnings"]) == 2
+
+    def test_project_findings_merged_with_file_findings(self):
+        """Project findings add to a file's own findings when ranked."""
+        rollups = Rollups(k=2)
+        add(rollups, "a.py", errors=3)
+        add(rollups, "b.py", errors=2)
+        add(rollups, "c.py")
+        results = AnalysisResult()
+        for path in ("b.py", "b.py", "c.py"):
+            results.append_error("cycle", path)
+        rollups.add_project_findings(results)
+        assert rollups.top("errors") == [("b.py", 4), ("a.py", 3)]
+
+    def test_unknown_metric(self):
+        with pytest.raises(ValueError):
+            Rollups().top("bogus")
+
+    def test_invalid_k(self):
+        with pytest.raises(ValueError):
+            Rollups(k=0)
+
+
+class TestDirectories:
+    """Tests for the per-directory totals"""
+
+    def test_prefix_totals(self):
+        rollups = Rollups()
+        add(rollups, "top.py", lines=5, warnings=1)
+        add(rollups, "pkg/a.py", lines=10, errors=2)
+        add(rollups, "pkg/sub/b.py", lines=20, warnings=3)
+        directories = rollups.directories()
+        assert list(directories) == [".", "pkg", "pkg/sub"]
+        assert directories["."] == {
+            "files": 3,
+            "lines": 35,
+            "functions": 6,
+            "warnings": 4,
+            "errors": 2,
+        }
+        assert directories["pkg"]["lines"] == 30
+        assert directories["pkg/sub"]["files"] == 1
+
+    def test_project_findings(self):
+        """Findings fed on their own (e.g. circular imports) add to their file and directories."""
+        rollups = Rollups()
+        add(rollups, "pkg/a.py")
+        results = AnalysisResult()
+        results.append_error("cycle", "pkg/a.py")
+        results.append_warning("duplicate", "pkg/a.py")
+        rollups.add_project_findings(results)
+        rollups.add_project_findings(results)
+        assert rollups.top("errors") == [("pkg/a.py", 2)]
+        assert rollups.directories()["pkg"] == {
+            "files": 1,
+            "lines": 10,
+            "functions": 2,
+            "warnings": 2,
+            "errors": 2,
+        }
+
+    def test_max_depth(self):
+        rollups = Rollups(max_depth=1)
+        add(rollups, "pkg/sub/deep/b.py")
+        assert list(rollups.directories()) == [".", "pkg"]
+
+    def test_to_dict(self):
+        rollups = Rollups(k=1)
+        add(rollups, "pkg/a.py", complexity=9)
+        data = rollups.to_dict()
+        assert set(data["top"]) == set(TOP_METRICS)
+        assert data["top"]["max_complexity"] == [("pkg/a.py", 9)]
+        assert data["directories"]["pkg"]["files"] == 1
+
+    def test_str(self):
+        rollups = Rollups(k=1)
+        add(rollups, "pkg/a.py", complexity=9)
+        text = str(rollups)
+        assert "Top 1 files by max_complexity:" in text
+        assert "Totals by directory:" in text
@@ -70,3 +70,68 @@ def test_ast_log_exception_handling(caplog):
 
     assert "Error during execution" in caplog.text
     assert "ValueError" in caplog.text
+
+
+class Expensive:
+    """Counts how often it is formatted."""
+
+    calls = 0
+
+    def __repr__(self):
+        Expensive.calls += 1
+        return "Expensive()"
+
+
+@logger.logger(logging.DEBUG)
+def identity(value):
+    return value
+
+
+def test_disabled_level_skips_formatting(caplog):
+    """Arguments and results are not formatted when the level is disabled."""
+    Expensive.calls = 0
+    with caplog.at_level(logging.WARNING):
+        identity(Expensive())
+
+    assert Expensive.calls == 0
+    assert caplog.text == ""
+
+
+def test_long_arguments_are_truncated(caplog):
+    """Long argument and result reprs are shortened to max_repr."""
+
+    @logger.logger(logging.DEBUG, max_repr=20)
+    def echo(value):
+        return value
+
+    with caplog.at_level(logging.DEBUG):
+        echo("x" * 1000)
+
+    assert "x" * 1000 not in caplog.text
+    assert "..." in caplog.text
+    assert all(len(record.getMessage()) < 100 for record in caplog.records)
+
+
+def test_result_logged_with_str(caplog):
+    """Results are logged with str(), as before, not repr()."""
+    with caplog.at_level(logging.DEBUG):
+        identity("plain text")
+
+    assert "Result: plain text" in caplog.text
+
+
+def test_large_result_is_not_formatted_in_full(caplog):
+    """Large results are shortened while they are formatted, not after."""
+
+    class Item:
+        formatted = 0
+
+        def __repr__(self):
+            Item.formatted += 1
+            return "item"
+
+    with caplog.at_level(logging.DEBUG):
+        identity([Item() for _ in range(10_000)])
+
+    assert Item.formatted < 100
+    assert "..." in caplog.records[-1].getMessage()
@@ -1,5 +1,8 @@
+import threading
 import time
 
+import pytest
+
 from ast_analyzer.decorators import timer
 
 
@@ -38,6 +41,26 @@ def test_prints_timing_output(capsys):
     assert "->" in captured.out
 
 
+def test_positional_fmt(capsys):
+    """The format can be passed positionally after the function."""
+
+    def double(x):
+        return 2 * x
+
+    timed = timer.timer(double, "{fn_name} -> {result}")
+    assert timed(2) == 4
+    assert capsys.readouterr().out == "double -> 4\n"
+
+
+def test_fmt_as_decorator_option(capsys):
+    @timer.timer(fmt="{fn_name}({args})")
+    def double(x):
+        return 2 * x
+
+    double(3)
+    assert capsys.readouterr().out == "double(3)\n"
+
+
 def test_longer_time(capsys):
     """Decorator should print out warning msg"""
 
@@ -67,3 +90,95 @@ def test_return():
     result = factorial(4)
 
     assert result == 24
+
+
+# =============================================================================
+# Quiet mode
+# =============================================================================
+
+
+@pytest.fixture
+def quiet_timers(monkeypatch):
+    """Keep quiet timers created by a test out of the report printed at exit."""
+    timers = []
+    monkeypatch.setattr(timer, "_quiet_timers", timers)
+    return timers
+
+
+def test_quiet_does_not_print(capsys, quiet_timers):
+    """Quiet timers record durations without printing."""
+
+    @timer.timer(quiet=True)
+    def quick_fn(x):
+        return x * 2
+
+    assert quick_fn(21) == 42
+    assert capsys.readouterr().out == ""
+    assert quick_fn.times_called == 1
+    assert quick_fn.stats.count == 1
+    assert quick_fn in quiet_timers
+
+
+def test_quiet_percentiles(quiet_timers):
+    """Percentiles come from the recorded nanosecond durations."""
+
+    @timer.timer(quiet=True)
+    def timed(duration):
+        time.sleep(duration)
+
+    for _ in range(5):
+        timed(0.01)
+    percentiles = timed.percentiles()
+    assert list(percentiles) == ["p50", "p95", "p99"]
+    assert 9_000_000 < percentiles["p50"] <= percentiles["p99"] < 1_000_000_000
+
+
+def test_quiet_thread_safe(quiet_timers):
+    """Calls from several threads are all counted."""
+
+    @timer.timer(quiet=True)
+    def quick_fn():
+        return 1
+
+    threads = [threading.Thread(target=lambda: [quick_fn() for _ in range(1000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert quick_fn.times_called == quick_fn.stats.count == 4000
+
+
+def test_report(quiet_timers):
+    """report() lists every quiet timer that was called."""
+
+    @timer.timer(quiet=True)
+    def called():
+        return 1
+
+    @timer.timer(quiet=True)
+    def never_called():
+        return 1
+
+    called()
+    report = timer.report()
+    assert "called" in report
+    assert "never_called" not in report
+    assert "p99" in report.splitlines()[0]
+
+
+def test_method(quiet_timers):
+    """The decorator binds to instances like a function."""
+
+    class Visitor:
+        def __init__(self):
+            self.seen = 0
+
+        @timer.timer(quiet=True)
+        def visit(self, node):
+            self.seen += 1
+            return node
+
+    visitor = Visitor()
+    assert visitor.visit("node") == "node"
+    assert visitor.seen == 1
+    assert Visitor.visit.times_called == 1
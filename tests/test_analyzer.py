@@ -9,9 +9,12 @@ from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
-from ast_analyzer.analyzer import CodeAnalyzer, analyzer
+from ast_analyzer import analyzer as analyzer_module
+from ast_analyzer.analyzer import CodeAnalyzer, analyzer, config_fingerprint
 from ast_analyzer.ASTNode import ASTNode
 from ast_analyzer.classes.AnalysisResult import AnalysisResult
+from ast_analyzer.classes.NamingConventions import NamingConventions
+from ast_analyzer.classes.Profiler import Profiler
 
 
 def parse_code(code):
@@ -45,6 +48,21 @@ class TestAnalyzerFunction:
         assert analyzer() == "analyzer"
 
 
+class TestConfigFingerprint:
+    """Tests for config_fingerprint()"""
+
+    def test_default_naming(self):
+        assert config_fingerprint() == config_fingerprint(NamingConventions())
+
+    def test_changes_with_config(self, monkeypatch):
+        fingerprint = config_fingerprint()
+        assert config_fingerprint(NamingConventions({"function": r"[a-z]+"})) != fingerprint
+        monkeypatch.setattr(
+            analyzer_module, "ANALYZER_VERSION", analyzer_module.ANALYZER_VERSION + 1
+        )
+        assert config_fingerprint() != fingerprint
+
+
 # =============================================================================
 # CodeAnalyzer.__init__ tests
 # =============================================================================
@@ -122,6 +140,15 @@ def hello():
         results = analyzer.analyze()
         assert len(results) == 0
 
+    def test_profiled_nodes_charged_to_traversal(self):
+        """Only the traversal is charged the file's nodes; checks read its passes."""
+        profiler = Profiler()
+        tree = parse_code("def f(x):\n    return x\n")
+        analyzer = CodeAnalyzer(tree, make_filename(), profiler=profiler)
+        analyzer.analyze()
+        assert profiler.phases["traverse"][3] == analyzer.node_count
+        assert profiler.phases["_check_function_complexity"][3] == 0
+
 
 # =============================================================================
 # CodeAnalyzer._check_function_count tests
@@ -417,6 +444,32 @@ def func():
         # 10 except blocks should trigger warning
         assert len(analyzer.results["warnings"]) == 1
 
+    def test_complexity_is_per_function(self):
+        """Branches in different functions are not summed together."""
+        code = "\n".join(
+            ["def a():"] + ["    if x: pass"] * 6 + ["def b():"] + ["    if x: pass"] * 6
+        )
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_function_complexity()
+        assert len(analyzer.results) == 0
+
+    def test_complexity_reports_each_function(self):
+        """Each complex function gets its own finding naming the function."""
+        code = "\n".join(
+            ["class C:", "    def a(self):"]
+            + ["        if x: pass"] * 10
+            + ["def b():"]
+            + ["    if x: pass"] * 15
+        )
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_function_complexity()
+        assert len(analyzer.results["warnings"]) == 1
+        assert len(analyzer.results["errors"]) == 1
+        assert "C.a" in analyzer.results["warnings"][0]["message"]
+        assert "b" in analyzer.results["errors"][0]["message"]
+
 
 # =============================================================================
 # CodeAnalyzer._check_docstring_coverage tests
@@ -511,6 +564,49 @@ def e(): pass
         assert len(analyzer.results["errors"]) == 1
 
 
+# =============================================================================
+# CodeAnalyzer._check_unused_imports tests
+# =============================================================================
+class TestCheckUnusedImports:
+    """Tests for CodeAnalyzer._check_unused_imports"""
+
+    def test_used_imports_no_findings(self):
+        """No findings when every import is used."""
+        code = "import os\nprint(os.sep)\n"
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_unused_imports()
+        assert len(analyzer.results) == 0
+
+    def test_one_unused_import_warning(self):
+        """Warning when 1 import is unused."""
+        code = "import os\nimport sys\nprint(sys.argv)\n"
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_unused_imports()
+        assert len(analyzer.results["warnings"]) == 1
+        assert len(analyzer.results["errors"]) == 0
+        assert "os" in analyzer.results["warnings"][0]["message"]
+
+    def test_three_unused_imports_error(self):
+        """Error when 3 or more imports are unused."""
+        code = "import os\nimport sys\nfrom typing import Any\n"
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_unused_imports()
+        assert len(analyzer.results["errors"]) == 1
+        assert len(analyzer.results["warnings"]) == 0
+
+    def test_line_range_spans_unused_imports(self):
+        """The finding covers the lines of the first and last unused import."""
+        code = "import os\nimport sys\nprint(sys.argv)\nimport re\n"
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_unused_imports()
+        finding = analyzer.results["warnings"][0]
+        assert (finding["start_line"], finding["end_line"]) == (1, 4)
+
+
 # =============================================================================
 # CodeAnalyzer._check_function_line_count tests
 # =============================================================================
@@ -548,6 +644,8 @@ def short():
         analyzer._check_function_line_count()
         assert len(analyzer.results["warnings"]) == 1
         assert len(analyzer.results["errors"]) == 0
+        finding = analyzer.results["warnings"][0]
+        assert (finding["start_line"], finding["end_line"]) == (1, 51)
 
     def test_99_lines_warning(self):
         """Warning when function has 99 lines (between 50 and 100)."""
@@ -579,6 +677,112 @@ def short():
         analyzer._check_function_line_count()
         assert len(analyzer.results["errors"]) == 1
 
+    def test_every_long_function_reported(self):
+        """A long function is still reported when a short one follows it."""
+        lines = ["    x = 1"] * 60
+        code = "def long():\n" + "\n".join(lines) + "\ndef short():\n    return 1\n"
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_function_line_count()
+        assert len(analyzer.results["warnings"]) == 1
+        assert "long" in analyzer.results["warnings"][0]["message"]
+
+
+# =============================================================================
+# CodeAnalyzer._check_nesting_depth tests
+# =============================================================================
+def nested_function(depth):
+    """Build a function whose body is nested depth control-flow levels deep."""
+    blocks = ["if x:", "for i in y:", "while z:", "with a:", "try:"]
+    lines = ["def func():"]
+    for level in range(depth):
+        lines.append("    " * (level + 1) + blocks[level % len(blocks)])
+    lines.append("    " * (depth + 1) + "pass")
+    for level in reversed(range(depth)):
+        if blocks[level % len(blocks)] == "try:":
+            lines.append("    " * (level + 1) + "except E:")
+            lines.append("    " * (level + 2) + "pass")
+    return "\n".join(lines)
+
+
+class TestCheckNestingDepth:
+    """Tests for CodeAnalyzer._check_nesting_depth"""
+
+    def test_shallow_function_no_findings(self):
+        """No findings when nesting is below 5 levels."""
+        tree = parse_code(nested_function(4))
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_nesting_depth()
+        assert len(analyzer.results) == 0
+
+    def test_depth_5_warning(self):
+        """Warning when a function is nested 5 levels deep."""
+        tree = parse_code(nested_function(5))
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_nesting_depth()
+        assert len(analyzer.results["warnings"]) == 1
+        assert len(analyzer.results["errors"]) == 0
+
+    def test_depth_7_error(self):
+        """Error when a function is nested 7 or more levels deep."""
+        tree = parse_code(nested_function(7))
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_nesting_depth()
+        assert len(analyzer.results["errors"]) == 1
+        assert len(analyzer.results["warnings"]) == 0
+
+    def test_long_elif_chain_not_nested(self):
+        """A long elif chain is a single level."""
+        code = "def func():\n    if a: pass\n" + "".join(
+            f"    elif b{i}: pass\n" for i in range(10)
+        )
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_nesting_depth()
+        assert len(analyzer.results) == 0
+
+
+# =============================================================================
+# CodeAnalyzer._check_naming_conventions tests
+# =============================================================================
+class TestCheckNamingConventions:
+    """Tests for CodeAnalyzer._check_naming_conventions"""
+
+    def test_conventional_names_no_findings(self):
+        """No findings when names follow conventions."""
+        code = "class MyClass:\n    def my_method(self, arg):\n        value = arg\n"
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_naming_conventions()
+        assert len(analyzer.results) == 0
+
+    def test_ten_violations_warning(self):
+        """Warning when 10 names break conventions."""
+        code = "\n".join(f"badName{i} = {i}" for i in range(10))
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_naming_conventions()
+        assert len(analyzer.results["warnings"]) == 1
+        assert len(analyzer.results["errors"]) == 0
+
+    def test_fifteen_violations_error(self):
+        """Error when 15 or more names break conventions."""
+        code = "\n".join(f"def badName{i}(): pass" for i in range(15))
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename())
+        analyzer._check_naming_conventions()
+        assert len(analyzer.results["errors"]) == 1
+        assert len(analyzer.results["warnings"]) == 0
+
+    def test_uses_provided_conventions(self):
+        """Custom conventions replace the defaults."""
+        code = "\n".join(f"def visit_Node{i}(): pass" for i in range(10))
+        conventions = NamingConventions({"function": [r"[a-z_]+", r"visit_\w+"]})
+        tree = parse_code(code)
+        analyzer = CodeAnalyzer(tree, make_filename(), naming=conventions)
+        analyzer._check_naming_conventions()
+        assert len(analyzer.results) == 0
+
 
 # =============================================================================
 # Integration tests
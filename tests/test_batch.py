@@ -0,0 +1,124 @@
+"""
+tests.test_batch
+
+Test suite for the NumPy batch threshold evaluation.
+"""
+
+import ast
+import pathlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ast_analyzer.analyzer import CodeAnalyzer
+from ast_analyzer.ASTNode import ASTNode
+from ast_analyzer.batch import BatchEvaluator
+from ast_analyzer.classes.NodeVisitors import FunctionMetrics
+
+BRANCHY = "def branchy(x):\n" + "".join(f"    if x == {i}:\n        x += 1\n" for i in range(16))
+FUNCTIONS = "".join(f"def f{i}():\n    return {i}\n" for i in range(6))
+SOURCES = {
+    "branchy.py": BRANCHY,
+    "functions.py": FUNCTIONS,
+    "long.py": "def long():\n" + "    x = 1\n" * 60,
+    "clean.py": '"""Docstring."""\n',
+}
+
+
+def analyze(sources, batch=None):
+    """Analyze every source, returning the combined findings as sorted tuples."""
+    findings = []
+    for name, code in sources.items():
+        analyzer = CodeAnalyzer(ASTNode(ast.parse(code)), pathlib.Path(name), batch=batch)
+        findings.extend(analyzer.analyze())
+    if batch is not None:
+        findings.extend(batch.evaluate())
+    return sorted(tuple(sorted(f.items())) for f in findings)
+
+
+def record(qualname, complexity=1, num_lines=5, max_depth=1, lineno=1):
+    return FunctionMetrics(qualname, lineno, num_lines, complexity, max_depth, True)
+
+
+class TestBatchEvaluator:
+    """Tests for BatchEvaluator"""
+
+    def test_same_findings_as_per_file_checks(self):
+        """Batch mode reports exactly what the per-file if-chains report."""
+        assert analyze(SOURCES, BatchEvaluator()) == analyze(SOURCES)
+
+    def test_analyzer_defers_threshold_checks(self):
+        """With a batch, the analyzer only records metrics for the batched checks."""
+        evaluator = BatchEvaluator()
+        analyzer = CodeAnalyzer(
+            ASTNode(ast.parse(BRANCHY)), pathlib.Path("branchy.py"), batch=evaluator
+        )
+        assert len(analyzer.analyze()) == 0
+        assert analyzer.batch_row == 0
+        assert len(evaluator) == 1
+
+    def test_ordering(self):
+        """Errors come first, then the worst values."""
+        evaluator = BatchEvaluator()
+        evaluator.add_file(
+            "a.py", [record("f", complexity=11), record("g", complexity=30)], 2, 0, 0
+        )
+        evaluator.add_file("b.py", [record("h", complexity=16)], 1, 0, 0)
+        findings = list(evaluator.evaluate())
+        errors = [(f["file"], f["value"]) for f in findings if f["severity"] == "error"]
+        assert errors == [("a.py", 30), ("b.py", 16)]
+        warnings = [f for f in findings if f["severity"] == "warning"]
+        assert warnings[0]["message"] == "Moderate complexity score (11) in f"
+
+    def test_line_ranges(self):
+        evaluator = BatchEvaluator()
+        evaluator.add_file("a.py", [record("f", num_lines=60, lineno=10)], 1, 0, 0)
+        (finding,) = evaluator.evaluate()
+        assert (finding["rule"], finding["start_line"], finding["end_line"]) == (
+            "function-length",
+            10,
+            69,
+        )
+
+    def test_repeat_file(self):
+        evaluator = BatchEvaluator()
+        row = evaluator.add_file("a.py", [record("f", complexity=12)], 9, 0, 0)
+        evaluator.repeat_file(row, "copy.py")
+        files = sorted(f["file"] for f in evaluator.evaluate())
+        assert files == ["a.py", "a.py", "copy.py", "copy.py"]
+
+    def test_evaluates_only_new_files(self):
+        """Each evaluate() reports the files added since the previous one."""
+        evaluator = BatchEvaluator()
+        row = evaluator.add_file("a.py", [record("f", complexity=12)], 1, 0, 0)
+        assert evaluator.pending == 1
+        assert [f["file"] for f in evaluator.evaluate()] == ["a.py"]
+        assert evaluator.pending == 0
+        evaluator.add_file("b.py", [record("g", num_lines=60, lineno=4)], 1, 0, 0)
+        evaluator.repeat_file(row, "copy.py")
+        findings = [(f["file"], f["start_line"]) for f in evaluator.evaluate()]
+        assert findings == [("b.py", 4), ("copy.py", 1)]
+        assert len(evaluator.evaluate()) == 0
+
+    def test_empty(self):
+        evaluator = BatchEvaluator()
+        assert len(evaluator.evaluate()) == 0
+        assert len(evaluator.percentile_ranks("complexity")) == 0
+
+    def test_percentile_ranks(self):
+        """Each value's rank is the share of the corpus at or below it."""
+        evaluator = BatchEvaluator()
+        evaluator.add_file("a.py", [record("f", complexity=c) for c in (4, 1, 4, 9)], 4, 0, 0)
+        evaluator.evaluate()
+        assert evaluator.percentile_ranks("complexity").tolist() == [75.0, 25.0, 75.0, 100.0]
+        assert evaluator.percentile_ranks("complexity", [0, 8]).tolist() == [0.0, 75.0]
+
+    def test_str_shows_thresholds_as_percentiles(self):
+        evaluator = BatchEvaluator()
+        complexities = [1] * 8 + [12, 20]
+        evaluator.add_file("a.py", [record(f"f{c}", complexity=c) for c in complexities], 10, 0, 0)
+        row = [
+            line.split() for line in str(evaluator).splitlines() if line.startswith("complexity")
+        ]
+        assert row == [["complexity", "10", "p80.0", "p90.0"]]
@@ -0,0 +1,352 @@
+"""
+tests.test_main
+
+Test suite for the ast-analyzer command line entry point.
+"""
+
+import functools
+import json
+import re
+import sys
+
+import pytest
+
+import ast_analyzer.main as main_module
+
+
+@pytest.fixture
+def run_main(monkeypatch, capsys):
+    """Run main.main() with the given CLI arguments and return its stdout."""
+
+    def _run(*args):
+        monkeypatch.setattr(sys, "argv", ["ast-analyzer", *args])
+        main_module.main()
+        return capsys.readouterr().out
+
+    return _run
+
+
+class TestMain:
+    """Tests for main.main"""
+
+    def test_reports_findings(self, tmp_path, run_main):
+        (tmp_path / "mod.py").write_text("import os\n")
+        out = run_main(str(tmp_path), "--no-cache")
+        assert "mod.py: Unused imports (1): os" in out
+
+    def test_clean_directory(self, tmp_path, run_main):
+        (tmp_path / "mod.py").write_text('"""Docstring."""\n')
+        out = run_main(str(tmp_path), "--no-cache")
+        assert "Congrats!" in out
+
+    @pytest.mark.parametrize("output_format", ["jsonl", "json", "sarif"])
+    def test_clean_directory_to_file(self, tmp_path, run_main, output_format):
+        """Sinks are closed, and their documents complete, even with no findings."""
+        (tmp_path / "mod.py").write_text('"""Docstring."""\n')
+        path = tmp_path / f"out.{output_format}"
+        run_main(str(tmp_path), "--no-cache", f"--{output_format}", str(path))
+        text = path.read_text()
+        if output_format == "jsonl":
+            assert text == ""
+        elif output_format == "json":
+            assert json.loads(text)["findings"] == []
+        else:
+            assert json.loads(text)["runs"][0]["results"] == []
+
+    @pytest.mark.parametrize("output_format", ["jsonl", "json", "sarif"])
+    def test_clean_directory_to_stdout(self, tmp_path, monkeypatch, capsys, output_format):
+        """With no findings the summary still goes to stderr, not into the stream."""
+        (tmp_path / "mod.py").write_text('"""Docstring."""\n')
+        monkeypatch.setattr(
+            sys, "argv", ["ast-analyzer", str(tmp_path), "--no-cache", f"--{output_format}"]
+        )
+        main_module.main()
+        captured = capsys.readouterr()
+        assert "Congrats!" in captured.err
+        assert "Congrats!" not in captured.out
+        if output_format != "jsonl":
+            json.loads(captured.out)
+
+    def test_identical_files_parsed_once(self, tmp_path, run_main, monkeypatch):
+        """Byte-identical files are analyzed once but reported for every path."""
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / f"{name}.py").write_text("import os\n")
+
+        parses = []
+        real_parse = main_module.ast.parse
+        monkeypatch.setattr(
+            main_module.ast, "parse", lambda code: parses.append(code) or real_parse(code)
+        )
+        out = run_main(str(tmp_path), "--no-cache")
+
+        assert len(parses) == 1
+        for name in ("a", "b", "c"):
+            assert f"{name}/{name}.py: Unused imports (1): os" in out
+
+    def test_identical_files_reuse_function_metrics(self, tmp_path, run_main):
+        """Copies are counted in the function metrics without keeping the function rows."""
+        code = "def f(x):\n    if x:\n        return 1\n    return 2\n"
+        (tmp_path / "a.py").write_text(code)
+        (tmp_path / "b.py").write_text(code)
+        out = run_main(str(tmp_path), "--no-cache")
+        # Both copies are counted, with the metrics of the analyzed one
+        assert re.search(r"^complexity\s+2\s+1\.0 ", out, re.MULTILINE)
+        assert re.search(r"^function_lines\s+2\s+4\.0 ", out, re.MULTILINE)
+
+    def test_identical_files_same_name_listed_per_path(self, tmp_path, run_main):
+        """Copies with the same name in different directories are each reported."""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "util.py").write_text("import os\n")
+            (tmp_path / name / "clean.py").write_text('"""Docstring."""\n')
+        out = run_main(str(tmp_path), "--no-cache")
+        assert "a/util.py: Unused imports (1): os" in out
+        assert "b/util.py: Unused imports (1): os" in out
+        # Clean copies are not counted as files to change
+        assert "Files to Change: 2" in out
+
+    def test_cache_written(self, tmp_path, run_main):
+        (tmp_path / "mod.py").write_text("def f():\n    return 1\n")
+        run_main(str(tmp_path))
+        assert (tmp_path / ".ast_analyzer_cache" / "import_graph.json").is_file()
+
+    def test_jsonl_to_stdout(self, tmp_path, monkeypatch, capsys):
+        """--jsonl streams findings to stdout and moves the summary to stderr."""
+        (tmp_path / "mod.py").write_text("import os\n")
+        monkeypatch.setattr(sys, "argv", ["ast-analyzer", str(tmp_path), "--no-cache", "--jsonl"])
+        main_module.main()
+        captured = capsys.readouterr()
+        rows = [json.loads(line) for line in captured.out.splitlines()]
+        assert {"file": "mod.py", "rule": "unused-imports"}.items() <= rows[-1].items()
+        assert "Warnings: 2" in captured.err
+
+    def test_jsonl_to_file(self, tmp_path, run_main):
+        (tmp_path / "mod.py").write_text("import os\n")
+        output = tmp_path / "findings.jsonl"
+        out = run_main(str(tmp_path), "--no-cache", "--jsonl", str(output))
+        assert "Warnings: 2" in out
+        assert len(output.read_text().splitlines()) == 2
+
+    def test_sarif_to_file(self, tmp_path, run_main):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("import os\n")
+        output = tmp_path / "findings.sarif"
+        run_main(str(tmp_path / "pkg"), "--no-cache", "--sarif", str(output))
+        run = json.loads(output.read_text())["runs"][0]
+        results = run["results"]
+        assert {r["ruleId"] for r in results} == {"missing-docstrings", "unused-imports"}
+        location = results[0]["locations"][0]["physicalLocation"]["artifactLocation"]
+        assert location == {"uri": "mod.py", "uriBaseId": "SRCROOT"}
+        base = run["originalUriBaseIds"]["SRCROOT"]["uri"]
+        assert base == (tmp_path / "pkg").resolve().as_uri() + "/"
+
+    def test_output_formats_are_exclusive(self, tmp_path, run_main):
+        with pytest.raises(SystemExit):
+            run_main(str(tmp_path), "--json", "--sarif")
+
+    def test_store_and_query(self, tmp_path, run_main):
+        """--store records the run and the query subcommand reads it back."""
+        project = tmp_path / "project"
+        (project / "pkg").mkdir(parents=True)
+        (project / "pkg" / "mod.py").write_text("import os\n")
+        db = tmp_path / "results.db"
+        run_main(str(project), "--no-cache", "--store", str(db))
+        run_main(str(project), "--no-cache", "--store", str(db))
+
+        runs = run_main("query", str(db), "runs")
+        assert len(runs.splitlines()) == 3
+        findings = run_main("query", str(db), "findings", "--rule", "unused-imports")
+        assert "pkg/mod.py" in findings
+        top = run_main("query", str(db), "top-files", "--metric", "lines")
+        assert "pkg/mod.py  1" in top
+
+    def test_store_with_changed_naming(self, tmp_path, run_main):
+        """A run with other naming rules does not reuse the stored findings."""
+        project = tmp_path / "project"
+        project.mkdir()
+        functions = "".join(f'def doThing{i}():\n    """Doc."""\n' for i in range(10))
+        (project / "mod.py").write_text('"""Doc."""\n' + functions)
+        db = tmp_path / "results.db"
+        run_main(str(project), "--no-cache", "--store", str(db))
+        run_main(str(project), "--no-cache", "--store", str(db), "--naming", "function=do\\w+")
+
+        assert "naming" in run_main("query", str(db), "findings", "--run", "1")
+        assert "naming" not in run_main("query", str(db), "findings", "--run", "2")
+
+    def test_query_missing_store(self, tmp_path, run_main):
+        with pytest.raises(SystemExit):
+            run_main("query", str(tmp_path / "missing.db"), "runs")
+
+    def test_baseline(self, tmp_path, monkeypatch, capsys):
+        """Only findings added after the baseline was written are reported."""
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "old.py").write_text("import os\n")
+        baseline = tmp_path / "baseline.bin"
+
+        def run(*args):
+            monkeypatch.setattr(sys, "argv", ["ast-analyzer", str(project), "--no-cache", *args])
+            status = main_module.main()
+            return status, capsys.readouterr().out
+
+        run("--baseline", str(baseline), "--write-baseline")
+        assert baseline.is_file()
+
+        # Shifting the old code down does not resurface its findings
+        (project / "old.py").write_text("\n\nimport os\n")
+        status, out = run("--baseline", str(baseline))
+        assert status == 0
+        assert "Congrats!" in out
+        assert "Baseline: 2 known findings not reported" in out
+
+        (project / "new.py").write_text("import re\n")
+        status, out = run("--baseline", str(baseline))
+        assert status == 1
+        assert "new.py: Unused imports (1): re" in out
+        assert "old.py" not in out
+
+    def test_baseline_same_name_in_other_directory(self, tmp_path, monkeypatch, capsys):
+        """A baselined finding in a/cli.py does not hide the same one in b/cli.py."""
+        project = tmp_path / "project"
+        (project / "a").mkdir(parents=True)
+        (project / "b").mkdir()
+        source = "import os\n\ndef main():\n    return 1\n"
+        (project / "a" / "cli.py").write_text(source)
+        baseline = tmp_path / "baseline.bin"
+
+        def run(*args):
+            monkeypatch.setattr(sys, "argv", ["ast-analyzer", str(project), "--no-cache", *args])
+            status = main_module.main()
+            return status, capsys.readouterr().out
+
+        run("--baseline", str(baseline), "--write-baseline")
+        (project / "b" / "cli.py").write_text(source + "\n")
+        status, out = run("--baseline", str(baseline))
+        assert status == 1
+        assert "b/cli.py: Unused imports (1): os" in out
+        assert "a/cli.py" not in out
+
+    def test_findings_use_relative_paths(self, tmp_path, run_main):
+        """Findings name files by their path under the analyzed directory."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "cli.py").write_text("import os\n")
+        out = run_main(str(tmp_path), "--no-cache")
+        assert "a/cli.py: Unused imports (1): os" in out
+
+    def test_write_baseline_requires_file(self, tmp_path, run_main):
+        with pytest.raises(SystemExit):
+            run_main(str(tmp_path), "--write-baseline")
+
+    def test_top(self, tmp_path, run_main):
+        """--top prints totals and rollups instead of every finding."""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("import os\n")
+        out = run_main(str(tmp_path), "--no-cache", "--top", "5")
+        assert "Unused imports (1): os" not in out
+        assert "Warnings: 2" in out
+        assert "Top 5 files by warnings:\npath        warnings\npkg/mod.py  2" in out
+        assert "Totals by directory:" in out
+
+    def test_top_counts_reported_findings(self, tmp_path, run_main):
+        """Rollups leave out baseline findings and include project findings."""
+        (tmp_path / "a.py").write_text("import b\nimport os\n")
+        (tmp_path / "b.py").write_text("import a\n")
+        baseline = str(tmp_path / "baseline")
+        run_main(str(tmp_path), "--no-cache", "--baseline", baseline, "--write-baseline")
+        (tmp_path / "c.py").write_text("import os\n")
+        out = run_main(str(tmp_path), "--no-cache", "--top", "5", "--baseline", baseline)
+        assert "Top 5 files by warnings:\npath  warnings\nc.py  2\n" in out
+
+        out = run_main(str(tmp_path), "--no-cache", "--top", "5")
+        assert "Top 5 files by errors:\npath  errors\na.py  1\n" in out
+
+    def test_batch(self, tmp_path, run_main):
+        pytest.importorskip("numpy")
+        (tmp_path / "mod.py").write_text(
+            "".join(f"def f{i}():\n    return {i}\n" for i in range(6))
+        )
+        out = run_main(str(tmp_path), "--no-cache", "--batch")
+        assert "mod.py: This file has (6) functions." in out
+        assert "Thresholds as percentiles of the corpus:" in out
+        assert "functions           1       p0.0        p100.0" in out
+
+    def test_batch_evaluated_during_run(self, tmp_path, run_main, monkeypatch):
+        """Batched findings are reported every EVALUATE_EVERY files, not only at the end."""
+        pytest.importorskip("numpy")
+        functions = "".join(f"def f{i}():\n    return {i}\n" for i in range(6))
+        (tmp_path / "a.py").write_text(functions)
+        (tmp_path / "b.py").write_text(functions + "x = 1\n")
+        monkeypatch.setattr(main_module.batch, "EVALUATE_EVERY", 1)
+        evaluated = []
+        real_evaluate = main_module.batch.BatchEvaluator.evaluate
+        monkeypatch.setattr(
+            main_module.batch.BatchEvaluator,
+            "evaluate",
+            lambda self: evaluated.append(self.pending) or real_evaluate(self),
+        )
+        out = run_main(str(tmp_path), "--no-cache", "--batch")
+        assert evaluated == [1, 1, 0]
+        assert "a.py: This file has (6) functions." in out
+        assert "b.py: This file has (6) functions." in out
+
+    def test_batch_excludes_store(self, tmp_path, run_main):
+        with pytest.raises(SystemExit):
+            run_main(str(tmp_path), "--batch", "--store", str(tmp_path / "r.db"))
+
+    def test_profile(self, tmp_path, run_main):
+        (tmp_path / "mod.py").write_text("import os\n")
+        (tmp_path / "broken.py").write_text("def (\n")
+        out = run_main(
+            str(tmp_path), "--no-cache", "--profile", "3", "--cprofile", str(tmp_path / "run.prof")
+        )
+        # Files that fail to parse are still ended and ranked
+        assert "Profile (2 files, 3 AST nodes" in out
+        for phase in ("discover", "read", "parse", "build", "traverse", "_check_unused_imports"):
+            assert phase in out
+        assert "Slowest 2 files:" in out
+        assert (tmp_path / "run.prof").exists()
+
+    def test_trace(self, tmp_path, run_main):
+        (tmp_path / "mod.py").write_text("import os\n")
+        trace = tmp_path / "trace.json"
+        out = run_main(str(tmp_path), "--no-cache", "--trace", str(trace))
+        assert "Profile (" not in out
+        events = json.loads(trace.read_text())["traceEvents"]
+        names = {event["name"] for event in events if event.get("args") == {"file": "mod.py"}}
+        assert {"read", "parse", "build", "_check_unused_imports", "mod.py"} <= names
+
+    def test_memory_report(self, tmp_path, run_main):
+        (tmp_path / "mod.py").write_text("import os\n")
+        out = run_main(str(tmp_path), "--no-cache", "--memory-report")
+        assert "Memory (tracemalloc" in out
+        assert "Largest 1 files by peak memory:\npath    peak KiB\nmod.py" in out
+
+    def test_throughput(self, tmp_path, run_main):
+        (tmp_path / "mod.py").write_text("import os\n")
+        (tmp_path / "copy.py").write_text("import os\n")
+        (tmp_path / "broken.py").write_text("def (\n")
+        out = run_main(str(tmp_path), "--no-cache", "--json", str(tmp_path / "out.json"))
+        assert "Throughput:\n  2 files (1 reused, 1 skipped), 20 bytes" in out
+        throughput = json.loads((tmp_path / "out.json").read_text())["summary"]["throughput"]
+        assert throughput["files"] == 2
+        assert throughput["nodes"] > 0
+        assert throughput["caches"]["identical_files"]["hits"] == 1
+        assert throughput["caches"]["import_graph"] == {"hits": 0, "lookups": 2, "hit_ratio": 0.0}
+
+    def test_progress(self, tmp_path, monkeypatch, capsys):
+        (tmp_path / "mod.py").write_text("import os\n")
+        (tmp_path / "other.py").write_text("import sys\n")
+        monkeypatch.setattr(
+            sys, "argv", ["ast-analyzer", str(tmp_path), "--no-cache", "--progress", "--profile"]
+        )
+        # Update on every file
+        progress = functools.partial(main_module.reporter.Progress, interval=0)
+        monkeypatch.setattr(main_module.reporter, "Progress", progress)
+        main_module.main()
+        captured = capsys.readouterr()
+        assert "[1/2  50%]" in captured.err
+        assert "[2/2 100%]" in captured.err
+        assert "[2/2" not in captured.out
+        # The total comes from a separate count, not from listing the files
+        assert "count files" in captured.out
@@ -2,8 +2,28 @@
 tests.test_reporter
 """
 
+import io
+import json
+import random
+import shutil
+import statistics
+import subprocess
+
 import pytest
 
+from ast_analyzer.reporter import (
+    ExternalLinters,
+    MetricsCollector,
+    Progress,
+    RunStats,
+    StreamingStats,
+    bucket_of,
+    format_duration,
+    parse_black,
+    parse_mypy,
+    parse_ruff,
+)
+
 
 # =============================================================================
 # MetricsCollector Tests
@@ -65,14 +85,12 @@ class TestMetricsCollectorAddFileMetrics:
 class TestMetricsCollectorGetSummary:
     """Tests for MetricsCollector.get_summary"""
 
-    def test_get_summary_empty_raises_division_error(self, metrics_collector):
-        """Summary for empty collector raises ZeroDivisionError.
-
-        Note: Current implementation divides by files_analyzed without checking
-        for zero, causing ZeroDivisionError when no files have been analyzed.
-        """
-        with pytest.raises(ZeroDivisionError):
-            metrics_collector.get_summary()
+    def test_get_summary_empty(self, metrics_collector):
+        """Summary for an empty collector reports zeros instead of dividing by zero."""
+        summary = metrics_collector.get_summary()
+        assert summary["files"] == 0
+        assert summary["avg_fns_per_file"] == 0.0
+        assert summary["complexity"]["count"] == 0
 
     def test_get_summary_populated(self, populated_metrics_collector):
         """Summary for populated collector."""
@@ -86,3 +104,412 @@ class TestMetricsCollectorGetSummary:
         """get_summary returns a dictionary."""
         summary = populated_metrics_collector.get_summary()
         assert isinstance(summary, dict)
+
+    def test_get_summary_streaming_stats(self, populated_metrics_collector):
+        """Per-file statistics are included in the summary."""
+        lines = populated_metrics_collector.get_summary()["lines_per_file"]
+        assert lines["count"] == 3
+        assert lines["mean"] == pytest.approx(125)
+        assert (lines["min"], lines["max"]) == (75, 200)
+        assert lines["p50"] == pytest.approx(100, rel=0.05)
+
+
+@pytest.mark.metrics
+class TestMetricsCollectorFunctions:
+    """Tests for per-function metrics, merging and formatting"""
+
+    def test_add_function_metrics(self, metrics_collector):
+        metrics_collector.add_function_metrics(3, 10)
+        metrics_collector.add_function_metrics(7, 30)
+        summary = metrics_collector.get_summary()
+        assert summary["complexity"]["mean"] == pytest.approx(5)
+        assert summary["function_lines"]["max"] == 30
+
+    def test_merge(self, populated_metrics_collector):
+        """Merging collectors matches feeding one collector everything."""
+        other = MetricsCollector()
+        other.add_file_metrics(1, 10)
+        other.add_function_metrics(4, 12)
+        populated_metrics_collector.merge(other)
+
+        expected = MetricsCollector()
+        for fn_count, ln_count in ((5, 100), (3, 75), (8, 200), (1, 10)):
+            expected.add_file_metrics(fn_count, ln_count)
+        expected.add_function_metrics(4, 12)
+        merged = populated_metrics_collector.get_summary()
+        for key, value in expected.get_summary().items():
+            assert merged[key] == (pytest.approx(value) if isinstance(value, dict) else value)
+
+    def test_str(self, populated_metrics_collector):
+        text = str(populated_metrics_collector)
+        assert text.startswith("Code metrics:")
+        assert "lines_per_file" in text
+
+
+# =============================================================================
+# StreamingStats Tests
+# =============================================================================
+@pytest.mark.metrics
+class TestStreamingStats:
+    """Tests for StreamingStats"""
+
+    def test_empty(self):
+        stats = StreamingStats()
+        assert stats.count == 0
+        assert stats.variance == 0.0
+        assert stats.percentile(50) == 0
+
+    def test_moments(self):
+        values = [4, 8, 15, 16, 23, 42]
+        stats = StreamingStats()
+        for value in values:
+            stats.add(value)
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.variance == pytest.approx(statistics.pvariance(values))
+        assert (stats.min, stats.max) == (4, 42)
+
+    def test_small_values_exact_percentiles(self):
+        stats = StreamingStats()
+        for value in range(1, 11):
+            stats.add(value)
+        assert stats.percentile(50) == 5
+        assert stats.percentile(90) == 9
+        assert stats.percentile(100) == 10
+
+    def test_large_value_percentiles_approximate(self):
+        rng = random.Random(0)
+        values = sorted(int(rng.lognormvariate(5, 1.5)) for _ in range(20000))
+        stats = StreamingStats()
+        for value in values:
+            stats.add(value)
+        for p in (50, 90, 99):
+            exact = values[int(len(values) * p / 100) - 1]
+            assert stats.percentile(p) == pytest.approx(exact, rel=0.05)
+
+    def test_percentile_clamped_to_range(self):
+        stats = StreamingStats()
+        stats.add(1000)
+        assert stats.percentile(1) == 1000
+        assert stats.percentile(99) == 1000
+
+    def test_merge_matches_single_stream(self):
+        rng = random.Random(1)
+        values = [rng.randrange(500) for _ in range(1000)]
+        whole, left, right = StreamingStats(), StreamingStats(), StreamingStats()
+        for value in values:
+            whole.add(value)
+        for value in values[:300]:
+            left.add(value)
+        for value in values[300:]:
+            right.add(value)
+        left.merge(right)
+        assert left.summary() == pytest.approx(whole.summary())
+
+    def test_merge_into_empty(self):
+        stats, other = StreamingStats(), StreamingStats()
+        other.add(5)
+        stats.merge(other)
+        stats.merge(StreamingStats())
+        assert (stats.count, stats.min, stats.max) == (1, 5, 5)
+
+    def test_huge_values_use_last_bucket(self):
+        stats = StreamingStats()
+        stats.add(2**60)
+        assert bucket_of(2**60) == len(stats._buckets) - 1
+        assert stats.percentile(50) == 2**60
+
+
+# =============================================================================
+# RunStats Tests
+# =============================================================================
+class TestRunStats:
+    """Tests for run throughput statistics"""
+
+    def test_counts(self):
+        stats = RunStats()
+        stats.add_file(100, nodes=40)
+        stats.add_file(100, reused=True)
+        stats.skip_file()
+        stats.finish()
+        data = stats.to_dict()
+        assert (data["files"], data["bytes"], data["nodes"]) == (2, 200, 40)
+        assert (data["reused_files"], data["skipped_files"]) == (1, 1)
+        assert data["caches"] == {"identical_files": {"hits": 1, "lookups": 2, "hit_ratio": 0.5}}
+        assert data["wall_seconds"] >= 0 and data["cpu_seconds"] >= 0
+
+    def test_caches_reported_separately(self):
+        stats = RunStats()
+        stats.add_cache("import_graph", hits=3, lookups=4)
+        stats.add_cache("linters", hits=0, lookups=0)
+        caches = stats.to_dict()["caches"]
+        assert caches["import_graph"] == {"hits": 3, "lookups": 4, "hit_ratio": 0.75}
+        assert caches["linters"]["hit_ratio"] == 0.0
+        assert "import graph 3/4 (75.0%)" in str(stats)
+
+    def test_rates(self):
+        stats = RunStats()
+        stats.add_file(1000, nodes=500)
+        stats.finish()
+        stats.wall_seconds = 2.0
+        data = stats.to_dict()
+        assert data["files_per_second"] == 0.5
+        assert data["bytes_per_second"] == 500.0
+        assert data["nodes_per_second"] == 250.0
+
+    def test_str(self):
+        stats = RunStats()
+        stats.add_file(10, nodes=5)
+        text = str(stats)
+        assert text.startswith(
+            "Throughput:\n  1 files (0 reused, 0 skipped), 10 bytes, 5 AST nodes"
+        )
+        assert "files/s" in text
+        assert "Cache hits: identical files 0/1 (0.0%)" in text
+        assert "CPU time:" in text
+
+
+# =============================================================================
+# Progress Tests
+# =============================================================================
+class TestProgress:
+    """Tests for the live progress display"""
+
+    def test_line(self):
+        progress = Progress(200, stream=io.StringIO())
+        progress.done = 50
+        line = progress.line(progress._started + 10)
+        assert line == "[ 50/200  25%] 5.0 files/s, ETA 30s"
+
+    def test_no_eta_when_done(self):
+        progress = Progress(2, stream=io.StringIO())
+        progress.done = 2
+        assert "ETA" not in progress.line(progress._started + 1)
+
+    def test_rate_limited(self):
+        stream = io.StringIO()
+        progress = Progress(1000, stream=stream, interval=3600)
+        for _ in range(1000):
+            progress.advance()
+        assert progress.done == 1000
+        assert stream.getvalue() == ""
+
+    def test_writes_lines_when_not_a_terminal(self):
+        stream = io.StringIO()
+        progress = Progress(3, stream=stream, interval=0)
+        progress.advance()
+        progress.advance()
+        progress.close()
+        lines = stream.getvalue().splitlines()
+        assert [line[:8] for line in lines] == ["[1/3  33", "[2/3  67"]
+
+    def test_format_duration(self):
+        assert format_duration(45.9) == "45s"
+        assert format_duration(187) == "3m07s"
+        assert format_duration(3720) == "1h02m"
+
+
+# =============================================================================
+# External linters
+# =============================================================================
+
+
+class TestLinterParsers:
+    """Tests for turning linter output into findings."""
+
+    def test_parse_ruff(self):
+        output = json.dumps(
+            [
+                {
+                    "filename": "/src/a.py",
+                    "code": "F401",
+                    "message": "`os` imported but unused",
+                    "location": {"row": 3, "column": 8},
+                    "end_location": {"row": 3, "column": 10},
+                }
+            ]
+        )
+        [finding] = parse_ruff(output, "")
+        assert finding.path == "/src/a.py"
+        assert (finding.line, finding.end_line) == (3, 3)
+        assert finding.message == "ruff F401: `os` imported but unused"
+
+    def test_parse_black(self):
+        stderr = "would reformat /src/a.py\nOh no! 1 file would be reformatted.\n"
+        [finding] = parse_black("", stderr)
+        assert finding.path == "/src/a.py"
+        assert finding.message == "black: would reformat file"
+
+    def test_parse_mypy(self):
+        stdout = (
+            "/src/a.py:4:5:4:9: error: Incompatible types  [assignment]\n"
+            "/src/a.py:7: note: See https://mypy.readthedocs.io\n"
+            "/src/b.py:2: warning: unused 'type: ignore' comment\n"
+        )
+        error, warning = parse_mypy(stdout, "")
+        assert (error.path, error.line, error.end_line) == ("/src/a.py", 4, 4)
+        assert error.message == "mypy: Incompatible types [assignment]"
+        assert error.severity == 2
+        assert (warning.path, warning.severity) == ("/src/b.py", 1)
+
+
+class TestExternalLinters:
+    """Tests for running linters over batches of files."""
+
+    def test_unknown_linter(self):
+        with pytest.raises(ValueError, match="Unknown linter"):
+            ExternalLinters(["pylint"])
+
+    def test_missing_linter_is_skipped(self, monkeypatch):
+        monkeypatch.setattr(shutil, "which", lambda name: None)
+        linters = ExternalLinters(["ruff", "mypy"])
+        assert linters.tools == []
+
+    @pytest.mark.skipif(shutil.which("ruff") is None, reason="ruff is not installed")
+    def test_ruff_findings_and_cache(self, tmp_path):
+        source = tmp_path / "a.py"
+        source.write_text("import os\n")
+        cache = tmp_path / "cache" / "linters.json"
+
+        linters = ExternalLinters(["ruff"], cache_path=cache)
+        linters.add(source)
+        results = linters.collect()
+        linters.save()
+        findings = results["warnings"]
+        assert any("F401" in finding["message"] for finding in findings)
+        assert findings[0]["file"] == "a.py"
+        assert findings[0]["rule"] == "linter"
+        assert findings[0]["start_line"] == 1
+
+        # Unchanged files are not linted again
+        linters = ExternalLinters(["ruff"], cache_path=cache)
+        linters.add(source)
+        assert linters.reused == 1
+        assert linters.collect()["warnings"] == findings
+
+    @pytest.mark.skipif(shutil.which("ruff") is None, reason="ruff is not installed")
+    def test_findings_relative_to_root(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("import os\n")
+        linters = ExternalLinters(["ruff"], root=tmp_path)
+        linters.add(tmp_path / "pkg" / "a.py")
+        assert linters.collect()["warnings"][0]["file"] == "pkg/a.py"
+
+
+class FakeRuns:
+    """Stands in for subprocess.run, answering linter commands from a script."""
+
+    def __init__(self, returncode=0, stdout="", stderr=""):
+        self.returncode, self.stdout, self.stderr = returncode, stdout, stderr
+        self.commands = []
+        self.cwds = []
+
+    def __call__(self, command, cwd=None, **kwargs):
+        self.commands.append(command)
+        self.cwds.append(cwd)
+        return subprocess.CompletedProcess(command, self.returncode, self.stdout, self.stderr)
+
+
+@pytest.fixture
+def fake_linters(monkeypatch):
+    """Pretend every linter is installed and record the commands run."""
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+
+    def _install(**kwargs):
+        runs = FakeRuns(**kwargs)
+        monkeypatch.setattr(subprocess, "run", runs)
+        return runs
+
+    return _install
+
+
+class TestExternalLintersCache:
+    """Tests for what is cached, and when linters are run again."""
+
+    def run(self, files, tools, cache, root=None):
+        linters = ExternalLinters(tools, cache_path=cache, root=root)
+        for path in files:
+            linters.add(path)
+        results = linters.collect()
+        linters.save()
+        return linters, results
+
+    def test_crash_is_not_cached(self, tmp_path, fake_linters, caplog):
+        source = tmp_path / "a.py"
+        source.write_text("x = 1\n")
+        cache = tmp_path / "linters.json"
+        fake_linters(returncode=123, stderr="error: cannot format a.py: INTERNAL ERROR")
+        self.run([source], ["black"], cache)
+        assert "black failed on a batch of 1 files: exit status 123" in caplog.text
+
+        runs = fake_linters(returncode=0)
+        linters, _ = self.run([source], ["black"], cache)
+        assert linters.reused == 0
+        assert len(runs.commands) == 1
+
+    def test_findings_are_cached_after_success(self, tmp_path, fake_linters):
+        source = tmp_path / "a.py"
+        source.write_text("x = 1\n")
+        cache = tmp_path / "linters.json"
+        fake_linters(returncode=1, stderr=f"would reformat {source}\n")
+        _, results = self.run([source], ["black"], cache)
+        assert len(results["warnings"]) == 1
+
+        runs = fake_linters(returncode=0)
+        linters, results = self.run([source], ["black"], cache)
+        assert linters.reused == 1
+        assert runs.commands == []
+        assert results["warnings"][0]["message"] == "black: would reformat file"
+
+    def test_mypy_runs_once_over_the_whole_set(self, tmp_path, fake_linters):
+        sources = [tmp_path / "a.py", tmp_path / "b.py"]
+        for source in sources:
+            source.write_text("x = 1\n")
+        cache = tmp_path / "linters.json"
+        runs = fake_linters(stdout=f"{sources[0]}:1: error: Bad  [misc]\n", returncode=1)
+        _, results = self.run(sources, ["mypy"], cache)
+        assert len(runs.commands) == 1
+        assert runs.commands[0][-2:] == ["a.py", "b.py"]
+        assert runs.cwds == [str(tmp_path)]
+        assert results["errors"][0]["message"] == "mypy: Bad [misc]"
+
+        # Unchanged set: reused
+        runs = fake_linters(returncode=0)
+        _, results = self.run(sources, ["mypy"], cache)
+        assert runs.commands == []
+        assert len(results["errors"]) == 1
+
+        # A change to b.py can change a.py's errors, so everything is checked again
+        sources[1].write_text("x = 2  # changed\n")
+        runs = fake_linters(returncode=0)
+        _, results = self.run(sources, ["mypy"], cache)
+        assert len(runs.commands) == 1
+        assert len(results) == 0
+
+    def test_mypy_checks_top_level_entries_of_root(self, tmp_path, fake_linters):
+        """mypy gets one argument per top-level package, not one per file."""
+        sources = [tmp_path / "pkg" / f"m{i}.py" for i in range(50)] + [tmp_path / "setup.py"]
+        (tmp_path / "pkg").mkdir()
+        for source in sources:
+            source.write_text("x = 1\n")
+        runs = fake_linters(stdout="pkg/m3.py:1: error: Bad  [misc]\n", returncode=1)
+        _, results = self.run(sources, ["mypy"], tmp_path / "linters.json", root=tmp_path)
+        assert runs.commands[0][-2:] == ["pkg", "setup.py"]
+        assert runs.cwds == [str(tmp_path)]
+        assert results["errors"][0]["file"] == "pkg/m3.py"
+
+    def test_mypy_failure_is_reported_and_not_cached(self, tmp_path, fake_linters, caplog):
+        sources = [tmp_path / "a" / "conftest.py", tmp_path / "b" / "conftest.py"]
+        for source in sources:
+            source.parent.mkdir()
+            source.write_text("x = 1\n")
+        cache = tmp_path / "linters.json"
+        fake_linters(returncode=2, stdout="b/conftest.py: error: Duplicate module named 'conftest'")
+        _, results = self.run(sources, ["mypy"], cache, root=tmp_path)
+        assert len(results) == 0
+        assert "mypy failed on a batch of 2 files: exit status 2: " in caplog.text
+        assert "Duplicate module named 'conftest'" in caplog.text
+
+        runs = fake_linters(returncode=0)
+        linters, _ = self.run(sources, ["mypy"], cache, root=tmp_path)
+        assert linters.reused == 0
+        assert len(runs.commands) == 1